@@ -0,0 +1,29 @@
+"""Shared helpers for the offline benchmark scripts.
+
+The benchmarks import the application package directly and replace the
+network-facing pieces (OpenAI, Pinecone) with in-process fakes, so they
+run without API keys or network access.
+"""
+import os
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_environment() -> None:
+    """Put the project root on `sys.path` and provide dummy credentials."""
+    if str(ROOT_DIR) not in sys.path:
+        sys.path.insert(0, str(ROOT_DIR))
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ.setdefault("PINECONE_API_KEY", "pc-benchmark")
+    os.environ.setdefault("PINECONE_INDEX_NAME", "benchmark")
+
+
+def percentile(values, pct: float) -> float:
+    """Return the `pct` percentile of `values` using nearest-rank."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[rank]
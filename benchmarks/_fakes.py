@@ -0,0 +1,130 @@
+"""In-process fakes for the OpenAI and Pinecone backends used by benchmarks.
+
+Each fake `asyncio.sleep`s for a configurable latency so benchmarks measure
+how the pipeline schedules work, not how fast the remote services are.
+Call `setup_environment()` before importing this module.
+"""
+import asyncio
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.app.core.agents import agents
+from src.app.core.retrieval import vector_store_rest
+
+LLM_LATENCY = 0.300
+EMBED_LATENCY = 0.080
+PINECONE_LATENCY = 0.050
+# Per-item costs for batch calls, on top of the per-call latency
+EMBED_PER_TEXT_LATENCY = 0.001
+UPSERT_PER_VECTOR_LATENCY = 0.0005
+EMBEDDING_DIM = 8
+
+
+class FakeEmbeddings:
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.dim = dim
+        self.document_calls = 0
+        self.documents_embedded = 0
+
+    def embed_documents(self, texts):
+        self.document_calls += 1
+        self.documents_embedded += len(texts)
+        time.sleep(EMBED_LATENCY + EMBED_PER_TEXT_LATENCY * len(texts))
+        return [[0.1] * self.dim for _ in texts]
+
+    def embed_query(self, text):
+        time.sleep(EMBED_LATENCY)
+        return [0.1] * self.dim
+
+    async def aembed_query(self, text):
+        await asyncio.sleep(EMBED_LATENCY)
+        return [0.1] * self.dim
+
+
+class FakePineconeClient:
+    def __init__(self):
+        self.upserted = 0
+
+    def upsert(self, vectors, namespace=""):
+        time.sleep(PINECONE_LATENCY + UPSERT_PER_VECTOR_LATENCY * len(vectors))
+        self.upserted += len(vectors)
+        return {"upsertedCount": len(vectors)}
+
+    def fetch(self, ids, namespace=""):
+        return {"vectors": {}}
+
+    async def afetch(self, ids, namespace=""):
+        return {"vectors": {}}
+
+    def delete(self, ids=None, delete_all=False, namespace=""):
+        return {}
+
+    def flush(self, namespace=None):
+        pass
+
+    def describe_index_stats(self):
+        return {"dimension": EMBEDDING_DIM, "namespaces": {}}
+
+    def connection_stats(self):
+        return {}
+
+    async def aquery(self, vector, top_k=5, namespace="", ef_search=None, include_values=False):
+        await asyncio.sleep(PINECONE_LATENCY)
+        return {
+            "matches": [
+                {
+                    "id": f"vec_{i}",
+                    "score": 0.85 - 0.05 * i,
+                    "metadata": {"text": f"chunk {i}", "page": i, "source": "paper.pdf"},
+                }
+                for i in range(top_k)
+            ]
+        }
+
+
+class FakeAgent:
+    """Stands in for a `create_agent` graph with a fixed reply."""
+
+    def __init__(self, reply: str):
+        self.reply = reply
+
+    async def ainvoke(self, payload, config=None):
+        await asyncio.sleep(LLM_LATENCY)
+        return {"messages": [*payload["messages"], AIMessage(content=self.reply)]}
+
+
+class FakeRetrievalAgent:
+    """Plans one tool call, runs the real retrieval tool, then finishes."""
+
+    async def ainvoke(self, payload, config=None):
+        question = payload["messages"][-1].content
+        await asyncio.sleep(LLM_LATENCY)
+        tool_message = await agents.retrieval_tool.ainvoke(
+            {
+                "name": "retrieval_tool",
+                "args": {"query": question},
+                "id": "call_0",
+                "type": "tool_call",
+            }
+        )
+        await asyncio.sleep(LLM_LATENCY)
+        return {
+            "messages": [
+                HumanMessage(content=question),
+                tool_message,
+                AIMessage(content="Context gathered."),
+            ]
+        }
+
+
+EMBEDDINGS = FakeEmbeddings()
+PINECONE = FakePineconeClient()
+
+
+def install_fakes() -> None:
+    vector_store_rest._get_embeddings = lambda: EMBEDDINGS
+    vector_store_rest._get_vector_backend = lambda: PINECONE
+    agents.retrieval_agent = FakeRetrievalAgent()
+    agents.summarization_agent = FakeAgent("Draft answer C1.")
+    agents.verification_agent = FakeAgent("Verified answer C1.")
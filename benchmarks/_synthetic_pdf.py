@@ -0,0 +1,67 @@
+"""Generate large text-only PDFs for ingest benchmarks without extra dependencies."""
+
+from typing import List
+
+_WORDS = (
+    "vector database embedding index query similarity search cosine "
+    "approximate nearest neighbour graph quantization recall latency "
+    "throughput partition shard replica hnsw ivf product codebook"
+).split()
+
+
+def _page_lines(page: int, lines: int) -> List[str]:
+    out = []
+    for line in range(lines):
+        words = [_WORDS[(page * 7 + line * 3 + i) % len(_WORDS)] for i in range(12)]
+        out.append(f"Page {page + 1} line {line + 1}: " + " ".join(words))
+    return out
+
+
+def write_synthetic_pdf(path: str, pages: int, lines_per_page: int = 40) -> None:
+    """Write a PDF with `pages` pages of deterministic pseudo-text."""
+    objects: List[bytes] = []
+
+    def add(obj: bytes) -> int:
+        objects.append(obj)
+        return len(objects)
+
+    catalog = add(b"")  # filled in once the page tree exists
+    page_tree = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    page_ids = []
+    for page in range(pages):
+        text = ["BT", "/F1 10 Tf", "12 TL", "50 780 Td"]
+        for line in _page_lines(page, lines_per_page):
+            text.append(f"({line}) Tj T*")
+        text.append("ET")
+        stream = "\n".join(text).encode("latin-1")
+        content = add(
+            b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+        )
+        page_ids.append(
+            add(
+                b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] "
+                b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+                % (page_tree, font, content)
+            )
+        )
+
+    kids = b" ".join(b"%d 0 R" % pid for pid in page_ids)
+    objects[page_tree - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, pages)
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % page_tree
+
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4\n")
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(f.tell())
+            f.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+        xref = f.tell()
+        f.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+        for offset in offsets:
+            f.write(b"%010d 00000 n \n" % offset)
+        f.write(
+            b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+            % (len(objects) + 1, catalog, xref)
+        )
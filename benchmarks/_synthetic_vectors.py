@@ -0,0 +1,69 @@
+"""Generate embedding-like vectors for index benchmarks.
+
+Real text embeddings have a low intrinsic dimension, so uniform noise is a
+misleadingly hard workload for approximate indexes. These vectors are
+clustered points in a small latent space, randomly projected to the
+target dimension plus a little isotropic noise, and L2-normalized. Noise
+is scaled by 1/sqrt(dim), so its norm does not grow with the dimension.
+
+`HashedBagOfWordsEmbeddings` stands in for the OpenAI embedding model in
+end-to-end retrieval benchmarks: texts sharing words embed similarly.
+"""
+
+import hashlib
+
+import numpy as np
+
+
+def embedding_like_vectors(
+    rng: np.random.Generator,
+    count: int,
+    dim: int,
+    latent_dim: int = 16,
+    clusters: int = 256,
+) -> np.ndarray:
+    centers = rng.standard_normal((clusters, latent_dim), dtype=np.float32)
+    projection = rng.standard_normal((latent_dim, dim), dtype=np.float32)
+    vectors = np.empty((count, dim), dtype=np.float32)
+    for start in range(0, count, 100_000):
+        size = min(100_000, count - start)
+        latent = centers[rng.integers(0, clusters, size)] + rng.standard_normal(
+            (size, latent_dim), dtype=np.float32
+        )
+        block = latent @ projection
+        block /= np.linalg.norm(block, axis=1, keepdims=True)
+        block += (0.1 / np.sqrt(dim)) * rng.standard_normal((size, dim), dtype=np.float32)
+        vectors[start:start + size] = block / np.linalg.norm(block, axis=1, keepdims=True)
+    return vectors
+
+
+def noisy_queries(rng: np.random.Generator, vectors: np.ndarray, count: int) -> np.ndarray:
+    """Perturbed copies of random corpus vectors, L2-normalized."""
+    picks = vectors[rng.integers(0, len(vectors), count)]
+    noise = rng.standard_normal(picks.shape, dtype=np.float32)
+    queries = picks + (0.2 / np.sqrt(vectors.shape[1])) * noise
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    return queries.astype(np.float32)
+
+
+class HashedBagOfWordsEmbeddings:
+    """Sum of a fixed random vector per word; shared words mean similar embeddings."""
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def _embed(self, text: str) -> list:
+        vector = np.zeros(self.dim)
+        for word in text.lower().replace(".", " ").replace("?", " ").split():
+            seed = int.from_bytes(hashlib.sha256(word.encode()).digest()[:8], "little")
+            vector += np.random.default_rng(seed).standard_normal(self.dim)
+        return (vector / max(np.linalg.norm(vector), 1e-12)).tolist()
+
+    def embed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+    async def aembed_query(self, text):
+        return self._embed(text)
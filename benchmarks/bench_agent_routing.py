@@ -0,0 +1,155 @@
+"""End-to-end and per-agent latency with and without per-agent model routing.
+
+Runs the strict QA profile with the Retrieval Agent strategy, so every
+question makes all three kinds of agent call. The fake agents call a
+stand-in chat model that sleeps for the latency of the model each agent
+is routed to in Settings, so the numbers depend only on the assumed
+per-model latencies (`--large-latency`, `--small-latency`), not on a real
+provider. Two configurations are compared: every agent on the default
+model, and the Retrieval and Verification Agents routed to the small
+model. Per-agent latencies are read back from
+`get_agent_latency_metrics()`, the same numbers `/metrics` reports; they
+cover model calls only, so the Retrieval Agent's two calls per question
+exclude the retrieval tool call between them (query embedding and vector
+query).
+
+Usage:
+    python benchmarks/bench_agent_routing.py [--questions 20]
+        [--large-latency 0.3] [--small-latency 0.12]
+"""
+import argparse
+import asyncio
+import time
+
+from _common import percentile, setup_environment
+
+setup_environment()
+
+from langchain_core.language_models.chat_models import BaseChatModel  # noqa: E402
+from langchain_core.messages import AIMessage, HumanMessage  # noqa: E402
+from langchain_core.outputs import ChatGeneration, ChatResult  # noqa: E402
+
+import _fakes  # noqa: E402
+from src.app.core.agents import agents, latency  # noqa: E402
+from src.app.core.agents.graph import run_qa_flow  # noqa: E402
+from src.app.core.config import get_settings  # noqa: E402
+from src.app.core.llm.factory import agent_model_config  # noqa: E402
+from src.app.core.retrieval import vector_store_rest  # noqa: E402
+
+LARGE_MODEL = "gpt-4o-mini"
+SMALL_MODEL = "gpt-4.1-nano"
+
+
+class RoutedChatModel(BaseChatModel):
+    """Chat model that sleeps for the assumed latency of `model`."""
+
+    model: str
+    latency: float
+    reply: str = "Context gathered."
+
+    @property
+    def _llm_type(self) -> str:
+        return "routed-fake"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        raise NotImplementedError
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.reply))])
+
+
+def routed_model(agent: str, latencies: dict, reply: str) -> RoutedChatModel:
+    model = agent_model_config(agent).model
+    return RoutedChatModel(model=model, latency=latencies[model], reply=reply)
+
+
+class RoutedAgent:
+    """Fake agent making one call to the model routed to `agent`."""
+
+    def __init__(self, agent: str, reply: str, latencies: dict):
+        self.agent = agent
+        self.reply = reply
+        self.latencies = latencies
+
+    async def ainvoke(self, payload, config=None):
+        model = routed_model(self.agent, self.latencies, self.reply)
+        message = await model.ainvoke(payload["messages"], config=config)
+        return {"messages": [*payload["messages"], message]}
+
+
+class RoutedRetrievalAgent:
+    """Plans one tool call, runs the real retrieval tool, then finishes."""
+
+    def __init__(self, latencies: dict):
+        self.latencies = latencies
+
+    async def ainvoke(self, payload, config=None):
+        question = payload["messages"][-1].content
+        model = routed_model("retrieval", self.latencies, "Context gathered.")
+        await model.ainvoke(payload["messages"], config=config)
+        tool_message = await agents.retrieval_tool.ainvoke(
+            {
+                "name": "retrieval_tool",
+                "args": {"query": question},
+                "id": "call_0",
+                "type": "tool_call",
+            }
+        )
+        final = await model.ainvoke([*payload["messages"], tool_message], config=config)
+        return {"messages": [HumanMessage(content=question), tool_message, final]}
+
+
+async def run(questions: int) -> list:
+    vector_store_rest._get_query_cache.cache_clear()
+    latencies = []
+    for i in range(questions):
+        start = time.perf_counter()
+        await run_qa_flow(f"question {i}", "strict")
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--large-latency", type=float, default=0.3)
+    parser.add_argument("--small-latency", type=float, default=0.12)
+    args = parser.parse_args()
+
+    model_latency = {LARGE_MODEL: args.large_latency, SMALL_MODEL: args.small_latency}
+    _fakes.install_fakes()
+    settings = get_settings()
+    settings.openai_model_name = LARGE_MODEL
+    settings.retrieval_strategy = "agent"
+    agents.retrieval_agent = RoutedRetrievalAgent(model_latency)
+    agents.summarization_agent = RoutedAgent("summarization", "Draft answer C1.", model_latency)
+    agents.verification_agent = RoutedAgent("verification", "Verified answer C1.", model_latency)
+
+    routes = {
+        "single model": None,
+        "routed": SMALL_MODEL,
+    }
+    print(
+        f"{args.questions} questions, strict profile, agent retrieval; assumed latency "
+        f"{LARGE_MODEL} {args.large_latency * 1000:.0f} ms, {SMALL_MODEL} {args.small_latency * 1000:.0f} ms"
+    )
+    print(f"{'configuration':<14} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+    for name, small in routes.items():
+        settings.retrieval_model_name = small
+        settings.verification_model_name = small
+        timings = asyncio.run(run(args.questions))
+        print(f"{name:<14} {percentile(timings, 50):>9.0f} {percentile(timings, 95):>9.0f}")
+
+    print("\nper-agent calls (get_agent_latency_metrics)")
+    print(f"{'agent':<14} {'model':<14} {'calls':>6} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+    for agent, models in latency.get_agent_latency_metrics().items():
+        for model, stats in models.items():
+            print(
+                f"{agent:<14} {model:<14} {stats['calls']:>6} "
+                f"{stats['p50_ms']:>9.0f} {stats['p95_ms']:>9.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
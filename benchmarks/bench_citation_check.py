@@ -0,0 +1,186 @@
+"""Verification calls skipped by the citation check, and the latency saved.
+
+Runs the full QA graph with the fakes from `_fakes.py` (300 ms per LLM
+call, direct retrieval), once with the "strict" profile (every draft goes
+to the Verification Agent) and once with "balanced" (the check runs
+first and only failing drafts are verified). The fake vector store
+returns chunks of synthetic text, and the fake Summarization Agent writes
+drafts from the chunks it receives:
+
+- grounded: sentences copied from the cited chunk, lightly reworded;
+- paraphrased: half of each sentence's words replaced (still a real
+  answer, but one the lexical check cannot confirm);
+- faulty (`--fault-rate`): an unknown chunk ID, an uncited claim, a
+  claim whose words appear in no chunk, or a number the chunk lacks.
+
+The script reports the share of questions that skip verification, how
+many faulty drafts were accepted (should be 0), and per-question latency.
+
+Usage:
+    python benchmarks/bench_citation_check.py [--questions 200] [--fault-rate 0.2]
+        [--paraphrase-rate 0.2]
+"""
+import argparse
+import asyncio
+import re
+import time
+import zlib
+
+from _common import percentile, setup_environment
+
+setup_environment()
+
+import numpy as np  # noqa: E402
+from langchain_core.messages import AIMessage  # noqa: E402
+
+import _fakes  # noqa: E402
+from src.app.core.agents import agents  # noqa: E402
+from src.app.core.agents.graph import run_qa_flow  # noqa: E402
+from src.app.core.config import get_settings  # noqa: E402
+
+VOCABULARY = [f"term{i}" for i in range(4000)]
+FAULTS = ("unknown id", "uncited claim", "unsupported claim", "wrong number")
+_CHUNK_RE = re.compile(r"\[(C\d+)\] Chunk from page [^\n]*\n(.*?)(?=\n\n\[C\d+\]|\Z)", re.S)
+
+
+def chunk_text(seed: int) -> str:
+    rng = np.random.default_rng(seed)
+    sentences = []
+    for _ in range(5):
+        words = list(rng.choice(VOCABULARY, size=int(rng.integers(10, 18))))
+        words.insert(int(rng.integers(len(words))), str(rng.integers(10, 999)))
+        sentences.append(" ".join(words) + ".")
+    return " ".join(sentences)
+
+
+class CorpusPineconeClient(_fakes.FakePineconeClient):
+    """Returns chunks of synthetic text that depend on the question's vector."""
+
+    async def aquery(self, vector, top_k=5, namespace="", ef_search=None, include_values=False):
+        await asyncio.sleep(_fakes.PINECONE_LATENCY)
+        base = zlib.crc32(str(vector).encode())
+        return {
+            "matches": [
+                {
+                    "id": f"vec_{base}_{i}",
+                    "score": 0.85 - 0.05 * i,
+                    "metadata": {"text": chunk_text(base + i), "page": i, "source": "paper.pdf"},
+                }
+                for i in range(top_k)
+            ]
+        }
+
+
+class QuestionEmbeddings(_fakes.FakeEmbeddings):
+    """Embeds each question differently so every question gets its own chunks."""
+
+    async def aembed_query(self, text):
+        await asyncio.sleep(_fakes.EMBED_LATENCY)
+        return [float(zlib.crc32(text.encode()) % 9973)] * self.dim
+
+
+class DraftWriter:
+    """Stands in for the Summarization Agent, writing drafts from the context."""
+
+    def __init__(self, kinds: dict):
+        self.kinds = kinds
+
+    def _sentence(self, rng, text: str, replace: float) -> str:
+        sentences = [s.rstrip(".").split() for s in text.split(". ") if s]
+        words = list(sentences[int(rng.integers(len(sentences)))])
+        for i in rng.choice(len(words), size=int(len(words) * replace), replace=False):
+            words[i] = f"alt{rng.integers(100000)}"
+        return " ".join(words)
+
+    def write(self, question: str, context: str) -> str:
+        rng = np.random.default_rng(zlib.crc32(question.encode()))
+        chunks = _CHUNK_RE.findall(context)
+        kind = self.kinds[question]
+        replace = 0.5 if kind == "paraphrased" else 0.1
+        parts = [
+            f"{self._sentence(rng, text, replace)} {chunk_id}."
+            for chunk_id, text in chunks[:2]
+        ]
+        if kind == "unknown id":
+            parts[-1] = parts[-1].replace(chunks[1][0], f"C{len(chunks) + 3}")
+        elif kind == "uncited claim":
+            parts.append(self._sentence(rng, chunks[2][1], 0.0) + ".")
+        elif kind == "unsupported claim":
+            parts.append(" ".join(f"alt{n}" for n in rng.integers(100000, size=8)) + " C3.")
+        elif kind == "wrong number":
+            parts[0] = parts[0].replace(" C1.", " in 12345 cases C1.")
+        return " ".join(parts)
+
+    async def ainvoke(self, payload, config=None):
+        content = payload["messages"][-1].content
+        question = content.split("\n", 1)[0].removeprefix("Question: ")
+        context = content.split("Context:\n", 1)[1].rsplit("\nAvailable chunk IDs", 1)[0]
+        await asyncio.sleep(_fakes.LLM_LATENCY)
+        return {"messages": [*payload["messages"], AIMessage(content=self.write(question, context))]}
+
+
+async def run(questions, profile: str) -> tuple:
+    latencies, states = [], []
+    for question in questions:
+        start = time.perf_counter()
+        states.append(await run_qa_flow(question, profile))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, states
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--questions", type=int, default=200)
+    parser.add_argument("--fault-rate", type=float, default=0.2)
+    parser.add_argument("--paraphrase-rate", type=float, default=0.2)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    questions = [f"What does section {i} say about term{i}?" for i in range(args.questions)]
+    kinds = {}
+    for question in questions:
+        draw = rng.random()
+        if draw < args.fault_rate:
+            kinds[question] = str(rng.choice(FAULTS))
+        elif draw < args.fault_rate + args.paraphrase_rate:
+            kinds[question] = "paraphrased"
+        else:
+            kinds[question] = "grounded"
+
+    _fakes.install_fakes()
+    _fakes.vector_store_rest._get_embeddings = lambda: QuestionEmbeddings()
+    _fakes.vector_store_rest._get_vector_backend = lambda: CorpusPineconeClient()
+    agents.summarization_agent = DraftWriter(kinds)
+    settings = get_settings()
+    settings.retrieval_strategy = "direct"
+
+    results = {
+        profile: asyncio.run(run(questions, profile)) for profile in ("strict", "balanced")
+    }
+
+    latencies, states = results["balanced"]
+    skipped = [state["citation_check"]["passed"] for state in states]
+    print(f"{len(questions)} questions, LLM call {_fakes.LLM_LATENCY * 1000:.0f} ms")
+    print(f"{'draft kind':<18} {'questions':>9} {'skipped':>8}")
+    for kind in ("grounded", "paraphrased", *FAULTS):
+        picked = [s for q, s in zip(questions, skipped) if kinds[q] == kind]
+        if picked:
+            print(f"{kind:<18} {len(picked):>9} {np.mean(picked):>8.0%}")
+    faulty_accepted = sum(s for q, s in zip(questions, skipped) if kinds[q] in FAULTS)
+    print(f"verification skipped: {np.mean(skipped):.1%}; faulty drafts accepted: {faulty_accepted}")
+
+    print(f"\n{'profile':<15} {'p50 (ms)':>9} {'p95 (ms)':>9} {'mean (ms)':>10}")
+    for name, (timings, _states) in results.items():
+        print(
+            f"{name:<15} {percentile(timings, 50):>9.0f} {percentile(timings, 95):>9.0f} "
+            f"{np.mean(timings):>10.0f}"
+        )
+    strict = results["strict"][0]
+    print(
+        f"p50 saved: {percentile(strict, 50) - percentile(latencies, 50):.0f} ms; "
+        f"mean saved: {np.mean(strict) - np.mean(latencies):.0f} ms per question"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Context size per question with and without merging adjacent chunks.
+
+Indexes synthetic multi-paragraph pages through the real `index_documents`
+(500-character chunks with a 50-character overlap, local vector backend,
+hashed bag-of-words embeddings), then asks questions made of a window of
+words from one page, so that neighbouring chunks are often retrieved
+together. The top-k documents are serialized with
+`serialize_chunks_with_ids` once chunk by chunk and once with adjacent or
+overlapping chunks merged into spans, and the script reports citation IDs,
+context characters and tokens per question. The context is sent to both
+the summarization and the verification call, so savings count twice.
+
+Tokens are counted with tiktoken's cl100k_base encoding when it can be
+loaded, otherwise estimated as characters / 4.
+
+Usage:
+    python benchmarks/bench_context_spans.py [--pages 100] [--queries 300] [--k 4]
+"""
+import argparse
+import os
+import tempfile
+
+from _common import setup_environment
+
+setup_environment()
+
+import numpy as np  # noqa: E402
+from langchain_core.documents import Document  # noqa: E402
+
+from _synthetic_vectors import HashedBagOfWordsEmbeddings  # noqa: E402
+from src.app.core.config import get_settings  # noqa: E402
+from src.app.core.retrieval import vector_store_rest  # noqa: E402
+from src.app.core.retrieval.local_vector_store import LocalVectorBackend  # noqa: E402
+from src.app.core.retrieval.serialization import serialize_chunks_with_ids  # noqa: E402
+
+
+def token_counter():
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("cl100k_base")
+        return lambda text: len(encoding.encode(text)), "cl100k_base tokens"
+    except Exception:
+        return lambda text: len(text) / 4, "estimated tokens (chars/4)"
+
+
+def build_pages(rng: np.random.Generator, pages: int) -> list:
+    vocabulary = [f"term{i}" for i in range(3000)]
+    documents = []
+    for page in range(pages):
+        paragraphs = []
+        for _ in range(rng.integers(3, 6)):
+            words = rng.choice(vocabulary, size=int(rng.integers(40, 110)))
+            paragraphs.append(" ".join(words) + ".")
+        documents.append(Document(
+            page_content="\n\n".join(paragraphs),
+            metadata={"source": "paper.pdf", "page": page},
+        ))
+    return documents
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--window", type=int, default=30)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    pages = build_pages(rng, args.pages)
+    count_tokens, token_unit = token_counter()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = get_settings()
+        settings.embedding_cache_path = os.path.join(tmp, "embeddings.sqlite3")
+        settings.sparse_index_enabled = False
+        vector_store_rest._get_embeddings = lambda: HashedBagOfWordsEmbeddings()
+        backend = LocalVectorBackend()
+        vector_store_rest._get_vector_backend = lambda: backend
+        stats = vector_store_rest.index_documents(pages)
+        print(f"{args.pages} pages -> {stats.chunks_indexed} chunks; k={args.k}; {token_unit}")
+
+        totals = {False: [], True: []}
+        ids = {False: [], True: []}
+        chars = {False: [], True: []}
+        for _ in range(args.queries):
+            words = pages[rng.integers(len(pages))].page_content.split()
+            start = int(rng.integers(0, max(1, len(words) - args.window)))
+            question = " ".join(words[start:start + args.window])
+            docs = vector_store_rest.retrieve(question, k=args.k)
+            for merge in (False, True):
+                context, citations = serialize_chunks_with_ids(docs, merge_spans=merge)
+                totals[merge].append(count_tokens(context))
+                ids[merge].append(len(citations))
+                chars[merge].append(len(context))
+
+    print(f"{'serialization':<14} {'citation IDs':>12} {'chars':>8} {'tokens':>8} {'tokens x2 calls':>16}")
+    for merge, name in ((False, "per chunk"), (True, "merged spans")):
+        print(
+            f"{name:<14} {np.mean(ids[merge]):>12.2f} {np.mean(chars[merge]):>8.0f} "
+            f"{np.mean(totals[merge]):>8.0f} {2 * np.mean(totals[merge]):>16.0f}"
+        )
+    saved = np.asarray(totals[False]) - np.asarray(totals[True])
+    print(
+        f"saved per question: {2 * saved.mean():.0f} tokens over both calls "
+        f"({saved.sum() / sum(totals[False]):.1%}); questions with a merge: "
+        f"{np.mean(np.asarray(ids[True]) < np.asarray(ids[False])):.0%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
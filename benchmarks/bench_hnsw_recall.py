@@ -0,0 +1,98 @@
+"""Recall@k vs latency of the HNSW index against exact search.
+
+For each corpus size, builds an `HNSWIndex` over synthetic vectors with a
+low intrinsic dimension (clustered points in a `--latent-dim` space,
+randomly projected to `--dim` plus a little noise), which resembles real
+text embeddings far more than uniform noise does. It then compares
+per-query latency and recall@k of HNSW at several `ef_search` values with
+exact matrix-product search, and reports build throughput and the size
+and load time of the serialized graph.
+
+Insertion runs in pure Python, so building is the slow part: roughly
+minutes at 100k vectors and about an hour at 1M. Pass `--sizes` to pick a
+subset.
+
+Usage:
+    python benchmarks/bench_hnsw_recall.py [--sizes 10000,100000,1000000] [--dim 128] [--k 10]
+        [--latent-dim 16]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from _common import percentile, setup_environment
+
+setup_environment()
+
+import numpy as np  # noqa: E402
+
+from _synthetic_vectors import embedding_like_vectors, noisy_queries  # noqa: E402
+from src.app.core.retrieval.hnsw import HNSWIndex  # noqa: E402
+from src.app.core.retrieval.local_vector_store import top_k_indices  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--latent-dim", type=int, default=16)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--m", type=int, default=16)
+    parser.add_argument("--ef-construction", type=int, default=100)
+    parser.add_argument("--ef-search", default="16,32,64,128,256")
+    args = parser.parse_args()
+
+    ef_values = [int(ef) for ef in args.ef_search.split(",")]
+    for size in (int(s) for s in args.sizes.split(",")):
+        rng = np.random.default_rng(0)
+        vectors = embedding_like_vectors(rng, size, args.dim, args.latent_dim)
+        queries = noisy_queries(rng, vectors, args.queries)
+
+        index = HNSWIndex(args.dim, m=args.m, ef_construction=args.ef_construction)
+        start = time.perf_counter()
+        for i, vector in enumerate(vectors):
+            index.add(vector, str(i))
+        build_seconds = time.perf_counter() - start
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.hnsw")
+            index.save(path)
+            graph_mb = os.path.getsize(path) / 1e6
+            start = time.perf_counter()
+            HNSWIndex.load(path)
+            load_seconds = time.perf_counter() - start
+
+        print(
+            f"\n{size} vectors x {args.dim} dims: built in {build_seconds:.0f}s "
+            f"({size / build_seconds:.0f} inserts/s), graph file {graph_mb:.0f} MB, "
+            f"loads in {load_seconds:.2f}s"
+        )
+
+        truth, exact_ms = [], []
+        for query in queries:
+            start = time.perf_counter()
+            scores = vectors @ query
+            top = top_k_indices(scores, args.k)
+            exact_ms.append((time.perf_counter() - start) * 1000)
+            truth.append({str(i) for i in top})
+
+        print(f"{'search':<14} {'recall@' + str(args.k):>10} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+        print(f"{'exact':<14} {1.0:>10.3f} {percentile(exact_ms, 50):>9.2f} {percentile(exact_ms, 95):>9.2f}")
+        for ef in ef_values:
+            latencies, recall = [], 0.0
+            for query, expected in zip(queries, truth):
+                start = time.perf_counter()
+                found = index.search(query, args.k, ef=ef)
+                latencies.append((time.perf_counter() - start) * 1000)
+                recall += len(expected & {label for label, _ in found}) / args.k
+            label = f"hnsw ef={ef}"
+            print(
+                f"{label:<14} {recall / len(queries):>10.3f} "
+                f"{percentile(latencies, 50):>9.2f} {percentile(latencies, 95):>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
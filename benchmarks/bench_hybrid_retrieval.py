@@ -0,0 +1,235 @@
+"""Recall@k of dense, BM25 and hybrid (RRF) retrieval, and their latency.
+
+Indexes a synthetic corpus through the real `index_documents` (local
+vector backend, BM25 index in a temp dir) and queries it with `retrieve`
+in "dense" mode, "hybrid" mode and BM25 alone. Each page is one chunk
+about four concepts of one topic; every concept has three interchangeable
+surface words, and half of the chunks also name a unique identifier such
+as "QX-4821" (an algorithm name or acronym).
+
+The stand-in embedding model maps each concept's words to one shared
+direction, so it handles paraphrases, but represents identifiers only
+weakly (`--identifier-weight`), as dense text embeddings tend to. Two
+question types are asked, each with exactly one relevant chunk:
+
+- exact-term: "how does QX-4821 use <concept>?", answerable only by
+  matching the identifier;
+- paraphrase: the chunk's four concepts, each in a randomly chosen
+  surface word, so keywords overlap only partly.
+
+Hybrid recall is reported for several RRF constants (`--rrf-k`): with
+short candidate lists a large constant weighs all ranks almost equally,
+so chunks found by both searches beat one search's top hit. The numbers
+show the mechanics of fusion on data built to contain both failure
+modes, not the quality of a particular embedding model. A second pass
+times `retrieve` with a simulated query embedding latency; in hybrid mode
+the keyword search runs while the query is being embedded.
+
+Usage:
+    python benchmarks/bench_hybrid_retrieval.py [--topics 40] [--chunks-per-topic 25]
+        [--queries 200] [--rrf-k 60,10,2] [--embed-latency 0.08]
+"""
+import argparse
+import hashlib
+import itertools
+import os
+import tempfile
+import time
+
+from _common import percentile, setup_environment
+
+setup_environment()
+
+import numpy as np  # noqa: E402
+from langchain_core.documents import Document  # noqa: E402
+
+from src.app.core.config import get_settings  # noqa: E402
+from src.app.core.retrieval import vector_store_rest  # noqa: E402
+from src.app.core.retrieval.local_vector_store import LocalVectorBackend  # noqa: E402
+
+DIM = 256
+K_VALUES = (1, 2, 4, 8, 16)
+FILLER = (
+    "method results model approach section shows using based proposed data "
+    "performance analysis figure table paper work first second also further "
+    "different general given important large number order small case study"
+).split()
+
+
+def pseudo_word(rng: np.random.Generator) -> str:
+    syllables = ["ka", "lo", "mi", "ren", "tu", "vas", "zor", "pel", "qui", "dra", "nex", "sol"]
+    return "".join(rng.choice(syllables, size=3))
+
+
+class ConceptEmbeddings:
+    """Bag-of-words embedding: concept words share a direction, identifiers are faint."""
+
+    def __init__(self, concept_of: dict, identifier_weight: float, latency: float = 0.0):
+        self.concept_of = concept_of
+        self.identifier_weight = identifier_weight
+        self.latency = latency
+
+    def _direction(self, key: str) -> np.ndarray:
+        seed = int.from_bytes(hashlib.sha256(key.encode()).digest()[:8], "little")
+        return np.random.default_rng(seed).standard_normal(DIM)
+
+    def _embed(self, text: str) -> list:
+        vector = np.zeros(DIM)
+        for word in text.lower().replace("?", " ").split():
+            if word in self.concept_of:
+                vector += self._direction(self.concept_of[word])
+            elif word in FILLER:
+                vector += 0.3 * self._direction(word)
+            elif "-" in word:
+                vector += self.identifier_weight * self._direction(word)
+        return (vector / max(np.linalg.norm(vector), 1e-12)).tolist()
+
+    def embed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        time.sleep(self.latency)
+        return self._embed(text)
+
+    async def aembed_query(self, text):
+        return self.embed_query(text)
+
+
+def build_corpus(rng: np.random.Generator, topics: int, chunks_per_topic: int, queries: int):
+    concept_of = {}
+    pages, exact, paraphrase = [], [], []
+    for topic in range(topics):
+        concepts = []
+        for c in range(10):
+            words = [pseudo_word(rng) for _ in range(3)]
+            for word in words:
+                concept_of[word] = f"t{topic}c{c}"
+            concepts.append(words)
+        combos = list(itertools.combinations(range(10), 4))
+        for index in rng.choice(len(combos), size=chunks_per_topic, replace=False):
+            chosen = [concepts[c] for c in combos[index]]
+            words = [str(rng.choice(synonyms)) for synonyms in chosen]
+            words += list(rng.choice(FILLER, size=40))
+            identifier = None
+            if rng.random() < 0.5:
+                identifier = f"QX-{rng.integers(1000, 9999)}"
+                words += [identifier] * 2
+            rng.shuffle(words)
+            page = len(pages)
+            pages.append(Document(
+                page_content=" ".join(words) + ".",
+                metadata={"source": "corpus.pdf", "page": page},
+            ))
+            if identifier:
+                exact.append((f"How does {identifier} use {rng.choice(chosen[0])}?", page))
+            paraphrase.append((" ".join(str(rng.choice(synonyms)) for synonyms in chosen) + "?", page))
+
+    picks = lambda items: [items[i] for i in rng.choice(len(items), min(queries, len(items)), replace=False)]
+    return pages, concept_of, {"exact-term": picks(exact), "paraphrase": picks(paraphrase)}
+
+
+def first_hit(docs, page: int) -> int:
+    """1-based rank of the relevant page, or 0 if missing."""
+    for rank, doc in enumerate(docs, start=1):
+        if doc.metadata.get("page") == page:
+            return rank
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--topics", type=int, default=40)
+    parser.add_argument("--chunks-per-topic", type=int, default=25)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--identifier-weight", type=float, default=0.2)
+    parser.add_argument("--rrf-k", default="60,10,2")
+    parser.add_argument("--embed-latency", type=float, default=0.08)
+    parser.add_argument("--timing-queries", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    pages, concept_of, query_sets = build_corpus(
+        rng, args.topics, args.chunks_per_topic, args.queries
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = get_settings()
+        settings.embedding_cache_enabled = False
+        settings.sparse_index_path = os.path.join(tmp, "sparse")
+        # The keyword index is only built when hybrid retrieval is configured
+        settings.retrieval_mode = "hybrid"
+        embeddings = ConceptEmbeddings(concept_of, args.identifier_weight)
+        backend = LocalVectorBackend()
+        vector_store_rest._get_embeddings = lambda: embeddings
+        vector_store_rest._get_vector_backend = lambda: backend
+
+        start = time.perf_counter()
+        stats = vector_store_rest.index_documents(pages)
+        index_seconds = time.perf_counter() - start
+        sparse_store = vector_store_rest._get_sparse_index_store()
+        sparse = sparse_store.get("")
+        print(
+            f"{stats.chunks_indexed} chunks indexed in {index_seconds:.2f}s; BM25 index: "
+            f"{len(sparse.terms)} terms, {len(sparse.posting_rows)} postings, "
+            f"{sparse.nbytes / 1024:.0f} KB of posting arrays"
+        )
+
+        depth = max(K_VALUES)
+        default_rrf_k = settings.hybrid_rrf_k
+        searches = {
+            "dense": ("dense", None),
+            "bm25": ("bm25", None),
+            **{f"rrf{rrf_k}": ("hybrid", int(rrf_k)) for rrf_k in args.rrf_k.split(",")},
+        }
+        ranks = {name: {} for name in searches}
+        for name, (mode, rrf_k) in searches.items():
+            settings.hybrid_rrf_k = rrf_k or default_rrf_k
+            for kind, queries in query_sets.items():
+                if mode == "bm25":
+                    results = [
+                        vector_store_rest._matches_to_documents(sparse_store.search(q, depth))
+                        for q, _ in queries
+                    ]
+                else:
+                    results = [vector_store_rest.retrieve(q, k=depth, mode=mode) for q, _ in queries]
+                ranks[name][kind] = [
+                    first_hit(docs, page) for docs, (_, page) in zip(results, queries)
+                ]
+        settings.hybrid_rrf_k = default_rrf_k
+
+        for kind in [*query_sets, "all"]:
+            count = sum(len(q) for q in query_sets.values()) if kind == "all" else len(query_sets[kind])
+            print(f"\nrecall@k, {kind} questions ({count}); rrfN = hybrid with HYBRID_RRF_K=N")
+            print(f"{'k':>3} " + " ".join(f"{mode:>8}" for mode in searches))
+            for k in K_VALUES:
+                row = []
+                for mode in searches:
+                    found = [
+                        r for key, rs in ranks[mode].items() if kind in ("all", key) for r in rs
+                    ]
+                    row.append(sum(1 for r in found if 0 < r <= k) / len(found))
+                print(f"{k:>3} " + " ".join(f"{value:>8.3f}" for value in row))
+
+        # Latency with a simulated embedding call; distinct queries keep the query cache cold
+        embeddings.latency = args.embed_latency
+        timing_queries = [q for q, _ in query_sets["exact-term"][:args.timing_queries]]
+        print(f"\nretrieve(k=4) latency, query embedding {args.embed_latency * 1000:.0f} ms")
+        print(f"{'mode':<8} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+        for mode in ("dense", "hybrid"):
+            vector_store_rest._get_query_cache.cache_clear()
+            timings = []
+            for query in timing_queries:
+                start = time.perf_counter()
+                vector_store_rest.retrieve(query, k=4, mode=mode)
+                timings.append((time.perf_counter() - start) * 1000)
+            print(f"{mode:<8} {percentile(timings, 50):>9.1f} {percentile(timings, 95):>9.1f}")
+        timings = []
+        for query in timing_queries:
+            start = time.perf_counter()
+            sparse_store.search(query, settings.hybrid_candidates)
+            timings.append((time.perf_counter() - start) * 1000)
+        print(f"{'bm25':<8} {percentile(timings, 50):>9.2f} {percentile(timings, 95):>9.2f}  (keyword search alone)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Wall time of the pipelined indexer versus a sequential embed-then-upsert.
+
+Indexes synthetic pages against fake embedding and Pinecone backends.
+The sequential baseline reproduces the previous behaviour: one blocking
+embedding call for every chunk, then upserts of 100 vectors one at a time.
+
+Usage:
+    python benchmarks/bench_indexing_pipeline.py [--pages 300]
+"""
+import argparse
+import time
+
+from _common import setup_environment
+
+setup_environment()
+
+from langchain_core.documents import Document  # noqa: E402
+
+from _fakes import EMBEDDINGS, PINECONE, install_fakes  # noqa: E402
+from src.app.core.config import get_settings  # noqa: E402
+from src.app.core.retrieval import vector_store_rest  # noqa: E402
+
+PAGE_TEXT = ("Vector databases index embeddings for similarity search. " * 50).strip()
+
+
+def make_pages(count: int):
+    return [
+        Document(page_content=PAGE_TEXT, metadata={"page": i, "source": "synthetic.pdf"})
+        for i in range(count)
+    ]
+
+
+def sequential_baseline(pages) -> int:
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
+    chunks = splitter.split_documents(pages)
+    embeddings = EMBEDDINGS.embed_documents([c.page_content for c in chunks])
+    vectors = [
+        {"id": f"vec_{i}", "values": e, "metadata": {**c.metadata, "text": c.page_content}}
+        for i, (c, e) in enumerate(zip(chunks, embeddings))
+    ]
+    for i in range(0, len(vectors), 100):
+        PINECONE.upsert(vectors[i:i + 100])
+    return len(chunks)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=300)
+    args = parser.parse_args()
+
+    install_fakes()
+    settings = get_settings()
+    settings.embedding_cache_enabled = False
+    vector_store_rest._get_embedding_cache.cache_clear()
+
+    start = time.perf_counter()
+    chunks = sequential_baseline(make_pages(args.pages))
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    stats = vector_store_rest.index_documents(make_pages(args.pages))
+    pipelined = time.perf_counter() - start
+
+    print(f"chunks: {chunks}")
+    print(f"sequential embed-then-upsert: {sequential:.2f} s")
+    print(
+        f"pipelined indexer:            {pipelined:.2f} s "
+        f"({stats.upsert_batches} upsert batches, {stats.upsert_retries} retries)"
+    )
+    print(f"speedup: {sequential / pipelined:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Memory footprint and recall/latency trade-offs of the IVF-PQ index.
+
+Builds `IVFPQIndex`es with several code sizes (`--m` bytes per vector) over
+embedding-like synthetic vectors and compares them with exact search over
+the full float32 matrix. For each index it reports resident bytes per
+vector and the compression factor, then recall@k and per-query latency
+across `nprobe` values, without re-ranking and with exact re-ranking of a
+`rerank * k` shortlist read from a memory-mapped float16 vector file (as
+the local backend does after `flush()`).
+
+Training runs k-means in NumPy and takes a few minutes at the defaults.
+
+Usage:
+    python benchmarks/bench_ivfpq.py [--count 100000] [--dim 1536] [--m 48,96,192]
+        [--nprobe 4,16,64] [--rerank 4]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from _common import percentile, setup_environment
+
+setup_environment()
+
+import numpy as np  # noqa: E402
+
+from _synthetic_vectors import embedding_like_vectors, noisy_queries  # noqa: E402
+from src.app.core.retrieval.ivfpq import IVFPQIndex  # noqa: E402
+from src.app.core.retrieval.local_vector_store import top_k_indices  # noqa: E402
+from src.app.core.retrieval.vector_file import VectorFile, write_vector_file  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--m", default="48,96,192")
+    parser.add_argument("--nlist", type=int, default=0)
+    parser.add_argument("--nprobe", default="4,16,64")
+    parser.add_argument("--rerank", type=int, default=4)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = embedding_like_vectors(rng, args.count, args.dim)
+    queries = noisy_queries(rng, vectors, args.queries)
+    nlist = args.nlist or max(1, min(int(4 * args.count ** 0.5), args.count // 39))
+    full_bytes = vectors.nbytes
+
+    truth, exact_ms = [], []
+    for query in queries:
+        start = time.perf_counter()
+        top = top_k_indices(vectors @ query, args.k)
+        exact_ms.append((time.perf_counter() - start) * 1000)
+        truth.append(set(top.tolist()))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "vectors.vec")
+        ids = [str(i) for i in range(args.count)]
+        write_vector_file(path, ids, vectors, [{} for _ in ids], dtype="float16")
+        mapped = VectorFile(path).matrix
+
+        print(
+            f"{args.count} vectors x {args.dim} dims, nlist={nlist}; "
+            f"float32 matrix {full_bytes / 1e6:.0f} MB ({full_bytes / args.count:.0f} B/vector)"
+        )
+        print(
+            f"exact search: recall@{args.k} 1.000, p50 {percentile(exact_ms, 50):.2f} ms, "
+            f"p95 {percentile(exact_ms, 95):.2f} ms"
+        )
+
+        for m in (int(value) for value in args.m.split(",")):
+            start = time.perf_counter()
+            index = IVFPQIndex.train(vectors, nlist=nlist, m=m)
+            index.add(vectors, np.arange(args.count))
+            build_seconds = time.perf_counter() - start
+            print(
+                f"\nm={m}: built in {build_seconds:.0f}s, resident {index.nbytes / 1e6:.1f} MB "
+                f"({index.nbytes / args.count:.0f} B/vector, {full_bytes / index.nbytes:.0f}x smaller)"
+            )
+            print(f"{'nprobe':>6} {'rerank':>6} {'recall@' + str(args.k):>10} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+            for nprobe in (int(value) for value in args.nprobe.split(",")):
+                for rerank in sorted({0, args.rerank}):
+                    latencies, recall = [], 0.0
+                    for query, expected in zip(queries, truth):
+                        start = time.perf_counter()
+                        found = index.search(query, args.k, nprobe=nprobe, rerank=rerank, vectors=mapped)
+                        latencies.append((time.perf_counter() - start) * 1000)
+                        recall += len(expected & {row for row, _ in found}) / args.k
+                    print(
+                        f"{nprobe:>6} {rerank:>6} {recall / len(queries):>10.3f} "
+                        f"{percentile(latencies, 50):>9.2f} {percentile(latencies, 95):>9.2f}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
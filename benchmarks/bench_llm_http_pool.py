@@ -0,0 +1,143 @@
+"""Back-to-back agent calls on library-default HTTP clients vs the shared pool.
+
+Starts a local stand-in for the OpenAI chat completions endpoint. Each new
+TCP connection sleeps for `--handshake-ms` to approximate the DNS + TLS
+setup a real request pays when it cannot reuse a connection, and each
+completion takes `--llm-ms`. One round makes the Retrieval, Summarization
+and Verification Agents' model calls back to back (async, as the graph
+does); rounds are separated by `--idle` seconds, like questions arriving
+from users.
+
+Two setups are compared:
+
+- library defaults: three `ChatOpenAI` instances with the clients
+  langchain-openai builds itself (SDK retries, 5 s keep-alive expiry);
+- shared pool: the agents' models from `get_agent_chat_model`, all on the
+  one pooled client of `core/llm/factory.py`.
+
+For each setup and idle gap the script reports per-call latency and the
+TCP connections the server accepted, plus the shared client's own
+connection-reuse metrics (as `/metrics` reports them).
+
+Usage:
+    python benchmarks/bench_llm_http_pool.py [--rounds 5] [--idle 0,6]
+        [--handshake-ms 40] [--llm-ms 20]
+"""
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from _common import percentile, setup_environment
+
+setup_environment()
+
+from langchain_core.messages import HumanMessage  # noqa: E402
+from langchain_openai import ChatOpenAI  # noqa: E402
+
+from src.app.core.llm import factory  # noqa: E402
+
+AGENTS = ("retrieval", "summarization", "verification")
+RESPONSE = json.dumps({
+    "id": "chatcmpl-bench",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o-mini",
+    "choices": [{
+        "index": 0,
+        "message": {"role": "assistant", "content": "Answer C1."},
+        "finish_reason": "stop",
+    }],
+    "usage": {"prompt_tokens": 10, "completion_tokens": 3, "total_tokens": 13},
+}).encode()
+
+
+def make_handler(handshake_seconds: float, llm_seconds: float, connections: list):
+    class StandInHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            # Called once per TCP connection, not once per request
+            connections.append(time.perf_counter())
+            time.sleep(handshake_seconds)
+            super().setup()
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(llm_seconds)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(RESPONSE)))
+            self.end_headers()
+            self.wfile.write(RESPONSE)
+
+        def log_message(self, *args):
+            pass
+
+    return StandInHandler
+
+
+async def run_rounds(models, rounds: int, idle: float) -> list:
+    latencies = []
+    for i in range(rounds):
+        if i:
+            await asyncio.sleep(idle)
+        for model in models:
+            start = time.perf_counter()
+            await model.ainvoke([HumanMessage(content=f"question {i}")])
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--idle", default="0,6")
+    parser.add_argument("--handshake-ms", type=float, default=40.0)
+    parser.add_argument("--llm-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    connections: list = []
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0),
+        make_handler(args.handshake_ms / 1000, args.llm_ms / 1000, connections),
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_port}/v1"
+
+    print(
+        f"{args.rounds} rounds x {len(AGENTS)} agent calls; handshake {args.handshake_ms:.0f} ms, "
+        f"completion {args.llm_ms:.0f} ms"
+    )
+    print(f"{'setup':<17} {'idle (s)':>8} {'connections':>11} {'p50 (ms)':>9} {'p95 (ms)':>9} {'mean (ms)':>10}")
+
+    async def run_all() -> None:
+        # One event loop for all runs: async HTTP clients are bound to their loop
+        setups = {
+            "library defaults": [
+                ChatOpenAI(model="gpt-4o-mini", api_key="sk-benchmark", temperature=0.0)
+                for _ in AGENTS
+            ],
+            "shared pool": [factory.get_agent_chat_model(agent) for agent in AGENTS],
+        }
+        for idle in (float(value) for value in args.idle.split(",")):
+            for name, models in setups.items():
+                before = len(connections)
+                latencies = await run_rounds(models, args.rounds, idle)
+                print(
+                    f"{name:<17} {idle:>8.0f} {len(connections) - before:>11} "
+                    f"{percentile(latencies, 50):>9.1f} {percentile(latencies, 95):>9.1f} "
+                    f"{sum(latencies) / len(latencies):>10.1f}"
+                )
+
+    asyncio.run(run_all())
+    server.shutdown()
+    print(f"shared client metrics: {factory.get_http_client_metrics()['async']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Per-question latency of repeated questions with the LLM response cache.
+
+Starts a local stand-in for the OpenAI chat completions endpoint whose
+completions take `--llm-ms`, and runs the real Summarization and
+Verification Agents (the "strict" profile, direct retrieval) against it;
+embeddings and Pinecone are the fakes from `_fakes.py`. The stand-in's
+reply depends on the request body, so different questions get different
+drafts, as they would from a real model.
+
+`--questions` questions are asked in order; a `--repeat-rate` share of
+them repeats an earlier question word for word. The script reports
+latency of first-time and repeated questions and the cache's hit
+counters, then starts a second worker process on the same SQLite file
+that asks the repeated questions again: its hits come from the disk
+store, as they would for another uvicorn worker on the host.
+
+Usage:
+    python benchmarks/bench_llm_response_cache.py [--questions 100]
+        [--repeat-rate 0.4] [--llm-ms 300]
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from _common import percentile, setup_environment
+
+setup_environment()
+
+import numpy as np  # noqa: E402
+
+
+def make_handler(llm_seconds: float, requests: list):
+    class StandInHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            requests.append(time.perf_counter())
+            time.sleep(llm_seconds)
+            response = json.dumps({
+                "id": "chatcmpl-bench",
+                "object": "chat.completion",
+                "created": 0,
+                "model": json.loads(body)["model"],
+                "choices": [{
+                    "index": 0,
+                    "message": {
+                        "role": "assistant",
+                        "content": f"Finding {zlib.crc32(body)} is reported in C1.",
+                    },
+                    "finish_reason": "stop",
+                }],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 8, "total_tokens": 18},
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(response)))
+            self.end_headers()
+            self.wfile.write(response)
+
+        def log_message(self, *args):
+            pass
+
+    return StandInHandler
+
+
+async def ask(questions) -> list:
+    # Imported late: the agents' models read OPENAI_BASE_URL when built
+    import _fakes
+    from src.app.core.agents.graph import run_qa_flow
+    from src.app.core.config import get_settings
+
+    _fakes.vector_store_rest._get_embeddings = lambda: _fakes.EMBEDDINGS
+    _fakes.vector_store_rest._get_vector_backend = lambda: _fakes.PINECONE
+    get_settings().retrieval_strategy = "direct"
+
+    latencies = []
+    for question in questions:
+        start = time.perf_counter()
+        await run_qa_flow(question, "strict")
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def second_worker(questions, results) -> None:
+    from src.app.core.llm.factory import get_response_cache_metrics
+
+    latencies = asyncio.run(ask(questions))
+    results.put((latencies, get_response_cache_metrics()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--questions", type=int, default=100)
+    parser.add_argument("--repeat-rate", type=float, default=0.4)
+    parser.add_argument("--llm-ms", type=float, default=300.0)
+    args = parser.parse_args()
+
+    requests: list = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.llm_ms / 1000, requests))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    cache_dir = tempfile.mkdtemp(prefix="llm_cache_bench_")
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_port}/v1"
+    os.environ["LLM_CACHE_PATH"] = os.path.join(cache_dir, "responses.sqlite3")
+
+    rng = np.random.default_rng(0)
+    questions, repeated = [], []
+    for i in range(args.questions):
+        if questions and rng.random() < args.repeat_rate:
+            questions.append(questions[int(rng.integers(len(questions)))])
+            repeated.append(True)
+        else:
+            questions.append(f"What does section {i} report about term{i}?")
+            repeated.append(False)
+
+    from src.app.core.llm.factory import get_response_cache_metrics
+
+    latencies = asyncio.run(ask(questions))
+    print(
+        f"{args.questions} questions ({sum(repeated)} repeats), strict profile, "
+        f"completion {args.llm_ms:.0f} ms; {len(requests)} LLM requests sent"
+    )
+    print(f"{'questions':<22} {'count':>6} {'p50 (ms)':>9} {'p95 (ms)':>9} {'mean (ms)':>10}")
+    for name, flag in (("first time", False), ("repeated", True)):
+        timings = [t for t, r in zip(latencies, repeated) if r == flag]
+        print(
+            f"{name:<22} {len(timings):>6} {percentile(timings, 50):>9.1f} "
+            f"{percentile(timings, 95):>9.1f} {np.mean(timings):>10.1f}"
+        )
+    print(f"cache metrics: {get_response_cache_metrics()}")
+
+    # A fresh process shares only the SQLite file, like another uvicorn worker
+    repeats = [q for q, r in zip(questions, repeated) if r]
+    before = len(requests)
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    worker = context.Process(target=second_worker, args=(repeats, results))
+    worker.start()
+    timings, metrics = results.get()
+    worker.join()
+    print(
+        f"{'second worker':<22} {len(timings):>6} {percentile(timings, 50):>9.1f} "
+        f"{percentile(timings, 95):>9.1f} {np.mean(timings):>10.1f}"
+        f"  ({len(requests) - before} LLM requests sent)"
+    )
+    print(f"second worker cache metrics: {metrics}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
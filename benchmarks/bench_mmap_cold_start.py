@@ -0,0 +1,143 @@
+"""Process start -> first query latency of the local backend's on-disk format.
+
+Builds a synthetic index of `--chunks` normalized embeddings with ~500
+character chunk texts, then starts fresh Python processes that answer one
+query either by
+
+- rebuilding: loading a .npy matrix and a JSON dump of the chunks and
+  upserting them into an in-memory `LocalVectorBackend`, or
+- mapping: opening the memory-mapped vector file with `LocalVectorBackend`.
+
+Both children import the same modules; "total" is measured by the parent
+from spawn to exit, "open" and "open+query" inside the child after
+imports. Exact search reads the whole matrix on the first query, so that
+query pays for paging it in; opening the file does not. Files were just
+written, so they are in the OS page cache unless dropping it succeeds
+(requires root).
+
+Usage:
+    python benchmarks/bench_mmap_cold_start.py [--chunks 100000] [--dim 1536] [--dtype float16]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from _common import ROOT_DIR, setup_environment
+
+setup_environment()
+
+import numpy as np  # noqa: E402
+
+from src.app.core.retrieval.local_vector_store import normalize_rows  # noqa: E402
+from src.app.core.retrieval.vector_file import write_vector_file  # noqa: E402
+
+CHILD = r"""
+import json, sys, time
+sys.path.insert(0, {root!r})
+import numpy as np
+from src.app.core.retrieval.local_vector_store import LocalVectorBackend
+mode, directory, dim = sys.argv[1], sys.argv[2], int(sys.argv[3])
+query = np.random.default_rng(7).standard_normal(dim).astype(np.float32)
+start = time.perf_counter()
+if mode == "map":
+    backend = LocalVectorBackend(path=directory)
+else:
+    backend = LocalVectorBackend()
+    matrix = np.load(directory + "/matrix.npy")
+    with open(directory + "/chunks.json") as f:
+        records = json.load(f)
+    for i in range(0, len(records), 1000):
+        backend.upsert([
+            {{"id": r["id"], "values": v, "metadata": r["metadata"]}}
+            for r, v in zip(records[i:i + 1000], matrix[i:i + 1000])
+        ])
+stats = backend.describe_index_stats()
+opened = time.perf_counter() - start
+result = backend.query(query, top_k=4)
+print(json.dumps({{
+    "opened": opened,
+    "seconds": time.perf_counter() - start,
+    "top": result["matches"][0]["id"],
+}}))
+"""
+
+
+def build(directory: str, chunks: int, dim: int, dtype: str) -> None:
+    rng = np.random.default_rng(0)
+    matrix = np.empty((chunks, dim), dtype=np.float32)
+    for start in range(0, chunks, 10_000):
+        block = rng.standard_normal((min(10_000, chunks - start), dim), dtype=np.float32)
+        matrix[start:start + len(block)] = normalize_rows(block)
+    ids = [f"chunk-{i}" for i in range(chunks)]
+    text = "lorem ipsum dolor sit amet " * 19
+    metadata = [{"source": "corpus.pdf", "page": i // 8, "text": text} for i in range(chunks)]
+
+    write_vector_file(os.path.join(directory, "ns-.vec"), ids, matrix, metadata, dtype)
+    np.save(os.path.join(directory, "matrix.npy"), matrix.astype(dtype))
+    with open(os.path.join(directory, "chunks.json"), "w") as f:
+        json.dump([{"id": i, "metadata": m} for i, m in zip(ids, metadata)], f)
+
+
+def drop_page_cache() -> bool:
+    try:
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("3\n")
+        return True
+    except OSError:
+        return False
+
+
+def run_child(mode: str, directory: str, dim: int) -> tuple:
+    cache_dropped = drop_page_cache()
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD.format(root=str(ROOT_DIR)), mode, directory, str(dim)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    total = time.perf_counter() - start
+    child = json.loads(output.strip().splitlines()[-1])
+    return total, child["opened"], child["seconds"], child["top"], cache_dropped
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunks", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--dtype", choices=["float32", "float16"], default="float16")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        build(directory, args.chunks, args.dim, args.dtype)
+        size_mb = os.path.getsize(os.path.join(directory, "ns-.vec")) / 1e6
+        print(
+            f"{args.chunks} chunks x {args.dim} dims ({args.dtype}): "
+            f"vector file {size_mb:.0f} MB, built in {time.perf_counter() - start:.1f}s"
+        )
+
+        print(f"{'mode':<10} {'total (ms)':>11} {'open (ms)':>10} {'open+query (ms)':>16}  page cache")
+        tops = set()
+        for mode in ("rebuild", "map"):
+            totals, opens, inner = [], [], []
+            for _ in range(args.runs):
+                total, opened, seconds, top, dropped = run_child(mode, directory, args.dim)
+                totals.append(total * 1000)
+                opens.append(opened * 1000)
+                inner.append(seconds * 1000)
+                tops.add(top)
+            print(
+                f"{mode:<10} {statistics.median(totals):>11.0f} {statistics.median(opens):>10.1f}"
+                f" {statistics.median(inner):>16.1f}"
+                f"  {'dropped' if dropped else 'warm'}"
+            )
+        print(f"same top result: {len(tops) == 1}")
+
+
+if __name__ == "__main__":
+    main()
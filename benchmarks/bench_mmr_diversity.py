@@ -0,0 +1,140 @@
+"""Near-duplicate chunks in retrieved context, with and without MMR.
+
+Indexes a synthetic corpus through the real `index_documents` (local
+vector backend) in which a third of the passages recur two or three times
+with small edits, as abstracts, summaries and repeated boilerplate do in
+real papers. The stand-in embedding is a hashed bag of words, so edited
+copies embed almost identically. Each question is built from one passage;
+`retrieve(k=4)` is run plainly and with MMR re-ranking at several lambda
+values, and for each run the script reports:
+
+- redundant: chunks per context whose cosine similarity to a higher
+  ranked chunk exceeds `--duplicate-threshold`;
+- passages: distinct source passages per context;
+- target: fraction of contexts containing the passage asked about;
+- wasted chars: context characters spent on redundant chunks;
+- the per-query latency of `retrieve` (query embedding excluded).
+
+Usage:
+    python benchmarks/bench_mmr_diversity.py [--passages 600] [--queries 200] [--k 4]
+        [--lambdas 1.0,0.7,0.5] [--fetch-multiplier 4]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from _common import percentile, setup_environment
+
+setup_environment()
+
+import numpy as np  # noqa: E402
+from langchain_core.documents import Document  # noqa: E402
+
+from _synthetic_vectors import HashedBagOfWordsEmbeddings  # noqa: E402
+from src.app.core.config import get_settings  # noqa: E402
+from src.app.core.retrieval import vector_store_rest  # noqa: E402
+from src.app.core.retrieval.local_vector_store import LocalVectorBackend  # noqa: E402
+
+
+def build_corpus(rng: np.random.Generator, passages: int, topics: int):
+    """Return (pages, passage number of each page, text of each passage)."""
+    vocabulary = [f"w{i}" for i in range(5000)]
+    topic_words = [rng.choice(vocabulary, size=40, replace=False) for _ in range(topics)]
+    texts = []
+    for p in range(passages):
+        words = list(rng.choice(topic_words[p % topics], size=45))
+        words += list(rng.choice(vocabulary, size=20))
+        rng.shuffle(words)
+        texts.append(words)
+
+    pages, origin = [], []
+    for p, words in enumerate(texts):
+        copies = 1 + (rng.integers(1, 3) if rng.random() < 1 / 3 else 0)
+        for _ in range(copies):
+            edited = list(words)
+            for i in rng.choice(len(edited), size=3, replace=False):
+                edited[i] = str(rng.choice(vocabulary))
+            origin.append(p)
+            pages.append(Document(
+                page_content=" ".join(edited) + ".",
+                metadata={"source": "corpus.pdf", "page": len(pages)},
+            ))
+    order = rng.permutation(len(pages))
+    pages = [pages[i] for i in order]
+    origin = [origin[i] for i in order]
+    for page, doc in enumerate(pages):
+        doc.metadata["page"] = page
+    return pages, origin, [" ".join(words) for words in texts]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--passages", type=int, default=600)
+    parser.add_argument("--topics", type=int, default=30)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--lambdas", default="1.0,0.7,0.5")
+    parser.add_argument("--fetch-multiplier", type=int, default=4)
+    parser.add_argument("--duplicate-threshold", type=float, default=0.9)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    pages, origin, passage_texts = build_corpus(rng, args.passages, args.topics)
+    queries = []
+    for p in rng.choice(args.passages, size=args.queries, replace=False):
+        words = passage_texts[p].split()
+        queries.append((" ".join(rng.choice(words, size=12, replace=False)) + "?", int(p)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = get_settings()
+        settings.embedding_cache_path = os.path.join(tmp, "embeddings.sqlite3")
+        settings.sparse_index_enabled = False
+        settings.mmr_fetch_multiplier = args.fetch_multiplier
+        embeddings = HashedBagOfWordsEmbeddings()
+        backend = LocalVectorBackend()
+        vector_store_rest._get_embeddings = lambda: embeddings
+        vector_store_rest._get_vector_backend = lambda: backend
+        stats = vector_store_rest.index_documents(pages)
+        print(
+            f"{args.passages} passages -> {stats.chunks_indexed} chunks "
+            f"({stats.chunks_indexed - args.passages} near-duplicate copies); k={args.k}, "
+            f"MMR candidates k*{args.fetch_multiplier}"
+        )
+
+        runs = [("plain", None)] + [(f"mmr l={value}", float(value)) for value in args.lambdas.split(",")]
+        print(
+            f"{'retrieval':<12} {'redundant':>9} {'passages':>9} {'target':>7} "
+            f"{'wasted chars':>13} {'p50 (ms)':>9} {'p95 (ms)':>9}"
+        )
+        for name, lambda_mult in runs:
+            if lambda_mult is not None:
+                settings.mmr_lambda = lambda_mult
+            redundant, distinct, hits, chars, latencies = [], [], 0, [], []
+            for query, passage in queries:
+                # Warm query cache: time retrieval, not the stand-in embedding
+                vector_store_rest._embed_query_cached(query)
+                start = time.perf_counter()
+                docs = vector_store_rest.retrieve(query, k=args.k, diversify=lambda_mult is not None)
+                latencies.append((time.perf_counter() - start) * 1000)
+
+                vectors = np.asarray(embeddings.embed_documents([d.page_content for d in docs]))
+                similarity = vectors @ vectors.T
+                repeats = [
+                    i for i in range(1, len(docs))
+                    if similarity[i, :i].max() > args.duplicate_threshold
+                ]
+                redundant.append(len(repeats))
+                chars.append(sum(len(docs[i].page_content) for i in repeats))
+                found = {origin[d.metadata["page"]] for d in docs}
+                distinct.append(len(found))
+                hits += passage in found
+            print(
+                f"{name:<12} {np.mean(redundant):>9.2f} {np.mean(distinct):>9.2f} "
+                f"{hits / len(queries):>7.3f} {np.mean(chars):>13.0f} "
+                f"{percentile(latencies, 50):>9.2f} {percentile(latencies, 95):>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
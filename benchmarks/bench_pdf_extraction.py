@@ -0,0 +1,57 @@
+"""Pages/sec of PDF text extraction as extraction worker processes increase.
+
+Compares `PyPDFLoader.lazy_load()` with `iter_pdf_pages` at several worker
+counts on a synthetic PDF. Scaling is bounded by the number of CPU cores.
+
+Usage:
+    python benchmarks/bench_pdf_extraction.py [--pages 1000] [--shard-pages 25]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from _common import setup_environment
+
+setup_environment()
+
+from langchain_community.document_loaders import PyPDFLoader  # noqa: E402
+
+from _synthetic_pdf import write_synthetic_pdf  # noqa: E402
+from src.app.services.pdf_extraction import iter_pdf_pages  # noqa: E402
+
+
+def rate(pages) -> tuple:
+    start = time.perf_counter()
+    count = sum(1 for _ in pages)
+    elapsed = time.perf_counter() - start
+    return count, count / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--shard-pages", type=int, default=25)
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, 8, cores})
+    print(f"CPU cores: {cores}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "synthetic.pdf")
+        write_synthetic_pdf(path, args.pages)
+
+        _, baseline = rate(PyPDFLoader(path).lazy_load())
+        print(f"{'extractor':<22} {'pages/s':>9} {'speedup':>8}")
+        print(f"{'PyPDFLoader':<22} {baseline:>9.1f} {1.0:>7.2f}x")
+        for workers in worker_counts:
+            _, pages_per_sec = rate(
+                iter_pdf_pages(path, workers=workers, shard_pages=args.shard_pages, min_pages=0)
+            )
+            label = f"process pool x{workers}"
+            print(f"{label:<22} {pages_per_sec:>9.1f} {pages_per_sec / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Per-query latency of PineconeRESTClient with and without connection pooling.
+
+Starts a local HTTP/1.1 stand-in for the Pinecone query endpoint. Each new
+TCP connection sleeps for `--handshake-ms` to approximate the DNS + TLS
+setup that a real Pinecone request pays when it cannot reuse a connection.
+
+Usage:
+    python benchmarks/bench_pinecone_pooling.py [--queries 200] [--handshake-ms 40]
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from _common import percentile, setup_environment
+
+setup_environment()
+
+from src.app.core.retrieval.vector_store_rest import PineconeRESTClient  # noqa: E402
+
+RESPONSE = json.dumps(
+    {
+        "matches": [
+            {"id": f"vec_{i}", "score": 0.9, "metadata": {"text": "x" * 500, "page": i}}
+            for i in range(4)
+        ]
+    }
+).encode()
+
+
+def make_handler(handshake_seconds: float):
+    class StandInHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body are written separately; avoid Nagle/delayed-ACK stalls
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            # Called once per TCP connection, not once per request
+            time.sleep(handshake_seconds)
+            super().setup()
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(RESPONSE)))
+            self.end_headers()
+            self.wfile.write(RESPONSE)
+
+        def log_message(self, *args):
+            pass
+
+    return StandInHandler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--handshake-ms", type=float, default=40.0)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.handshake_ms / 1000))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    vector = [0.01] * 1536
+
+    unpooled = []
+    for _ in range(args.queries):
+        start = time.perf_counter()
+        requests.post(
+            f"{base_url}/query",
+            headers={"Api-Key": "x"},
+            json={"vector": vector, "topK": 4, "includeMetadata": True, "namespace": ""},
+        ).json()
+        unpooled.append(time.perf_counter() - start)
+
+    client = PineconeRESTClient(api_key="x", index_name="bench", base_url=base_url)
+    pooled = []
+    for _ in range(args.queries):
+        start = time.perf_counter()
+        client.query(vector=vector, top_k=4)
+        pooled.append(time.perf_counter() - start)
+
+    server.shutdown()
+
+    print(f"{'mode':<22} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+    for label, values in (("bare requests.post", unpooled), ("pooled session", pooled)):
+        print(
+            f"{label:<22} {percentile(values, 50) * 1000:>9.2f} "
+            f"{percentile(values, 95) * 1000:>9.2f}"
+        )
+    print(f"pooled client metrics: {client.connection_stats()}")
+
+
+if __name__ == "__main__":
+    main()
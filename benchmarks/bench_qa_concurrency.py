@@ -0,0 +1,54 @@
+"""Throughput of the async QA pipeline under concurrent load on one worker.
+
+LLM calls, query embedding and the Pinecone query are replaced with fakes
+that `asyncio.sleep` for a realistic latency, so the numbers isolate how
+well the graph overlaps in-flight requests on a single event loop.
+
+Usage:
+    python benchmarks/bench_qa_concurrency.py [--requests 64]
+"""
+import argparse
+import asyncio
+import time
+
+from _common import setup_environment
+
+setup_environment()
+
+from _fakes import install_fakes  # noqa: E402
+from src.app.core.agents.graph import run_qa_flow  # noqa: E402
+
+
+async def run_batch(total: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            await run_qa_flow(f"question {i}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=64)
+    args = parser.parse_args()
+
+    install_fakes()
+    print(f"{'concurrency':>11} {'wall (s)':>9} {'req/s':>8} {'speedup':>8}")
+
+    baseline = None
+    for concurrency in (1, 2, 4, 8, 16, 32, 64):
+        elapsed = asyncio.run(run_batch(args.requests, concurrency))
+        throughput = args.requests / elapsed
+        baseline = baseline or throughput
+        print(
+            f"{concurrency:>11} {elapsed:>9.2f} {throughput:>8.2f} "
+            f"{throughput / baseline:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Latency and LLM calls per question of the fast, balanced and strict profiles.
+
+Runs `run_qa_flow` with each pipeline profile using the fakes from
+`_fakes.py` (300 ms per LLM call, 80 ms query embedding, 50 ms vector
+query). Every third draft of the fake Summarization Agent cites an
+unknown chunk and fails the citation check, so the balanced profile
+verifies a third of the questions. `latency_ms` is read
+from the result, as `/qa` reports it in `QAResponse`.
+
+Usage:
+    python benchmarks/bench_qa_profiles.py [--questions 40] [--retrieval-strategy direct]
+"""
+import argparse
+import asyncio
+import itertools
+
+from _common import percentile, setup_environment
+
+setup_environment()
+
+from _fakes import FakeAgent, install_fakes  # noqa: E402
+from src.app.core.retrieval import vector_store_rest  # noqa: E402
+from src.app.core.agents import agents  # noqa: E402
+from src.app.core.agents.graph import QA_PROFILES, run_qa_flow  # noqa: E402
+from src.app.core.config import get_settings  # noqa: E402
+
+
+class CountingAgent(FakeAgent):
+    """Fake agent that counts its calls and cycles through replies."""
+
+    calls = 0
+
+    def __init__(self, *replies: str):
+        super().__init__(replies[0])
+        self.replies = itertools.cycle(replies)
+
+    async def ainvoke(self, payload, config=None):
+        CountingAgent.calls += 1
+        self.reply = next(self.replies)
+        return await super().ainvoke(payload)
+
+
+async def run(profile: str, questions: int) -> tuple:
+    # Same questions for every profile: start each run with a cold query cache
+    vector_store_rest._get_query_cache.cache_clear()
+    latencies = []
+    calls_before = CountingAgent.calls
+    for i in range(questions):
+        result = await run_qa_flow(f"question {i}", profile)
+        assert result["profile"] == profile
+        latencies.append(result["latency_ms"])
+    return latencies, (CountingAgent.calls - calls_before) / questions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--questions", type=int, default=40)
+    parser.add_argument("--retrieval-strategy", choices=["agent", "direct"], default="direct")
+    args = parser.parse_args()
+
+    install_fakes()
+    get_settings().retrieval_strategy = args.retrieval_strategy
+    agents.summarization_agent = CountingAgent(
+        "Draft answer C1.", "Draft answer C2.", "Draft answer C9."
+    )
+    agents.verification_agent = CountingAgent("Verified answer C1.")
+
+    print(
+        f"{args.questions} questions per profile, retrieval strategy {args.retrieval_strategy!r} "
+        "(answer-stage LLM calls counted)"
+    )
+    print(f"{'profile':<9} {'LLM calls':>9} {'p50 (ms)':>9} {'p95 (ms)':>9} {'mean (ms)':>10}")
+    for profile in QA_PROFILES:
+        latencies, calls = asyncio.run(run(profile, args.questions))
+        print(
+            f"{profile:<9} {calls:>9.2f} {percentile(latencies, 50):>9.0f} "
+            f"{percentile(latencies, 95):>9.0f} {sum(latencies) / len(latencies):>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Time-to-first-event of `/qa/stream` versus the blocking `/qa` flow.
+
+Runs both flows against the fake backends and reports when the client
+first sees retrieved evidence (the `retrieval` event) compared with the
+time it takes for the complete answer to arrive.
+
+Usage:
+    python benchmarks/bench_qa_stream_ttfb.py [--runs 10]
+"""
+import argparse
+import asyncio
+import time
+
+from _common import percentile, setup_environment
+
+setup_environment()
+
+from _fakes import install_fakes  # noqa: E402
+from src.app.core.agents.graph import run_qa_flow, stream_qa_flow  # noqa: E402
+
+
+async def measure_blocking() -> float:
+    start = time.perf_counter()
+    await run_qa_flow("What is HNSW?")
+    return time.perf_counter() - start
+
+
+async def measure_stream() -> dict:
+    start = time.perf_counter()
+    timings = {}
+    async for event, _data in stream_qa_flow("What is HNSW?"):
+        timings.setdefault(event, time.perf_counter() - start)
+    timings["total"] = time.perf_counter() - start
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    install_fakes()
+    blocking = [asyncio.run(measure_blocking()) for _ in range(args.runs)]
+    streamed = [asyncio.run(measure_stream()) for _ in range(args.runs)]
+
+    rows = [
+        ("/qa full response", blocking),
+        ("/qa/stream first event", [t["stage"] for t in streamed]),
+        ("/qa/stream retrieval event", [t["retrieval"] for t in streamed]),
+        ("/qa/stream draft event", [t["draft"] for t in streamed]),
+        ("/qa/stream final answer", [t["answer"] for t in streamed]),
+    ]
+    print(f"{'measurement':<28} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+    for label, values in rows:
+        print(
+            f"{label:<28} {percentile(values, 50) * 1000:>9.1f} "
+            f"{percentile(values, 95) * 1000:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
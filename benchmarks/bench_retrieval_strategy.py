@@ -0,0 +1,57 @@
+"""Latency of the retrieval node with the "agent" and "direct" strategies.
+
+The agent strategy pays two simulated LLM calls around the vector search;
+the direct strategy only pays for the query embedding and the search.
+
+Usage:
+    python benchmarks/bench_retrieval_strategy.py [--runs 20] [--expansion]
+"""
+import argparse
+import asyncio
+import time
+
+from _common import percentile, setup_environment
+
+setup_environment()
+
+from _fakes import install_fakes  # noqa: E402
+from src.app.core.agents.agents import retrieval_node  # noqa: E402
+from src.app.core.config import get_settings  # noqa: E402
+
+
+async def measure(strategy: str, runs: int) -> list:
+    timings = []
+    for i in range(runs):
+        # Distinct questions per strategy so the query embedding cache stays cold
+        start = time.perf_counter()
+        await retrieval_node({"question": f"What is HNSW indexing? ({strategy} {i})"})
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--expansion", action="store_true")
+    args = parser.parse_args()
+
+    install_fakes()
+    settings = get_settings()
+    settings.retrieval_query_expansion = args.expansion
+
+    print(f"{'strategy':<10} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+    results = {}
+    for strategy in ("agent", "direct"):
+        settings.retrieval_strategy = strategy
+        timings = asyncio.run(measure(strategy, args.runs))
+        results[strategy] = percentile(timings, 50)
+        print(
+            f"{strategy:<10} {percentile(timings, 50) * 1000:>9.1f} "
+            f"{percentile(timings, 95) * 1000:>9.1f}"
+        )
+    saved = (results["agent"] - results["direct"]) * 1000
+    print(f"p50 saved per question: {saved:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Peak Python heap usage of streaming ingest on a synthetic 2,000-page PDF.
+
+Measures `index_pdf_file` (lazy page loading, bounded queues) with
+tracemalloc and compares it with the eager approach of materializing every
+page, chunk, embedding and vector before upserting. Streaming ingest is
+measured twice: with dense retrieval, and with `retrieval_mode="hybrid"`,
+which also writes the BM25 keyword index segment by segment. Embedding
+and Pinecone calls are served by zero-latency fakes with 1536-dimensional
+vectors. `--max-peak-mb` fails the run if either streaming peak exceeds it.
+
+Usage:
+    python benchmarks/bench_streaming_ingest.py [--pages 2000] [--max-peak-mb N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from _common import setup_environment
+
+setup_environment()
+
+import _fakes  # noqa: E402
+from _synthetic_pdf import write_synthetic_pdf  # noqa: E402
+from src.app.core.config import get_settings  # noqa: E402
+from src.app.core.retrieval import vector_store_rest  # noqa: E402
+from src.app.services.indexing_service import index_pdf_file  # noqa: E402
+
+
+def eager_ingest(path: str) -> int:
+    """The pre-streaming behaviour: every stage fully materialized in lists."""
+    from langchain_community.document_loaders import PyPDFLoader
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    docs = PyPDFLoader(path).load()
+    splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
+    chunks = [c for doc in docs for c in splitter.split_documents([doc])]
+    embeddings = _fakes.EMBEDDINGS.embed_documents([c.page_content for c in chunks])
+    vectors = [
+        {"id": f"vec_{i}", "values": e, "metadata": {**c.metadata, "text": c.page_content}}
+        for i, (c, e) in enumerate(zip(chunks, embeddings))
+    ]
+    for i in range(0, len(vectors), 100):
+        _fakes.PINECONE.upsert(vectors[i:i + 100])
+    return len(chunks)
+
+
+def measure(label: str, func, *args) -> float:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    chunks = getattr(result, "chunks_indexed", result)
+    print(f"{label:<10} chunks={chunks:<7} peak={peak / 2**20:>8.1f} MiB  time={elapsed:.1f} s")
+    return peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--max-peak-mb", type=float, default=None)
+    args = parser.parse_args()
+
+    _fakes.EMBED_LATENCY = _fakes.EMBED_PER_TEXT_LATENCY = 0.0
+    _fakes.PINECONE_LATENCY = _fakes.UPSERT_PER_VECTOR_LATENCY = 0.0
+    _fakes.EMBEDDINGS.dim = 1536
+    _fakes.install_fakes()
+    settings = get_settings()
+    settings.embedding_cache_enabled = False
+    vector_store_rest._get_embedding_cache.cache_clear()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "synthetic.pdf")
+        write_synthetic_pdf(path, args.pages)
+        print(f"synthetic PDF: {args.pages} pages, {os.path.getsize(path) / 2**20:.1f} MiB")
+        settings.sparse_index_path = os.path.join(tmp, "sparse")
+        vector_store_rest._get_sparse_index_store.cache_clear()
+        measure("eager", eager_ingest, path)
+        peaks = {"streaming": measure("streaming", index_pdf_file, path)}
+        settings.retrieval_mode = "hybrid"
+        peaks["hybrid"] = measure("hybrid", index_pdf_file, path)
+
+    over = [label for label, peak in peaks.items() if peak > (args.max_peak_mb or float("inf"))]
+    if over:
+        print(f"FAIL: {', '.join(over)} peak exceeds {args.max_peak_mb} MiB")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
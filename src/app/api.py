@@ -1,44 +1,102 @@
 from pathlib import Path
+import asyncio
+import logging
 import shutil
 import tempfile
+import threading
 import os
 import io
+import json
 import uuid
-from typing import Optional
+from typing import Any, BinaryIO, Callable, Dict, Optional, Set
 
 from fastapi import FastAPI, File, HTTPException, Request, UploadFile, status
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 import cloudinary
 import cloudinary.uploader
 
 # Import models and services
 from .models import QuestionRequest, QAResponse
-from .services.qa_service import answer_question
-from .services.indexing_service import index_pdf_file
-from .core.retrieval.vector_store import clear_index
+from .services.qa_service import answer_question, stream_answer
+from .services.indexing_jobs import get_index_job_manager
+from .core.retrieval.vector_store_rest import get_retrieval_metrics
+from .core.agents.citation_check import get_citation_check_metrics
+from .core.agents.latency import get_agent_latency_metrics
+from .core.llm.factory import get_http_client_metrics, get_response_cache_metrics
 from .core.config import get_settings
 
+logger = logging.getLogger(__name__)
+
 # Cloudinary configuration (lazy initialization)
 _settings_instance = None
 
-def _ensure_cloudinary_config():
-    """Ensure Cloudinary is configured. Raises HTTPException if not configured."""
+def _configure_cloudinary() -> bool:
+    """Configure Cloudinary if credentials are set.
+
+    Returns:
+        True if Cloudinary is configured, False if archival should be skipped.
+    """
     global _settings_instance
     if _settings_instance is None:
         _settings_instance = get_settings()
     
     if not _settings_instance.cloudinary_cloud_name:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Cloudinary is not configured. Please set CLOUDINARY_CLOUD_NAME, CLOUDINARY_API_KEY, and CLOUDINARY_API_SECRET environment variables."
-        )
+        return False
     
     cloudinary.config(
         cloud_name=_settings_instance.cloudinary_cloud_name,
         api_key=_settings_instance.cloudinary_api_key,
         api_secret=_settings_instance.cloudinary_api_secret,
     )
+    return True
+
+
+def _spool_to_temp_file(upload: BinaryIO) -> str:
+    """Copy an uploaded file to a named temp file and return its path."""
+    upload.seek(0)
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+        shutil.copyfileobj(upload, tmp, length=1024 * 1024)
+        return tmp.name
+
+
+def _archive_to_cloudinary(path: str) -> None:
+    """Upload a PDF to Cloudinary for archival; failures are only logged."""
+    try:
+        upload_result = cloudinary.uploader.upload(
+            path,
+            resource_type="raw",  # Use "raw" for non-image files like PDFs
+        )
+        logger.info(f"Archived PDF to Cloudinary: {upload_result.get('secure_url')}")
+    except Exception as e:
+        logger.warning(f"Cloudinary archival failed: {e}")
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _release_after(path: str, users: int) -> Callable[[], None]:
+    """Return a callback that removes `path` once called `users` times."""
+    remaining = [users]
+    lock = threading.Lock()
+
+    def release() -> None:
+        with lock:
+            remaining[0] -= 1
+            done = remaining[0] == 0
+        if done:
+            _remove_file(path)
+
+    return release
+
+
+# Keep references so background tasks are not garbage collected mid-flight
+_background_tasks: Set[asyncio.Task] = set()
 
 app = FastAPI(
     title="Class 12 Multi-Agent RAG Demo",
@@ -58,58 +116,118 @@ async def qa_endpoint(payload: QuestionRequest) -> QAResponse:
     question = payload.question.strip()
     if not question:
         raise HTTPException(status_code=400, detail="`question` must be a non-empty string.")
-    result = answer_question(question)
+    result = await answer_question(question, payload.profile)
     return QAResponse(
         answer=result.get("answer", ""),
         context=result.get("context", ""),
         citations=result.get("citations"),
+        profile=result.get("profile"),
+        latency_ms=result.get("latency_ms"),
     )
 
-@app.post("/index-pdf", status_code=status.HTTP_200_OK)
-async def index_pdf(file: UploadFile = File(...)) -> dict:
+def _format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/qa/stream")
+async def qa_stream_endpoint(payload: QuestionRequest) -> StreamingResponse:
+    """Answer a question as a Server-Sent Events stream of pipeline progress."""
+    question = payload.question.strip()
+    if not question:
+        raise HTTPException(status_code=400, detail="`question` must be a non-empty string.")
+
+    async def event_source():
+        try:
+            async for event, data in stream_answer(question, payload.profile):
+                yield _format_sse(event, data)
+        except Exception as e:
+            # Headers are already sent, so report failures in-band
+            yield _format_sse("error", {"detail": f"QA failed: {str(e)}"})
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.post("/index-pdf", status_code=status.HTTP_202_ACCEPTED)
+async def index_pdf(
+    file: UploadFile = File(...), incremental: Optional[bool] = None
+) -> dict:
     """
-    Handle PDF uploads by saving them to Cloudinary and indexing.
+    Accept a PDF upload and index it in a background job.
+
+    The upload is spooled to a local temp file and queued for indexing;
+    the response returns immediately with a job ID to poll at
+    `GET /index-jobs/{job_id}`. Archival to Cloudinary runs concurrently
+    in the background, or is skipped when Cloudinary is not configured.
+
+    With `?incremental=true` (default: `INDEX_INCREMENTAL`), only chunks
+    that changed since a file of the same name was last indexed are
+    embedded and upserted, and chunks that disappeared are deleted.
     """
     if file.content_type != "application/pdf":
         raise HTTPException(status_code=400, detail="Only PDF files are supported.")
 
-    # Ensure Cloudinary is configured before use
-    _ensure_cloudinary_config()
-
     try:
-        # Upload the file to Cloudinary
-        upload_result = cloudinary.uploader.upload(
-            file.file,
-            resource_type="raw",  # Use "raw" for non-image files like PDFs
-        )
-        
-        # Get the secure URL of the uploaded file
-        pdf_url = upload_result.get("secure_url")
-        if not pdf_url:
-            raise HTTPException(status_code=500, detail="Cloudinary upload failed: No URL returned.")
-
-        # 1. Clear the current vector index
-        clear_index()
-
-        # 2. Index the new PDF file from its Cloudinary URL
-        # PyPDFLoader can load from a URL
-        chunks_indexed = index_pdf_file(pdf_url)
-        
-        return {
-            "filename": file.filename,
-            "chunks_indexed": chunks_indexed,
-            "message": f"PDF indexed successfully from {pdf_url}",
-        }
-
+        tmp_path = await run_in_threadpool(_spool_to_temp_file, file.file)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Indexing failed: {str(e)}",
+            detail=f"Upload failed: {str(e)}",
         )
     finally:
         await file.close()
 
+    archive = _configure_cloudinary()
+    # The temp file is removed once both the job and the archival are done
+    release = _release_after(tmp_path, users=2 if archive else 1)
+
+    if incremental is None:
+        incremental = get_settings().index_incremental
+    job = get_index_job_manager().submit(
+        tmp_path, file.filename, on_finish=release, incremental=incremental
+    )
+
+    if archive:
+        archive_task = asyncio.create_task(
+            asyncio.to_thread(_archive_to_cloudinary, tmp_path)
+        )
+        _background_tasks.add(archive_task)
+        archive_task.add_done_callback(_background_tasks.discard)
+        archive_task.add_done_callback(lambda _: release())
+
+    return {
+        "job_id": job.id,
+        "filename": file.filename,
+        "status": job.status,
+        "status_url": f"/index-jobs/{job.id}",
+        "archive": "pending" if archive else "skipped",
+    }
+
+
+@app.get("/index-jobs/{job_id}")
+async def index_job_status(job_id: str) -> dict:
+    """Report stage, progress, throughput and ETA of an indexing job."""
+    job = get_index_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown indexing job.")
+    return job.to_dict()
+
 
 @app.get("/health")
 async def health_check() -> dict:
-    return {"status": "healthy", "environment": "production" if os.environ.get("VERCEL") else "local"}
\ No newline at end of file
+    return {"status": "healthy", "environment": "production" if os.environ.get("VERCEL") else "local"}
+
+
+@app.get("/metrics")
+async def metrics() -> dict:
+    """Expose in-process performance metrics for this worker."""
+    return {
+        "retrieval": get_retrieval_metrics(),
+        "citation_check": get_citation_check_metrics(),
+        "agents": get_agent_latency_metrics(),
+        "llm_http": get_http_client_metrics(),
+        "llm_response_cache": get_response_cache_metrics(),
+    }
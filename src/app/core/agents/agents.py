@@ -1,15 +1,27 @@
 """Agent implementations for the multi-agent RAG flow.
 
 This module defines three LangChain agents (Retrieval, Summarization,
-Verification) and thin node functions that LangGraph uses to invoke them.
+Verification) and thin node functions that LangGraph uses to invoke them,
+plus the LLM-free citation check node that decides whether verification
+is needed.
 """
 
+import asyncio
+import logging
+from dataclasses import asdict
 from typing import List, Dict, Any
 
 from langchain.agents import create_agent
+from langchain_core.documents import Document
 from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 
-from ..llm.factory import create_chat_model
+from ..config import get_settings
+from ..llm.factory import get_agent_chat_model
+from ..retrieval.query_expansion import expand_query, merge_results
+from ..retrieval.serialization import serialize_chunks_with_ids
+from ..retrieval.vector_store_rest import aretrieve
+from .citation_check import check_citations, record_check
+from .latency import agent_run_config
 from .prompts import (
     RETRIEVAL_SYSTEM_PROMPT,
     SUMMARIZATION_SYSTEM_PROMPT,
@@ -18,6 +30,8 @@ from .prompts import (
 from .state import QAState
 from .tools import retrieval_tool
 
+logger = logging.getLogger(__name__)
+
 
 def _extract_last_ai_content(messages: List[object]) -> str:
     """Extract the content of the last AIMessage in a messages list."""
@@ -43,39 +57,93 @@ def _extract_artifacts_from_messages(messages: List[object]) -> tuple:
     return [], {}
 
 
-# Define agents at module level for reuse
+# Define agents at module level for reuse; each uses the model routed to it
+# in Settings (`<agent>_model_name`, `_temperature`, `_max_tokens`)
 retrieval_agent = create_agent(
-    model=create_chat_model(),
+    model=get_agent_chat_model("retrieval"),
     tools=[retrieval_tool],
     system_prompt=RETRIEVAL_SYSTEM_PROMPT,
 )
 
 summarization_agent = create_agent(
-    model=create_chat_model(),
+    model=get_agent_chat_model("summarization"),
     tools=[],
     system_prompt=SUMMARIZATION_SYSTEM_PROMPT,
 )
 
 verification_agent = create_agent(
-    model=create_chat_model(),
+    model=get_agent_chat_model("verification"),
     tools=[],
     system_prompt=VERIFICATION_SYSTEM_PROMPT,
 )
 
 
-def retrieval_node(state: QAState) -> QAState:
-    """Retrieval Agent node: gathers context and citations from vector store.
+async def retrieval_node(state: QAState) -> QAState:
+    """Retrieval node: gathers context and citations from vector store.
+
+    With the "direct" retrieval strategy the vector store is queried
+    without any LLM round-trip; the Retrieval Agent only runs as a fallback
+    when the best match scores below `retrieval_min_score`. With the
+    "agent" strategy the Retrieval Agent always runs.
+
+    Stores context in `state["context"]` and citations in `state["citations"]`.
+    """
+    question = state["question"]
+    settings = get_settings()
+
+    if settings.retrieval_strategy == "direct":
+        docs = await _direct_retrieve(question)
+        best_score = max((doc.metadata.get("score") or 0.0 for doc in docs), default=0.0)
+        if best_score >= settings.retrieval_min_score:
+            return _context_update(docs)
+        logger.info(
+            "Direct retrieval best score %.3f below %.3f, falling back to Retrieval Agent",
+            best_score,
+            settings.retrieval_min_score,
+        )
+
+    return await _agent_retrieve(question)
+
+
+async def direct_retrieval_node(state: QAState) -> QAState:
+    """Direct retrieval node: queries the vector store without any LLM call.
+
+    Unlike `retrieval_node` it never falls back to the Retrieval Agent,
+    whatever the retrieval strategy or match scores.
+    """
+    return _context_update(await _direct_retrieve(state["question"]))
+
+
+def _context_update(docs: List[Document]) -> QAState:
+    """Serialize retrieved chunks into the `context`/`citations` state update."""
+    context, citations = serialize_chunks_with_ids(docs)
+    return {
+        "context": context,
+        "citations": citations if citations else None,
+    }
+
+
+async def _direct_retrieve(question: str) -> List[Document]:
+    """Query the vector store directly, optionally with query expansion."""
+    settings = get_settings()
+    k = settings.retrieval_k
+    queries = expand_query(question) if settings.retrieval_query_expansion else [question]
+    results = await asyncio.gather(*(aretrieve(query, k=k) for query in queries))
+    return merge_results(list(results), k)
+
+
+async def _agent_retrieve(question: str) -> QAState:
+    """Run the Retrieval Agent and extract context and citations.
 
-    This node:
     - Sends the user's question to the Retrieval Agent.
     - The agent uses the attached retrieval tool to fetch document chunks.
     - Extracts the tool's content (CONTEXT string with chunk IDs) from ToolMessage.
     - Extracts the artifact containing citation_map from the retrieval_tool.
-    - Stores context in `state["context"]` and citations in `state["citations"]`.
     """
-    question = state["question"]
-
-    result = retrieval_agent.invoke({"messages": [HumanMessage(content=question)]})
+    result = await retrieval_agent.ainvoke(
+        {"messages": [HumanMessage(content=question)]},
+        config=agent_run_config("retrieval"),
+    )
 
     messages = result.get("messages", [])
     context = ""
@@ -97,7 +165,7 @@ def retrieval_node(state: QAState) -> QAState:
     }
 
 
-def summarization_node(state: QAState) -> QAState:
+async def summarization_node(state: QAState) -> QAState:
     """Summarization Agent node: generates draft answer with citations.
 
     This node:
@@ -117,8 +185,9 @@ def summarization_node(state: QAState) -> QAState:
 
     user_content = f"Question: {question}\n\nContext:\n{context}{citation_info}"
 
-    result = summarization_agent.invoke(
-        {"messages": [HumanMessage(content=user_content)]}
+    result = await summarization_agent.ainvoke(
+        {"messages": [HumanMessage(content=user_content)]},
+        config=agent_run_config("summarization"),
     )
     messages = result.get("messages", [])
     draft_answer = _extract_last_ai_content(messages)
@@ -128,7 +197,49 @@ def summarization_node(state: QAState) -> QAState:
     }
 
 
-def verification_node(state: QAState) -> QAState:
+async def answer_node(state: QAState) -> QAState:
+    """Single-call answer node: the Summarization Agent's draft is final.
+
+    Runs the Summarization Agent exactly like `summarization_node` and
+    stores its reply as both `draft_answer` and `answer`, with no check or
+    verification afterwards.
+    """
+    update = await summarization_node(state)
+    update["answer"] = update["draft_answer"]
+    return update
+
+
+async def citation_check_node(state: QAState) -> QAState:
+    """Citation check node: accepts grounded drafts without an LLM call.
+
+    Runs `check_citations` on the draft answer. When it passes, the draft
+    becomes the final `answer` and the graph ends; otherwise the draft goes
+    on to the Verification Agent. The report is kept in
+    `state["citation_check"]`.
+    """
+    draft_answer = state.get("draft_answer") or ""
+    report = check_citations(
+        draft_answer,
+        state.get("citations"),
+        min_support=get_settings().citation_min_support,
+    )
+    record_check(report)
+    if not report.passed:
+        logger.info(
+            "Citation check failed (unknown IDs: %s, uncited: %d, unsupported: %d), "
+            "running Verification Agent",
+            report.unknown_ids,
+            len(report.uncited_sentences),
+            len(report.unsupported_sentences),
+        )
+
+    update: QAState = {"citation_check": asdict(report)}
+    if report.passed:
+        update["answer"] = draft_answer
+    return update
+
+
+async def verification_node(state: QAState) -> QAState:
     """Verification Agent node: verifies answer and maintains citation accuracy.
 
     This node:
@@ -163,8 +274,9 @@ Please verify and correct the draft answer, ensuring:
 3. All cited chunks (e.g., C1, C2) must exist in the context{citation_info}
 4. Return only the corrected answer with proper citations (no explanations)."""
 
-    result = verification_agent.invoke(
-        {"messages": [HumanMessage(content=user_content)]}
+    result = await verification_agent.ainvoke(
+        {"messages": [HumanMessage(content=user_content)]},
+        config=agent_run_config("verification"),
     )
     messages = result.get("messages", [])
     answer = _extract_last_ai_content(messages)
@@ -0,0 +1,180 @@
+"""Deterministic citation and grounding check of draft answers.
+
+The Verification Agent spends a full LLM call on every question, largely
+to confirm that the draft's citations point at chunks that exist and say
+what the draft claims. Most of that can be checked in Python: this module
+parses the citation tokens (`C3`, `[C3]`, `C1, C2`) of a draft, validates
+them against the citation map, and scores each sentence by the share of
+its content words that occur in the text of the chunks it cites.
+
+A draft passes when every citation exists, every claim sentence (one with
+at least `_MIN_CLAIM_TERMS` content words) cites a chunk, and each claim
+reaches the minimum lexical support. Numbers are treated strictly: a claim
+citing a figure that its chunks do not contain fails. Anything that does
+not pass goes to the Verification Agent as before, so the check only ever
+removes calls for drafts that are already grounded.
+"""
+
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+from ..retrieval.sparse_index import tokenize
+
+# Chunk IDs as produced by `serialize_chunks_with_ids` ("C1", "C12")
+_CITATION_RE = re.compile(r"\bC(\d+)\b")
+# Brackets and separators left behind once citation IDs are removed
+_CITATION_RESIDUE_RE = re.compile(r"[\[\]()]|(?<=\s),|\s+(?=[.!?,;:])")
+# Sentence ends, plus line breaks (bullet lists rarely end with a period)
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+# Sentences with fewer content words ("In summary:") are not claims
+_MIN_CLAIM_TERMS = 3
+# Words are compared by prefix, a cheap stand-in for stemming
+# ("indexes", "indexing" -> "index"); numbers are compared whole
+_STEM_LENGTH = 5
+
+
+@dataclass
+class CitationCheck:
+    """Outcome of `check_citations` for one draft answer."""
+
+    passed: bool
+    cited_ids: List[str] = field(default_factory=list)
+    # Cited IDs missing from the citation map
+    unknown_ids: List[str] = field(default_factory=list)
+    # Claim sentences without any citation
+    uncited_sentences: List[str] = field(default_factory=list)
+    # Cited claim sentences below the support threshold
+    unsupported_sentences: List[str] = field(default_factory=list)
+    # Lowest lexical support over the cited claim sentences
+    min_support: Optional[float] = None
+
+
+def _is_number(term: str) -> bool:
+    return term.replace(".", "").isdigit()
+
+
+def _stem(term: str) -> str:
+    return term if _is_number(term) else term[:_STEM_LENGTH]
+
+
+def _stems(text: str) -> Set[str]:
+    return {_stem(term) for term in tokenize(text)}
+
+
+def _split_sentences(text: str) -> List[str]:
+    return [part.strip() for part in _SENTENCE_RE.split(text) if part.strip()]
+
+
+def _support(sentence: str, cited_stems: Set[str]) -> float:
+    """Share of the sentence's content words found in the cited chunks.
+
+    Returns 0.0 when the sentence cites a number the chunks do not contain.
+    """
+    terms = set(tokenize(sentence))
+    for term in terms:
+        if _is_number(term) and term not in cited_stems:
+            return 0.0
+    stems = {_stem(term) for term in terms}
+    return len(stems & cited_stems) / len(stems) if stems else 1.0
+
+
+def check_citations(
+    draft: str,
+    citations: Optional[Dict[str, Dict[str, Any]]],
+    min_support: float = 0.6,
+) -> CitationCheck:
+    """Validate the citations of a draft answer against the cited chunks.
+
+    Args:
+        draft: Draft answer with inline chunk IDs (e.g. "HNSW builds graphs C1.").
+        citations: Citation map from `serialize_chunks_with_ids`; each
+            entry's `snippet` holds the full chunk text.
+        min_support: Minimum share of a claim's content words that must
+            occur in the chunks it cites.
+
+    Returns:
+        A `CitationCheck`; `passed` is False for empty drafts or when
+        there is nothing to cite.
+    """
+    if not draft or not draft.strip() or not citations:
+        return CitationCheck(passed=False)
+
+    snippet_stems: Dict[str, Set[str]] = {}
+    report = CitationCheck(passed=False)
+    sentences: List[tuple] = []
+    for sentence in _split_sentences(draft):
+        ids = [f"C{number}" for number in _CITATION_RE.findall(sentence)]
+        text = _CITATION_RESIDUE_RE.sub("", _CITATION_RE.sub("", sentence)).strip()
+        if ids and not tokenize(text) and sentences:
+            # A citation on its own after the sentence end ("... graphs. [C1]")
+            sentences[-1][1].extend(ids)
+            continue
+        sentences.append((text, ids))
+
+    for text, ids in sentences:
+        for chunk_id in ids:
+            if chunk_id not in report.cited_ids:
+                report.cited_ids.append(chunk_id)
+            if chunk_id not in citations:
+                if chunk_id not in report.unknown_ids:
+                    report.unknown_ids.append(chunk_id)
+            elif chunk_id not in snippet_stems:
+                snippet_stems[chunk_id] = _stems(str(citations[chunk_id].get("snippet") or ""))
+
+        if len(set(tokenize(text))) < _MIN_CLAIM_TERMS:
+            continue
+        known = [chunk_id for chunk_id in ids if chunk_id in snippet_stems]
+        if not known:
+            if not ids:
+                report.uncited_sentences.append(text)
+            continue
+        support = _support(text, set().union(*(snippet_stems[i] for i in known)))
+        if report.min_support is None or support < report.min_support:
+            report.min_support = support
+        if support < min_support:
+            report.unsupported_sentences.append(text)
+
+    report.passed = bool(
+        report.cited_ids
+        and not report.unknown_ids
+        and not report.uncited_sentences
+        and not report.unsupported_sentences
+    )
+    return report
+
+
+class _CheckStats:
+    """Thread-safe counters of checked drafts and skipped verifications."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checked = 0
+        self.passed = 0
+
+    def record(self, passed: bool) -> None:
+        with self._lock:
+            self.checked += 1
+            self.passed += passed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "drafts_checked": self.checked,
+                "verification_skipped": self.passed,
+                "skip_rate": self.passed / self.checked if self.checked else None,
+            }
+
+
+_stats = _CheckStats()
+
+
+def record_check(report: CitationCheck) -> None:
+    """Count a check in this worker's metrics."""
+    _stats.record(report.passed)
+
+
+def get_citation_check_metrics() -> Dict[str, Any]:
+    """Return this worker's citation check counters."""
+    return _stats.stats()
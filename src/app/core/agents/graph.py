@@ -1,74 +1,237 @@
-"""LangGraph orchestration for the linear multi-agent QA flow."""
+"""LangGraph orchestration for the multi-agent QA flow.
 
+Three pipeline profiles trade LLM calls for answer checking:
+
+- fast: direct retrieval, then a single answer call with citations;
+- balanced: retrieval and summarization, then the Verification Agent only
+  for drafts that fail the deterministic citation check;
+- strict: retrieval, summarization and verification of every draft.
+
+Each profile is compiled once per worker and cached.
+"""
+
+import time
 from functools import lru_cache
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, Optional, Tuple, get_args
 
+from langchain_core.messages import AIMessageChunk
 from langgraph.constants import END, START
 from langgraph.graph import StateGraph
 
-from .agents import retrieval_node, summarization_node, verification_node
+from ..config import QAProfile, get_settings
+from .agents import (
+    answer_node,
+    citation_check_node,
+    direct_retrieval_node,
+    retrieval_node,
+    summarization_node,
+    verification_node,
+)
 from .state import QAState
 
+QA_PROFILES: Tuple[str, ...] = get_args(QAProfile)
+
+
+def route_after_citation_check(state: QAState) -> str:
+    """Send drafts that passed the citation check to END, others to verification."""
+    report = state.get("citation_check") or {}
+    return END if report.get("passed") else "verification"
+
 
-def create_qa_graph() -> Any:
-    """Create and compile the linear multi-agent QA graph.
+def create_qa_graph(profile: QAProfile = "strict") -> Any:
+    """Create and compile the QA graph of a pipeline profile.
 
-    The graph executes in order:
-    1. Retrieval Agent: gathers context from vector store
-    2. Summarization Agent: generates draft answer from context
-    3. Verification Agent: verifies and corrects the answer
+    The graphs execute in order:
+    - fast: direct retrieval (no Retrieval Agent fallback) -> answer
+    - balanced: retrieval -> summarization -> citation check, then
+      verification only if the check fails
+    - strict: retrieval -> summarization -> verification
+
+    Args:
+        profile: One of `QA_PROFILES`.
 
     Returns:
         Compiled graph ready for execution.
+
+    Raises:
+        ValueError: If the profile is unknown.
     """
+    if profile not in QA_PROFILES:
+        raise ValueError(f"Unknown QA profile {profile!r}; expected one of {QA_PROFILES}")
     builder = StateGraph(QAState)
 
+    if profile == "fast":
+        builder.add_node("retrieval", direct_retrieval_node)
+        builder.add_node("answer", answer_node)
+        builder.add_edge(START, "retrieval")
+        builder.add_edge("retrieval", "answer")
+        builder.add_edge("answer", END)
+        return builder.compile()
+
     # Add nodes for each agent
     builder.add_node("retrieval", retrieval_node)
     builder.add_node("summarization", summarization_node)
     builder.add_node("verification", verification_node)
 
-    # Define linear flow: START -> retrieval -> summarization -> verification -> END
     builder.add_edge(START, "retrieval")
     builder.add_edge("retrieval", "summarization")
-    builder.add_edge("summarization", "verification")
+    if profile == "balanced":
+        builder.add_node("citation_check", citation_check_node)
+        builder.add_edge("summarization", "citation_check")
+        builder.add_conditional_edges(
+            "citation_check",
+            route_after_citation_check,
+            {"verification": "verification", END: END},
+        )
+    else:
+        builder.add_edge("summarization", "verification")
     builder.add_edge("verification", END)
 
     return builder.compile()
 
 
-@lru_cache(maxsize=1)
-def get_qa_graph() -> Any:
-    """Get the compiled QA graph instance (singleton via LRU cache)."""
-    return create_qa_graph()
+def resolve_profile(profile: Optional[str] = None) -> str:
+    """Return `profile`, or the configured default profile when it is None."""
+    return profile or get_settings().qa_profile
+
+
+@lru_cache(maxsize=len(QA_PROFILES))
+def get_qa_graph(profile: str) -> Any:
+    """Get the compiled QA graph of a profile (compiled once per profile via LRU cache)."""
+    return create_qa_graph(profile)
 
 
-def run_qa_flow(question: str) -> Dict[str, Any]:
+async def run_qa_flow(question: str, profile: Optional[str] = None) -> Dict[str, Any]:
     """Run the complete multi-agent QA flow for a question.
 
-    This is the main entry point for the QA system. It:
+    This is the main entry point for the QA system. The graph runs with
+    `ainvoke`, so LLM and Pinecone round-trips yield to the event loop and
+    a single worker can serve many questions concurrently. It:
     1. Initializes the graph state with the question
-    2. Executes the linear agent flow (Retrieval -> Summarization -> Verification)
+    2. Executes the agent flow of the chosen profile
     3. Extracts and returns the final results
 
     Args:
         question: The user's question about the vector databases paper.
+        profile: Pipeline profile; defaults to `Settings.qa_profile`.
 
     Returns:
         Dictionary with keys:
-        - `answer`: Final verified answer
+        - `answer`: Final answer
         - `draft_answer`: Initial draft answer from summarization agent
         - `context`: Retrieved context from vector store
+        - `citation_check`: Citation check report, if the check ran
+        - `profile`: Profile that answered the question
+        - `latency_ms`: Wall time of the graph run
     """
-    graph = get_qa_graph()
+    start = time.perf_counter()
+    profile = resolve_profile(profile)
+    graph = get_qa_graph(profile)
+    final_state = await graph.ainvoke(_initial_state(question))
+
+    return {
+        **final_state,
+        "profile": profile,
+        "latency_ms": (time.perf_counter() - start) * 1000,
+    }
+
+
+# Nodes whose LLM tokens are forwarded to streaming clients. The Retrieval
+# Agent only emits tool calls, so its tokens are not useful to display.
+STREAMED_TOKEN_STAGES = ("answer", "summarization", "verification")
+
+
+def _next_stage(graph: Any, node: str, state: Dict[str, Any]) -> Optional[str]:
+    """Return the stage that starts once `node` has finished, if any."""
+    if node == "retrieval":
+        return "answer" if "answer" in graph.nodes else "summarization"
+    if node == "summarization" and "citation_check" not in graph.nodes:
+        return "verification"
+    if node == "citation_check" and route_after_citation_check(state) == "verification":
+        return "verification"
+    return None
+
 
-    initial_state: QAState = {
+def _initial_state(question: str) -> QAState:
+    """Build the graph input state for a question."""
+    return {
         "question": question,
         "context": None,
         "draft_answer": None,
         "answer": None,
+        "citations": None,
+        "citation_check": None,
     }
 
-    final_state = graph.invoke(initial_state)
 
-    return final_state
+async def stream_qa_flow(
+    question: str, profile: Optional[str] = None
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """Run the QA flow and yield progress events as the graph executes.
+
+    Uses LangGraph's `updates` stream mode for per-node results and the
+    `messages` mode (including subgraphs, since each node invokes an agent
+    graph) for LLM tokens.
+
+    Args:
+        question: The user's question about the vector databases paper.
+        profile: Pipeline profile; defaults to `Settings.qa_profile`.
+
+    Yields:
+        `(event, data)` tuples, in order:
+        - `stage`: `{"stage": name}` whenever an agent starts; no
+          verification stage follows drafts that pass the citation check
+        - `retrieval`: `{"context", "citations"}` once retrieval finishes
+        - `token`: `{"stage", "text"}` for answer/summarization/verification tokens
+        - `draft`: `{"draft_answer"}` once summarization finishes
+        - `answer`: `{"answer", "context", "citations", "profile", "latency_ms"}`
+          with the final result
+    """
+    start = time.perf_counter()
+    profile = resolve_profile(profile)
+    graph = get_qa_graph(profile)
+    state: Dict[str, Any] = dict(_initial_state(question))
+
+    yield "stage", {"stage": "retrieval"}
+
+    async for namespace, mode, chunk in graph.astream(
+        _initial_state(question),
+        stream_mode=["updates", "messages"],
+        subgraphs=True,
+    ):
+        if mode == "messages":
+            message, _metadata = chunk
+            # Namespace entries look like "summarization:<task id>"
+            stage = namespace[0].split(":", 1)[0] if namespace else None
+            if (
+                stage in STREAMED_TOKEN_STAGES
+                and isinstance(message, AIMessageChunk)
+                and isinstance(message.content, str)
+                and message.content
+            ):
+                yield "token", {"stage": stage, "text": message.content}
+            continue
+
+        # Only top-level node updates carry QAState changes
+        if namespace:
+            continue
+        for node, update in chunk.items():
+            state.update(update or {})
+            if node == "retrieval":
+                yield "retrieval", {
+                    "context": state.get("context") or "",
+                    "citations": state.get("citations"),
+                }
+            elif node == "summarization":
+                yield "draft", {"draft_answer": state.get("draft_answer") or ""}
+            next_stage = _next_stage(graph, node, state)
+            if next_stage:
+                yield "stage", {"stage": next_stage}
+
+    yield "answer", {
+        "answer": state.get("answer") or "",
+        "context": state.get("context") or "",
+        "citations": state.get("citations"),
+        "profile": profile,
+        "latency_ms": (time.perf_counter() - start) * 1000,
+    }
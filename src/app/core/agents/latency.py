@@ -0,0 +1,115 @@
+"""Per-agent LLM call latency, for tuning model routing from real traffic.
+
+The graph nodes invoke each agent with `agent_run_config`, which attaches
+a callback handler and tags the run with the agent's name. Every chat
+model call inside the agent loop is timed and recorded under the agent
+and the model that served it; tool execution between model calls (query
+embedding, vector search) is not included. `/metrics` reports call counts
+and latency percentiles over a window of recent calls per agent and model,
+so a cheaper model can be compared with the one it replaced.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.runnables import RunnableConfig
+
+from ..llm.factory import AgentName, agent_model_config
+
+# Recent calls kept per (agent, model) for percentiles
+_WINDOW = 1024
+
+
+class AgentLatencyTracker:
+    """Thread-safe latency samples per agent and model."""
+
+    def __init__(self, window: int = _WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: Dict[Tuple[str, str], Deque[float]] = {}
+        self._calls: Dict[Tuple[str, str], int] = {}
+
+    def record(self, agent: str, model: str, seconds: float) -> None:
+        key = (agent, model)
+        with self._lock:
+            if key not in self._samples:
+                self._samples[key] = deque(maxlen=self.window)
+                self._calls[key] = 0
+            self._samples[key].append(seconds * 1000)
+            self._calls[key] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return `{agent: {model: {calls, p50_ms, p95_ms, mean_ms}}}`."""
+        with self._lock:
+            snapshot = {key: sorted(samples) for key, samples in self._samples.items()}
+            calls = dict(self._calls)
+        result: Dict[str, Any] = {}
+        for (agent, model), samples in snapshot.items():
+            last = len(samples) - 1
+            result.setdefault(agent, {})[model] = {
+                "calls": calls[(agent, model)],
+                "p50_ms": round(samples[round(0.50 * last)], 1),
+                "p95_ms": round(samples[round(0.95 * last)], 1),
+                "mean_ms": round(sum(samples) / len(samples), 1),
+            }
+        return result
+
+
+class AgentLatencyCallback(BaseCallbackHandler):
+    """Times chat model runs tagged with an `agent` metadata key."""
+
+    # Timestamps must be taken when the run starts, not in an executor
+    run_inline = True
+
+    def __init__(self, tracker: AgentLatencyTracker):
+        self.tracker = tracker
+        self._lock = threading.Lock()
+        self._starts: Dict[UUID, Tuple[str, str, float]] = {}
+
+    def on_chat_model_start(
+        self,
+        serialized: Dict[str, Any],
+        messages: Any,
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        agent = (metadata or {}).get("agent")
+        if agent is None:
+            return
+        model = metadata.get("ls_model_name") or agent_model_config(agent).model
+        with self._lock:
+            self._starts[run_id] = (agent, model, time.perf_counter())
+
+    def _finish(self, run_id: UUID) -> None:
+        with self._lock:
+            started = self._starts.pop(run_id, None)
+        if started is not None:
+            agent, model, start = started
+            self.tracker.record(agent, model, time.perf_counter() - start)
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        # Failed calls are timed too
+        self._finish(run_id)
+
+
+_tracker = AgentLatencyTracker()
+_callback = AgentLatencyCallback(_tracker)
+
+
+def agent_run_config(agent: AgentName) -> RunnableConfig:
+    """Run config for an agent call whose model calls should be timed."""
+    return {"callbacks": [_callback], "metadata": {"agent": agent}}
+
+
+def get_agent_latency_metrics() -> Dict[str, Any]:
+    """Return this worker's per-agent, per-model chat model call latencies."""
+    return _tracker.stats()
@@ -10,6 +10,9 @@ class QAState(TypedDict):
     1. Retrieval Agent: populates `context` and `citations` from `question`
     2. Summarization Agent: generates `draft_answer` with inline citations
     3. Verification Agent: produces final `answer` while maintaining citation accuracy
+
+    Between steps 2 and 3 the citation check stores its report in
+    `citation_check` and, for drafts that pass, sets `answer` directly.
     """
 
     question: str
@@ -17,3 +20,4 @@ class QAState(TypedDict):
     draft_answer: Optional[str]
     answer: Optional[str]
     citations: Optional[Dict[str, Dict[str, Any]]]  # Maps chunk ID to metadata
+    citation_check: Optional[Dict[str, Any]]  # CitationCheck report of the draft
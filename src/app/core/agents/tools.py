@@ -1,14 +1,13 @@
 """Tools available to agents in the multi-agent RAG system."""
 
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool
 
 # Use REST API implementation for serverless compatibility
-from ..retrieval.vector_store_rest import retrieve
+from ..retrieval.vector_store_rest import aretrieve, retrieve
 from ..retrieval.serialization import serialize_chunks, serialize_chunks_with_ids
 
 
-@tool(response_format="content_and_artifact")
-def retrieval_tool(query: str):
+def _retrieve_with_citations(query: str):
     """Search the vector database for relevant document chunks.
 
     This tool retrieves the top 4 most relevant chunks from the Pinecone
@@ -33,3 +32,20 @@ def retrieval_tool(query: str):
     # Return tuple: (serialized content with IDs, artifact with docs and citation map)
     # This follows LangChain's content_and_artifact response format
     return context, (docs, citation_map)
+
+
+async def _aretrieve_with_citations(query: str):
+    """Async counterpart of `_retrieve_with_citations` used by `ainvoke`."""
+    docs = await aretrieve(query, k=4)
+    context, citation_map = serialize_chunks_with_ids(docs)
+    return context, (docs, citation_map)
+
+
+# Built with both a sync and an async implementation so the agent can run
+# the tool on the event loop when invoked through `ainvoke`.
+retrieval_tool = StructuredTool.from_function(
+    func=_retrieve_with_citations,
+    coroutine=_aretrieve_with_citations,
+    name="retrieval_tool",
+    response_format="content_and_artifact",
+)
@@ -4,9 +4,12 @@ This module uses Pydantic Settings to load and validate environment variables
 for OpenAI models, Pinecone settings, and other system parameters.
 """
 
-from typing import Optional
+from typing import Literal, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# QA graph profiles, fastest first (see `Settings.qa_profile`)
+QAProfile = Literal["fast", "balanced", "strict"]
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -16,9 +19,81 @@ class Settings(BaseSettings):
     openai_model_name: str = "gpt-4o-mini"
     openai_embedding_model: str = "text-embedding-3-small"
 
+    # OpenAI HTTP Client Configuration
+    # One pooled keep-alive client per worker is shared by every chat model
+    # and the embeddings client. Idle connections are kept for
+    # `keepalive_expiry` seconds so consecutive questions skip the TLS
+    # handshake; 429/5xx and connection errors are retried with jittered
+    # exponential backoff
+    openai_http_max_connections: int = 20
+    openai_http_max_keepalive_connections: int = 10
+    openai_http_keepalive_expiry: float = 60.0
+    openai_http_connect_timeout: float = 5.0
+    openai_http_read_timeout: float = 60.0
+    openai_http_max_retries: int = 3
+    openai_http_retry_backoff: float = 0.5
+    openai_http_retry_max_backoff: float = 8.0
+
+    # LLM Response Cache Configuration
+    # Exact-match cache of temperature-0 chat responses, keyed by model
+    # parameters and the full message list. An in-memory LRU per worker sits
+    # in front of a SQLite file that all workers on the host share
+    llm_cache_enabled: bool = True
+    # Defaults to a file in the system temp dir, which is writable on Vercel
+    llm_cache_path: Optional[str] = None
+    llm_cache_max_mb: int = 256
+    llm_cache_memory_entries: int = 1024
+    llm_cache_ttl_seconds: float = 86400.0
+
+    # Per-agent Model Routing
+    # Model name per agent (None = openai_model_name), temperature and
+    # completion token limit (None = provider default). The Retrieval Agent
+    # only writes search queries and the Verification Agent mostly trims
+    # text, so both can usually run on a smaller, faster model
+    retrieval_model_name: Optional[str] = None
+    retrieval_temperature: float = 0.0
+    retrieval_max_tokens: Optional[int] = None
+    summarization_model_name: Optional[str] = None
+    summarization_temperature: float = 0.0
+    summarization_max_tokens: Optional[int] = None
+    verification_model_name: Optional[str] = None
+    verification_temperature: float = 0.0
+    verification_max_tokens: Optional[int] = None
+
     # Pinecone Configuration
     pinecone_api_key: str
     pinecone_index_name: str
+    # Full index host URL (e.g. https://my-index-abc123.svc.us-east-1-aws.pinecone.io);
+    # defaults to https://{pinecone_index_name}.svc.pinecone.io
+    pinecone_index_host: Optional[str] = None
+    pinecone_pool_size: int = 10
+    pinecone_connect_timeout: float = 3.05
+    pinecone_read_timeout: float = 20.0
+    pinecone_max_retries: int = 3
+    pinecone_retry_backoff: float = 0.5
+
+    # Vector Backend Configuration
+    # "pinecone" uses the hosted index over REST; "local" keeps an
+    # in-process NumPy index (no network hop) searched exactly, with HNSW
+    # or with IVF-PQ; it is lost on restart unless local_index_path is set
+    vector_backend: Literal["pinecone", "local"] = "pinecone"
+    # Directory of memory-mapped snapshots for the local backend; when set,
+    # indexed namespaces survive restarts and load in milliseconds
+    local_index_path: Optional[str] = None
+    local_index_dtype: Literal["float32", "float16"] = "float32"
+    # "hnsw" answers local queries approximately from an HNSW graph; "ivfpq"
+    # compresses namespaces of 10k+ vectors to PQ codes when they are flushed
+    local_index_type: Literal["exact", "hnsw", "ivfpq"] = "exact"
+    hnsw_m: int = 16
+    hnsw_ef_construction: int = 200
+    # Default per-query beam width; retrieve(..., ef_search=) overrides it
+    hnsw_ef_search: int = 64
+    # IVF cells (0 = ~4*sqrt(n)), PQ bytes per vector, cells scanned per
+    # query, and exact re-rank shortlist as a multiple of k (0 disables)
+    ivfpq_nlist: int = 0
+    ivfpq_m: int = 96
+    ivfpq_nprobe: int = 16
+    ivfpq_rerank: int = 4
 
     # Cloudinary Configuration (optional - only needed for PDF uploads)
     # Note: Ensure CLOUDINARY_CLOUD_NAME is set in your .env file or Vercel environment variables
@@ -29,6 +104,81 @@ class Settings(BaseSettings):
 
     # Retrieval Configuration
     retrieval_k: int = 4
+    # "direct" queries the vector store without LLM round-trips and only
+    # falls back to the Retrieval Agent when the best match scores below
+    # `retrieval_min_score`; "agent" always runs the Retrieval Agent.
+    retrieval_strategy: Literal["agent", "direct"] = "direct"
+    retrieval_min_score: float = 0.3
+    retrieval_query_expansion: bool = False
+    # "hybrid" runs a BM25 keyword search concurrently with the dense query
+    # and fuses both rankings with reciprocal rank fusion (RRF)
+    retrieval_mode: Literal["dense", "hybrid"] = "dense"
+    # Matches taken from each search before fusion (never fewer than k)
+    hybrid_candidates: int = 20
+    hybrid_rrf_k: int = 60
+    # Maximal marginal relevance re-ranking: fetch k * multiplier candidates
+    # with their vectors and keep k that are relevant but not near-duplicates
+    # (lambda 1.0 = relevance only, 0.0 = diversity only)
+    retrieval_mmr: bool = False
+    mmr_lambda: float = 0.7
+    mmr_fetch_multiplier: int = 4
+
+    # Sparse (BM25) Index Configuration
+    # Built by index_documents when retrieval_mode is "hybrid", one segmented
+    # directory per namespace; query workers must share this directory with
+    # the indexer. Defaults to the system temp dir
+    sparse_index_enabled: bool = True
+    sparse_index_path: Optional[str] = None
+
+    # QA Pipeline Configuration
+    # Default profile when a request names none:
+    # "fast"     - direct retrieval, then one answer call with citations
+    # "balanced" - retrieval, summarization, then verification only for
+    #              drafts that fail the deterministic citation check
+    # "strict"   - retrieval, summarization, then verification of every draft
+    qa_profile: QAProfile = "balanced"
+    # Minimum share of a claim's content words found in the cited chunks
+    citation_min_support: float = 0.6
+
+    # PDF Extraction Configuration
+    # Worker processes for parallel text extraction of local PDFs; 0 or 1
+    # keeps extraction in-process (safest on serverless platforms)
+    pdf_extraction_workers: int = 0
+    pdf_extraction_shard_pages: int = 25
+    pdf_extraction_min_pages: int = 50
+
+    # Indexing Pipeline Configuration
+    # Concurrent background indexing jobs; further uploads wait in a queue
+    index_job_workers: int = 1
+    index_embed_batch_size: int = 128
+    index_upsert_concurrency: int = 4
+    # Stay below Pinecone's 2 MB upsert request limit
+    index_upsert_max_bytes: int = 1_900_000
+    # Retries per failed upsert batch; Pinecone upserts are not also retried
+    # at the HTTP level (pinecone_max_retries covers other requests)
+    index_upsert_retries: int = 3
+    # Re-index uploads in place, embedding only chunks that changed since the
+    # same filename was last indexed, instead of building a new generation
+    index_incremental: bool = False
+
+    # Embedding Cache Configuration (persists chunk embeddings between uploads)
+    embedding_cache_enabled: bool = True
+    # Defaults to a file in the system temp dir, which is writable on Vercel
+    embedding_cache_path: Optional[str] = None
+    embedding_cache_max_mb: int = 512
+
+    # Query Embedding Cache Configuration (in-memory, per worker)
+    query_cache_enabled: bool = True
+    query_cache_max_entries: int = 2048
+    query_cache_max_mb: int = 32
+    query_cache_ttl_seconds: float = 3600.0
+
+    # Index Generations (blue/green re-indexing)
+    # How long a worker caches the active-generation pointer
+    generation_pointer_ttl_seconds: float = 5.0
+    # Grace period before superseded generations are deleted; keep it above
+    # the pointer TTL so every worker has switched first
+    generation_gc_delay_seconds: float = 30.0
 
     model_config = SettingsConfigDict(
         env_file=".env",
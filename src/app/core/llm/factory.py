@@ -1,22 +1,194 @@
-"""Factory functions for creating LangChain v1 LLM instances."""
+"""Factory functions for creating LangChain v1 LLM instances.
 
+Each agent can be routed to its own model: the Retrieval Agent only writes
+search queries and the Verification Agent mostly trims text, so they can
+run on a smaller, faster model than the Summarization Agent. Clients are
+cached per configuration, so agents with identical settings share one
+`ChatOpenAI` instance.
+
+All chat models and the OpenAI embeddings client send their requests
+through one shared pooled `httpx` client per worker (sync and async),
+tuned by the `openai_http_*` settings; see `http_client.py`. Agents at
+temperature 0 also share the exact-match response cache of
+`response_cache.py`.
+"""
+
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Literal, Optional
+
+import httpx
 from langchain_openai import ChatOpenAI
 
 from ..config import get_settings
+from .http_client import (
+    AsyncRetryTransport,
+    HTTPClientStats,
+    RetryPolicy,
+    RetryTransport,
+)
+from .response_cache import LLMResponseCache
+
+logger = logging.getLogger(__name__)
+
+AgentName = Literal["retrieval", "summarization", "verification"]
+
+
+@dataclass(frozen=True)
+class ModelConfig:
+    """Chat model parameters; one cached client exists per distinct value."""
+
+    model: str
+    temperature: float = 0.0
+    max_tokens: Optional[int] = None
+
+
+_sync_stats = HTTPClientStats()
+_async_stats = HTTPClientStats()
+
+
+def _retry_policy() -> RetryPolicy:
+    settings = get_settings()
+    return RetryPolicy(
+        max_retries=settings.openai_http_max_retries,
+        backoff=settings.openai_http_retry_backoff,
+        max_backoff=settings.openai_http_retry_max_backoff,
+    )
+
+
+def _limits() -> httpx.Limits:
+    settings = get_settings()
+    return httpx.Limits(
+        max_connections=settings.openai_http_max_connections,
+        max_keepalive_connections=settings.openai_http_max_keepalive_connections,
+        keepalive_expiry=settings.openai_http_keepalive_expiry,
+    )
+
+
+def get_http_timeout() -> httpx.Timeout:
+    """Request timeouts for OpenAI calls (the SDK applies them per request)."""
+    settings = get_settings()
+    return httpx.Timeout(
+        settings.openai_http_read_timeout, connect=settings.openai_http_connect_timeout
+    )
+
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.Client:
+    """Get the shared pooled sync HTTP client for OpenAI requests."""
+    return httpx.Client(
+        timeout=get_http_timeout(),
+        transport=RetryTransport(_retry_policy(), _sync_stats, limits=_limits()),
+    )
 
 
-def create_chat_model(temperature: float = 0.0) -> ChatOpenAI:
+@lru_cache(maxsize=1)
+def get_async_http_client() -> httpx.AsyncClient:
+    """Get the shared pooled async HTTP client for OpenAI requests."""
+    return httpx.AsyncClient(
+        timeout=get_http_timeout(),
+        transport=AsyncRetryTransport(_retry_policy(), _async_stats, limits=_limits()),
+    )
+
+
+def get_http_client_metrics() -> Dict[str, Any]:
+    """Return request, connection-reuse and retry counters of the shared clients."""
+    return {"sync": _sync_stats.stats(), "async": _async_stats.stats()}
+
+
+@lru_cache(maxsize=1)
+def get_response_cache() -> Optional[LLMResponseCache]:
+    """Get the shared LLM response cache, or None if disabled."""
+    settings = get_settings()
+    if not settings.llm_cache_enabled:
+        return None
+    path = settings.llm_cache_path or os.path.join(
+        tempfile.gettempdir(), "class12_llm_cache.sqlite3"
+    )
+    try:
+        return LLMResponseCache(
+            path,
+            max_entries=settings.llm_cache_memory_entries,
+            max_bytes=settings.llm_cache_max_mb * 1024 * 1024,
+            ttl_seconds=settings.llm_cache_ttl_seconds,
+        )
+    except Exception as e:
+        # A cache that cannot be opened should never block answering
+        logger.warning(f"LLM response cache disabled: {e}")
+        return None
+
+
+def get_response_cache_metrics() -> Optional[Dict[str, Any]]:
+    """Return hit/miss counters of the LLM response cache, if enabled."""
+    cache = get_response_cache()
+    return cache.stats() if cache else None
+
+
+def create_chat_model(
+    temperature: float = 0.0,
+    model: Optional[str] = None,
+    max_tokens: Optional[int] = None,
+    cache: Optional[LLMResponseCache] = None,
+) -> ChatOpenAI:
     """Create a LangChain v1 ChatOpenAI instance.
 
     Args:
         temperature: Model temperature (default: 0.0 for deterministic outputs).
+        model: Model name; defaults to `openai_model_name`.
+        max_tokens: Completion token limit; None leaves it to the provider.
+        cache: Response cache to consult before each call; None disables caching.
 
     Returns:
         Configured ChatOpenAI instance.
     """
     settings = get_settings()
     return ChatOpenAI(
-        model=settings.openai_model_name,
+        model=model or settings.openai_model_name,
         api_key=settings.openai_api_key,
         temperature=temperature,
+        max_tokens=max_tokens,
+        cache=cache if cache is not None else False,
+        timeout=get_http_timeout(),
+        # Retried with jitter by the shared transport instead
+        max_retries=0,
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
+    )
+
+
+def agent_model_config(agent: AgentName) -> ModelConfig:
+    """Resolve the model settings of an agent.
+
+    Reads `<agent>_model_name`, `<agent>_temperature` and
+    `<agent>_max_tokens`; an unset model name falls back to
+    `openai_model_name`.
+    """
+    settings = get_settings()
+    return ModelConfig(
+        model=getattr(settings, f"{agent}_model_name") or settings.openai_model_name,
+        temperature=getattr(settings, f"{agent}_temperature"),
+        max_tokens=getattr(settings, f"{agent}_max_tokens"),
+    )
+
+
+@lru_cache(maxsize=None)
+def get_chat_model(config: ModelConfig) -> ChatOpenAI:
+    """Get the shared ChatOpenAI client of a configuration (cached per config).
+
+    Only temperature-0 configurations use the response cache; sampled
+    answers are not reproducible, so caching would change their behaviour.
+    """
+    return create_chat_model(
+        temperature=config.temperature,
+        model=config.model,
+        max_tokens=config.max_tokens,
+        cache=get_response_cache() if config.temperature == 0 else None,
     )
+
+
+def get_agent_chat_model(agent: AgentName) -> ChatOpenAI:
+    """Get the chat model routed to an agent by its settings."""
+    return get_chat_model(agent_model_config(agent))
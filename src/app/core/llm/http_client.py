@@ -0,0 +1,148 @@
+"""Pooled HTTP transports with retries and connection-reuse metrics.
+
+`core/llm/factory.py` builds one sync and one async `httpx` client on top
+of these transports and hands them to every OpenAI client (chat models
+and embeddings), so all agents share one keep-alive connection pool per
+worker instead of each SDK client opening its own TLS sessions.
+
+Retries happen here rather than in the OpenAI SDK (whose own retries are
+turned off), so they can be counted: connection errors and 429/5xx
+responses are retried with exponential backoff and full jitter, honouring
+`Retry-After` when the server sends one.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+RETRY_STATUS_CODES = (408, 409, 429, 500, 502, 503, 504)
+
+
+class HTTPClientStats:
+    """Thread-safe request, connection and retry counters of one client."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections_opened = 0
+        self.retries = 0
+
+    def add(self, requests: int = 0, connections: int = 0, retries: int = 0) -> None:
+        with self._lock:
+            self.requests += requests
+            self.connections_opened += connections
+            self.retries += retries
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            requests, connections, retries = self.requests, self.connections_opened, self.retries
+        return {
+            "requests": requests,
+            "connections_opened": connections,
+            # Share of requests served on an already open connection
+            "connection_reuse_rate": 1 - connections / requests if requests else None,
+            "retries": retries,
+        }
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter (delay drawn from [0, cap]).
+
+    Args:
+        max_retries: Retries after the first attempt.
+        backoff: Cap of the first retry delay in seconds; doubles per retry.
+        max_backoff: Upper bound of any delay, including `Retry-After`.
+    """
+
+    def __init__(self, max_retries: int = 3, backoff: float = 0.5, max_backoff: float = 8.0):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def should_retry(self, attempt: int, response: Optional[httpx.Response]) -> bool:
+        if attempt >= self.max_retries:
+            return False
+        return response is None or response.status_code in RETRY_STATUS_CODES
+
+    def delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+
+class RetryTransport(httpx.BaseTransport):
+    """Sync pooled transport that retries and counts new connections."""
+
+    def __init__(self, policy: RetryPolicy, stats: HTTPClientStats, **transport_kwargs):
+        self.policy = policy
+        self.stats = stats
+        self._transport = httpx.HTTPTransport(**transport_kwargs)
+
+    def _trace(self, event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self.stats.add(connections=1)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.extensions.setdefault("trace", self._trace)
+        attempt = 0
+        while True:
+            self.stats.add(requests=1)
+            response = None
+            try:
+                response = self._transport.handle_request(request)
+            except httpx.TransportError:
+                if not self.policy.should_retry(attempt, None):
+                    raise
+            else:
+                if not self.policy.should_retry(attempt, response):
+                    return response
+                response.close()
+            self.stats.add(retries=1)
+            time.sleep(self.policy.delay(attempt, response))
+            attempt += 1
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncRetryTransport(httpx.AsyncBaseTransport):
+    """Async pooled transport that retries and counts new connections."""
+
+    def __init__(self, policy: RetryPolicy, stats: HTTPClientStats, **transport_kwargs):
+        self.policy = policy
+        self.stats = stats
+        self._transport = httpx.AsyncHTTPTransport(**transport_kwargs)
+
+    async def _trace(self, event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self.stats.add(connections=1)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request.extensions.setdefault("trace", self._trace)
+        attempt = 0
+        while True:
+            self.stats.add(requests=1)
+            response = None
+            try:
+                response = await self._transport.handle_async_request(request)
+            except httpx.TransportError:
+                if not self.policy.should_retry(attempt, None):
+                    raise
+            else:
+                if not self.policy.should_retry(attempt, response):
+                    return response
+                await response.aclose()
+            self.stats.add(retries=1)
+            await asyncio.sleep(self.policy.delay(attempt, response))
+            attempt += 1
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,201 @@
+"""Exact-match cache of chat model responses.
+
+At temperature 0 the same model, system prompt and user content give an
+equivalent answer, so a repeated question can skip the LLM call. The
+cache plugs into LangChain's model cache hook (`BaseCache`): each entry is
+keyed by a SHA-256 of the model's parameters (`llm_string`: model name,
+temperature, max tokens, bound tools) and the full serialized message
+list. Any change to the retrieved context, prompt or model misses.
+
+Lookups go to a per-process in-memory LRU first, then to a SQLite file
+in WAL mode, which every uvicorn worker on the host can share: a response
+generated by one worker is a hit for the others. Entries expire after a
+TTL; the file is bounded by a byte budget with least-recently-used
+eviction, and the memory front by an entry count.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, Generation
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+"""
+
+# Only revive what a chat model returns; the file is writable by every worker
+_ALLOWED_OBJECTS = [ChatGeneration, ChatGenerationChunk, Generation, AIMessage, AIMessageChunk]
+
+
+def response_key(prompt: str, llm_string: str) -> str:
+    """Return the SHA-256 hex digest addressing a (messages, model) pair."""
+    digest = hashlib.sha256(llm_string.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(prompt.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class LLMResponseCache(BaseCache):
+    """Two-level (memory LRU + SQLite) exact-match LLM response cache.
+
+    The SQLite connection is shared between threads and guarded by a lock;
+    WAL mode and a busy timeout let several processes read and write the
+    same file. Expiry uses wall-clock creation times, so every process
+    agrees on when an entry is stale.
+
+    Args:
+        path: SQLite file path, shared by all workers on the host.
+        max_entries: Responses kept in this process's memory LRU.
+        max_bytes: Byte budget of the SQLite store.
+        ttl_seconds: Lifetime of a cached response.
+    """
+
+    def __init__(self, path: str, max_entries: int, max_bytes: int, ttl_seconds: float):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, Tuple[float, RETURN_VAL_TYPE]]" = OrderedDict()
+        self._memory_lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Return the cached generations for a prompt and model, or None."""
+        key = response_key(prompt, llm_string)
+        now = time.time()
+        with self._memory_lock:
+            entry = self._memory.get(key)
+            if entry is not None and now - entry[0] <= self.ttl_seconds:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._memory[key]
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created FROM responses WHERE key = ? AND created >= ?",
+                (key, now - self.ttl_seconds),
+            ).fetchone()
+            if row is not None:
+                self._conn.execute(
+                    "UPDATE responses SET last_used = ? WHERE key = ?", (now, key)
+                )
+                self._conn.commit()
+        if row is None:
+            with self._memory_lock:
+                self.misses += 1
+            return None
+
+        try:
+            generations = loads(row[0], allowed_objects=_ALLOWED_OBJECTS)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cached LLM response: {e}")
+            with self._memory_lock:
+                self.misses += 1
+            return None
+        self._remember(key, row[1], generations)
+        with self._memory_lock:
+            self.disk_hits += 1
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Cache the generations of a prompt and model, then evict if needed."""
+        key = response_key(prompt, llm_string)
+        now = time.time()
+        serialized = dumps(list(return_val))
+        self._remember(key, now, return_val)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, serialized, now, now),
+            )
+            self._evict_locked(now)
+            self._conn.commit()
+
+    def _remember(self, key: str, created: float, generations: Sequence[Any]) -> None:
+        with self._memory_lock:
+            self._memory[key] = (created, generations)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _evict_locked(self, now: float) -> None:
+        """Delete expired entries, then least-recently-used ones over `max_bytes`."""
+        expired = self._conn.execute(
+            "DELETE FROM responses WHERE created < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        (total,) = self._conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(response)), 0) FROM responses"
+        ).fetchone()
+        stale = []
+        if total > self.max_bytes:
+            excess = total - self.max_bytes
+            freed = 0
+            for key, size in self._conn.execute(
+                "SELECT key, LENGTH(response) FROM responses ORDER BY last_used"
+            ):
+                stale.append((key,))
+                freed += size
+                if freed >= excess:
+                    break
+            self._conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+        if expired or stale:
+            self.evictions += expired + len(stale)
+            logger.info(f"Evicted {expired} expired and {len(stale)} LRU cached LLM responses")
+
+    def clear(self, **kwargs: Any) -> None:
+        """Remove every cached response, in memory and on disk."""
+        with self._memory_lock:
+            self._memory.clear()
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current occupancy."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(response)), 0) FROM responses"
+            ).fetchone()
+        with self._memory_lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory),
+                "disk_entries": entries,
+                "disk_bytes": size,
+            }
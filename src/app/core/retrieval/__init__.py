@@ -1,5 +1,5 @@
 """Retrieval module for vector store operations."""
 
-from .vector_store import get_retriever, retrieve
+from .vector_store_rest import clear_index, get_retriever, index_documents, retrieve
 
-__all__ = ["get_retriever", "retrieve"]
+__all__ = ["clear_index", "get_retriever", "index_documents", "retrieve"]
@@ -0,0 +1,137 @@
+"""Persistent, content-addressed cache for document chunk embeddings.
+
+Embeddings are stored in SQLite keyed by `(embedding model, SHA-256 of the
+chunk text)`, so re-uploading the same PDF, or one that mostly overlaps,
+only embeds the chunks that actually changed. The cache is bounded by a
+byte budget and evicts least-recently-used entries once it is exceeded.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    model TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (model, text_hash)
+);
+CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used);
+"""
+
+# SQLite limits the number of bound parameters per statement
+_QUERY_BATCH = 500
+
+
+def text_hash(text: str) -> str:
+    """Return the SHA-256 hex digest used to address a chunk's text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """SQLite-backed embedding cache with size-bounded LRU eviction.
+
+    Vectors are stored as packed float32 blobs. The connection is shared
+    between threads and guarded by a lock; SQLite's WAL mode lets several
+    processes use the same file.
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def get_many(self, model: str, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Look up embeddings for `texts`, returning `None` for misses."""
+        hashes = [text_hash(text) for text in texts]
+        found = {}
+        with self._lock:
+            for start in range(0, len(hashes), _QUERY_BATCH):
+                batch = list(set(hashes[start:start + _QUERY_BATCH]))
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *batch],
+                ).fetchall()
+                found.update(rows)
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash = ?",
+                    [(now, model, h) for h in found],
+                )
+                self._conn.commit()
+
+        results: List[Optional[List[float]]] = []
+        for h in hashes:
+            blob = found.get(h)
+            if blob is None:
+                results.append(None)
+            else:
+                vector = array("f")
+                vector.frombytes(blob)
+                results.append(vector.tolist())
+        return results
+
+    def put_many(
+        self, model: str, texts: Sequence[str], embeddings: Sequence[Sequence[float]]
+    ) -> None:
+        """Store embeddings for `texts`, then evict down to the byte budget."""
+        now = time.time()
+        rows = [
+            (model, text_hash(text), array("f", embedding).tobytes(), now)
+            for text, embedding in zip(texts, embeddings)
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._evict_locked()
+            self._conn.commit()
+
+    def _evict_locked(self) -> None:
+        """Delete least-recently-used entries until within `max_bytes`."""
+        (total,) = self._conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        freed = 0
+        stale = []
+        for model, h, size in self._conn.execute(
+            "SELECT model, text_hash, LENGTH(vector) FROM embeddings ORDER BY last_used"
+        ):
+            stale.append((model, h))
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany(
+            "DELETE FROM embeddings WHERE model = ? AND text_hash = ?", stale
+        )
+        logger.info(f"Evicted {len(stale)} cached embeddings ({freed} bytes)")
+
+    def clear(self) -> None:
+        """Remove every cached embedding."""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
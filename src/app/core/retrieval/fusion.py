@@ -0,0 +1,52 @@
+"""Reciprocal rank fusion (RRF) of ranked retrieval results.
+
+Hybrid retrieval ranks the same chunks with incomparable scores (cosine
+similarity and BM25), so the lists are fused by rank instead: each chunk
+scores `sum(1 / (rrf_k + rank))` over the lists it appears in (Cormack et
+al., 2009). Chunks found by both searches rise to the top, and a chunk
+ranked first by only one of them still beats most chunks either ranked low.
+"""
+
+from typing import Dict, List
+
+
+def reciprocal_rank_fusion(
+    ranked_lists: List[List[dict]], k: int, rrf_k: int = 60
+) -> List[dict]:
+    """Fuse ranked match lists into one list of the `k` best matches.
+
+    Args:
+        ranked_lists: Match lists in Pinecone's shape (`{"id", "score",
+            "metadata"}`), best first. The first list is the dense one: its
+            cosine scores are kept as each match's `score`. Vectors
+            (`values`) are carried over from whichever list has them.
+        k: Number of fused matches to return.
+        rrf_k: Rank offset; larger values flatten the weight of top ranks.
+
+    Returns:
+        Matches ordered by fused score, with `fusion_score` in the metadata.
+        Matches only found by later lists have no `score`.
+    """
+    fused: Dict[str, dict] = {}
+    totals: Dict[str, float] = {}
+    for position, matches in enumerate(ranked_lists):
+        for rank, match in enumerate(matches, start=1):
+            vector_id = match["id"]
+            if vector_id not in fused:
+                fused[vector_id] = {
+                    "id": vector_id,
+                    "score": match.get("score") if position == 0 else None,
+                    "metadata": dict(match.get("metadata") or {}),
+                }
+                totals[vector_id] = 0.0
+            if match.get("values") and not fused[vector_id].get("values"):
+                fused[vector_id]["values"] = match["values"]
+            totals[vector_id] += 1.0 / (rrf_k + rank)
+
+    best = sorted(fused, key=lambda vector_id: totals[vector_id], reverse=True)[:k]
+    results = []
+    for vector_id in best:
+        match = fused[vector_id]
+        match["metadata"]["fusion_score"] = totals[vector_id]
+        results.append(match)
+    return results
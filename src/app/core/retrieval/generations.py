@@ -0,0 +1,182 @@
+"""Blue/green index generations for re-indexing without downtime.
+
+Each upload is written into a fresh Pinecone namespace (a "generation").
+Only after every upsert has finished is the shared "active" pointer
+switched to it, so queries keep hitting the previous, complete generation
+for the whole indexing run. Older generations are deleted in the
+background after a grace period that lets other workers pick up the new
+pointer first.
+
+The pointer is stored in Pinecone itself, as a single vector in a reserved
+namespace, so every worker and serverless instance sees the same value.
+Workers cache it for a few seconds to keep it off the query hot path.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+META_NAMESPACE = "__meta__"
+POINTER_ID = "active-generation"
+GENERATION_PREFIX = "gen-"
+
+
+def new_generation_namespace() -> str:
+    """Return a new namespace name that sorts after all earlier ones."""
+    now = time.time()
+    stamp = time.strftime("%Y%m%d%H%M%S", time.gmtime(now)) + f"{int(now % 1 * 1e6):06d}"
+    return f"{GENERATION_PREFIX}{stamp}-{uuid.uuid4().hex[:8]}"
+
+
+def _pointer_namespace(fetch_result: dict) -> Optional[str]:
+    vector = (fetch_result.get("vectors") or {}).get(POINTER_ID)
+    if not vector:
+        return None
+    return (vector.get("metadata") or {}).get("namespace")
+
+
+class GenerationRegistry:
+    """Reads and switches the active generation pointer.
+
+    Args:
+        client: A `VectorBackend`, e.g. `PineconeRESTClient`.
+        cache_ttl_seconds: How long a worker trusts its cached pointer.
+        gc_delay_seconds: Grace period before superseded generations are
+            deleted; should exceed `cache_ttl_seconds`.
+        on_delete: Called with each deleted namespace, to drop data kept
+            alongside the vectors (e.g. the sparse keyword index).
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        cache_ttl_seconds: float,
+        gc_delay_seconds: float,
+        on_delete: Optional[Callable[[str], None]] = None,
+    ):
+        self._client = client
+        self._on_delete = on_delete
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.gc_delay_seconds = gc_delay_seconds
+        self._cached: Optional[str] = None
+        self._cached_at = 0.0
+        self._lock = threading.Lock()
+
+    def _cached_namespace(self) -> Optional[str]:
+        with self._lock:
+            if self._cached is not None and time.monotonic() - self._cached_at < self.cache_ttl_seconds:
+                return self._cached
+        return None
+
+    def _remember(self, namespace: str) -> str:
+        with self._lock:
+            self._cached = namespace
+            self._cached_at = time.monotonic()
+        return namespace
+
+    def _stale_fallback(self, error: Exception) -> str:
+        logger.warning(f"Could not read active generation pointer: {error}")
+        # Keep serving the last known generation; "" is the default namespace
+        return self._cached if self._cached is not None else ""
+
+    def active_namespace(self) -> str:
+        """Return the namespace queries should read from."""
+        cached = self._cached_namespace()
+        if cached is not None:
+            return cached
+        try:
+            result = self._client.fetch([POINTER_ID], namespace=META_NAMESPACE)
+        except Exception as e:
+            return self._stale_fallback(e)
+        return self._remember(_pointer_namespace(result) or "")
+
+    async def aactive_namespace(self) -> str:
+        """Async variant of `active_namespace`."""
+        cached = self._cached_namespace()
+        if cached is not None:
+            return cached
+        try:
+            result = await self._client.afetch([POINTER_ID], namespace=META_NAMESPACE)
+        except Exception as e:
+            return self._stale_fallback(e)
+        return self._remember(_pointer_namespace(result) or "")
+
+    def activate(self, namespace: str, dimension: int) -> None:
+        """Atomically point queries at `namespace` and schedule GC.
+
+        The switch is a single-vector upsert, so readers see either the old
+        or the new generation, never a mix.
+
+        Args:
+            namespace: The fully indexed generation.
+            dimension: Dimension of the generation's vectors; the pointer
+                vector must match it, since an index holds one dimension.
+        """
+        # Cosine indexes reject all-zero vectors, so use a unit vector
+        values = [1.0] + [0.0] * (dimension - 1)
+        self._client.upsert(
+            vectors=[{
+                "id": POINTER_ID,
+                "values": values,
+                "metadata": {"namespace": namespace, "activated_at": time.time()},
+            }],
+            namespace=META_NAMESPACE,
+        )
+        self._client.flush(META_NAMESPACE)
+        self._remember(namespace)
+        logger.info(f"Activated index generation {namespace}")
+
+        timer = threading.Timer(self.gc_delay_seconds, self.collect_garbage)
+        timer.daemon = True
+        timer.start()
+
+    def discard(self, namespace: str) -> None:
+        """Delete a generation that will never be activated (e.g. a failed run)."""
+        self._delete_namespace(namespace)
+
+    def collect_garbage(self) -> List[str]:
+        """Delete generations superseded by the currently active one.
+
+        Generation names sort by creation time, so only the legacy default
+        namespace and generations older than the active one are removed;
+        newer generations may still be in the middle of indexing.
+
+        Returns:
+            The namespaces that were deleted.
+        """
+        try:
+            result = self._client.fetch([POINTER_ID], namespace=META_NAMESPACE)
+            active = _pointer_namespace(result)
+            if not active:
+                return []
+            namespaces = (self._client.describe_index_stats().get("namespaces") or {}).keys()
+        except Exception as e:
+            logger.warning(f"Generation GC skipped: {e}")
+            return []
+
+        stale = [
+            ns for ns in namespaces
+            if ns != active and ns != META_NAMESPACE
+            and (ns == "" or (ns.startswith(GENERATION_PREFIX) and ns < active))
+        ]
+        for ns in stale:
+            self._delete_namespace(ns)
+        return stale
+
+    def _delete_namespace(self, namespace: str) -> None:
+        try:
+            self._client.delete(delete_all=True, namespace=namespace)
+            logger.info(f"Deleted index generation {namespace or '(default)'}")
+        except Exception as e:
+            if "Namespace not found" not in str(e) and "404" not in str(e):
+                logger.warning(f"Could not delete generation {namespace}: {e}")
+                return
+        if self._on_delete is not None:
+            try:
+                self._on_delete(namespace)
+            except Exception as e:
+                logger.warning(f"Could not clean up generation {namespace}: {e}")
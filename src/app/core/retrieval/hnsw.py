@@ -0,0 +1,284 @@
+"""Hierarchical Navigable Small World (HNSW) index in pure Python/NumPy.
+
+Approximate nearest-neighbour search for the local backend once a corpus
+outgrows exact brute-force scans. Nodes live on a hierarchy of proximity
+graphs: each search descends greedily through the sparse upper layers and
+runs a best-first beam search of width `ef` on the dense bottom layer, so
+it touches a few thousand vectors instead of all of them.
+
+Follows Malkov & Yashunin (2016): levels are drawn from an exponential
+distribution with multiplier 1/ln(M), neighbours are chosen with the
+diversity heuristic, nodes keep up to M links on upper layers and 2*M on
+layer 0. Vectors are L2-normalized and compared by cosine distance.
+Deletes are tombstones: the node keeps routing searches but is never
+returned. Distances of all unvisited neighbours of a node are computed in
+one NumPy call; the graph walk itself is plain Python.
+"""
+
+import heapq
+import json
+import math
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class HNSWIndex:
+    """HNSW graph over labelled vectors.
+
+    Args:
+        dimension: Vector dimension.
+        m: Links per node on upper layers (2*m on layer 0).
+        ef_construction: Beam width used while inserting.
+        seed: Seed for level assignment, for reproducible graphs.
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        m: int = 16,
+        ef_construction: int = 200,
+        seed: int = 0,
+        capacity: int = 1024,
+    ):
+        self.dimension = dimension
+        self.m = m
+        self.m0 = 2 * m
+        self.ef_construction = max(ef_construction, m)
+        self._level_multiplier = 1.0 / math.log(max(m, 2))
+        self._rng = np.random.default_rng(seed)
+
+        self.vectors = np.zeros((capacity, dimension), dtype=np.float32)
+        self.levels = np.zeros(capacity, dtype=np.int8)
+        self.deleted = np.zeros(capacity, dtype=bool)
+        self.layer0 = np.full((capacity, self.m0), -1, dtype=np.int32)
+        self.layer0_counts = np.zeros(capacity, dtype=np.int16)
+        # upper[level - 1][node] -> neighbour array on that level
+        self.upper: List[Dict[int, np.ndarray]] = []
+        self.labels: List[str] = []
+        self.nodes: Dict[str, int] = {}
+        self.count = 0
+        self.entry_point = -1
+        self.max_level = -1
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def _grow(self) -> None:
+        capacity = self.vectors.shape[0] * 2
+        for name in ("vectors", "levels", "deleted", "layer0", "layer0_counts"):
+            old = getattr(self, name)
+            fill = -1 if name == "layer0" else 0
+            new = np.full((capacity,) + old.shape[1:], fill, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def _neighbors(self, node: int, level: int) -> np.ndarray:
+        if level == 0:
+            return self.layer0[node, :self.layer0_counts[node]]
+        return self.upper[level - 1][node]
+
+    def _set_neighbors(self, node: int, level: int, neighbors: List[int]) -> None:
+        if level == 0:
+            self.layer0[node, :len(neighbors)] = neighbors
+            self.layer0_counts[node] = len(neighbors)
+        else:
+            self.upper[level - 1][node] = np.asarray(neighbors, dtype=np.int32)
+
+    def _search_layer(
+        self, query: np.ndarray, entry_points: List[int], ef: int, level: int
+    ) -> List[Tuple[float, int]]:
+        """Best-first search of one layer; returns (distance, node) ascending."""
+        visited = set(entry_points)
+        distances = 1.0 - self.vectors[entry_points] @ query
+        candidates = [(float(d), node) for d, node in zip(distances, entry_points)]
+        heapq.heapify(candidates)
+        # Max-heap of the `ef` best nodes so far, via negated distances
+        results = [(-d, node) for d, node in candidates]
+        heapq.heapify(results)
+        while len(results) > ef:
+            heapq.heappop(results)
+
+        while candidates:
+            distance, node = heapq.heappop(candidates)
+            if distance > -results[0][0] and len(results) >= ef:
+                break
+            fresh = [n for n in self._neighbors(node, level).tolist() if n not in visited]
+            if not fresh:
+                continue
+            visited.update(fresh)
+            bound = -results[0][0]
+            for d, neighbor in zip((1.0 - self.vectors[fresh] @ query).tolist(), fresh):
+                if len(results) < ef or d < bound:
+                    heapq.heappush(candidates, (d, neighbor))
+                    heapq.heappush(results, (-d, neighbor))
+                    if len(results) > ef:
+                        heapq.heappop(results)
+                    bound = -results[0][0]
+        return sorted((-d, node) for d, node in results)
+
+    def _select_neighbors(self, candidates: List[Tuple[float, int]], m: int) -> List[int]:
+        """Diversity heuristic: skip candidates closer to a chosen neighbour than to the base."""
+        if len(candidates) <= m:
+            return [node for _, node in candidates]
+        nodes = np.fromiter((node for _, node in candidates), dtype=np.int64)
+        distances = np.fromiter((d for d, _ in candidates), dtype=np.float32)
+        vectors = self.vectors[nodes]
+        similarity = vectors @ vectors.T
+        chosen: List[int] = []
+        for i in range(len(nodes)):
+            if chosen and (1.0 - similarity[chosen, i] < distances[i]).any():
+                continue
+            chosen.append(i)
+            if len(chosen) == m:
+                break
+        return nodes[chosen].tolist()
+
+    def _link(self, node: int, new: int, level: int) -> None:
+        """Add `new` to `node`'s links, pruning with the heuristic when full."""
+        limit = self.m0 if level == 0 else self.m
+        current = self._neighbors(node, level)
+        if len(current) < limit:
+            self._set_neighbors(node, level, current.tolist() + [new])
+            return
+        linked = np.append(current, new)
+        distances = 1.0 - self.vectors[linked] @ self.vectors[node]
+        order = np.argsort(distances)
+        candidates = list(zip(distances[order].tolist(), linked[order].tolist()))
+        self._set_neighbors(node, level, self._select_neighbors(candidates, limit))
+
+    def add(self, vector: np.ndarray, label: str) -> None:
+        """Insert a vector; re-adding an existing label replaces it."""
+        if label in self.nodes:
+            self.mark_deleted(label)
+        if self.count == self.vectors.shape[0]:
+            self._grow()
+        query = np.asarray(vector, dtype=np.float32)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+        node = self.count
+        level = min(int(-math.log(1.0 - self._rng.random()) * self._level_multiplier), 127)
+        self.vectors[node] = query
+        self.levels[node] = level
+        while len(self.upper) < level:
+            self.upper.append({})
+        for upper_level in range(1, level + 1):
+            self.upper[upper_level - 1][node] = np.empty(0, dtype=np.int32)
+        self.labels.append(label)
+        self.nodes[label] = node
+        self.count += 1
+
+        if self.entry_point < 0:
+            self.entry_point, self.max_level = node, level
+            return
+
+        entry = [self.entry_point]
+        for upper_level in range(self.max_level, level, -1):
+            entry = [self._search_layer(query, entry, 1, upper_level)[0][1]]
+        for current_level in range(min(level, self.max_level), -1, -1):
+            found = self._search_layer(query, entry, self.ef_construction, current_level)
+            neighbors = self._select_neighbors(found, self.m)
+            self._set_neighbors(node, current_level, neighbors)
+            for neighbor in neighbors:
+                self._link(neighbor, node, current_level)
+            entry = [n for _, n in found]
+
+        if level > self.max_level:
+            self.entry_point, self.max_level = node, level
+
+    def mark_deleted(self, label: str) -> None:
+        """Tombstone a label; its node still routes searches."""
+        node = self.nodes.pop(label, None)
+        if node is not None:
+            self.deleted[node] = True
+
+    def search(
+        self, query: np.ndarray, k: int, ef: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        """Return up to `k` (label, cosine similarity) pairs, best first.
+
+        Args:
+            query: Query vector (normalized internally).
+            k: Number of results.
+            ef: Beam width; larger is slower but more accurate. At least `k`.
+        """
+        if self.entry_point < 0 or k <= 0:
+            return []
+        query = np.asarray(query, dtype=np.float32)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+        ef = max(ef or k, k)
+
+        entry = [self.entry_point]
+        for level in range(self.max_level, 0, -1):
+            entry = [self._search_layer(query, entry, 1, level)[0][1]]
+        while True:
+            found = self._search_layer(query, entry, ef, 0)
+            live = [(d, node) for d, node in found if not self.deleted[node]]
+            # Tombstones can crowd out live results; widen the beam if so
+            if len(live) >= k or ef >= self.count:
+                break
+            ef = min(ef * 2, self.count)
+        return [(self.labels[node], 1.0 - d) for d, node in live[:k]]
+
+    def save(self, path: str) -> None:
+        """Write the graph, vectors and labels to `path` (atomically replaced)."""
+        upper_nodes, upper_levels, upper_offsets, upper_links = [], [], [0], []
+        for level, layer in enumerate(self.upper, start=1):
+            for node, neighbors in layer.items():
+                upper_nodes.append(node)
+                upper_levels.append(level)
+                upper_links.extend(neighbors.tolist())
+                upper_offsets.append(len(upper_links))
+        count = self.count
+        labels = json.dumps(self.labels).encode("utf-8")
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                params=np.array(
+                    [self.dimension, self.m, self.ef_construction, count,
+                     self.entry_point, self.max_level],
+                    dtype=np.int64,
+                ),
+                vectors=self.vectors[:count],
+                levels=self.levels[:count],
+                deleted=self.deleted[:count],
+                layer0=self.layer0[:count],
+                layer0_counts=self.layer0_counts[:count],
+                upper_nodes=np.asarray(upper_nodes, dtype=np.int32),
+                upper_levels=np.asarray(upper_levels, dtype=np.int16),
+                upper_offsets=np.asarray(upper_offsets, dtype=np.int64),
+                upper_links=np.asarray(upper_links, dtype=np.int32),
+                labels=np.frombuffer(labels, dtype=np.uint8),
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "HNSWIndex":
+        """Read an index written by `save`."""
+        with np.load(path) as data:
+            dimension, m, ef_construction, count, entry_point, max_level = (
+                int(v) for v in data["params"]
+            )
+            index = cls(dimension, m=m, ef_construction=ef_construction,
+                        capacity=max(count, 1))
+            index.vectors[:count] = data["vectors"]
+            index.levels[:count] = data["levels"]
+            index.deleted[:count] = data["deleted"]
+            index.layer0[:count] = data["layer0"]
+            index.layer0_counts[:count] = data["layer0_counts"]
+            index.upper = [{} for _ in range(max(max_level, 0))]
+            offsets = data["upper_offsets"]
+            links = data["upper_links"]
+            for i, (node, level) in enumerate(zip(data["upper_nodes"], data["upper_levels"])):
+                index.upper[int(level) - 1][int(node)] = links[offsets[i]:offsets[i + 1]].copy()
+            index.labels = json.loads(data["labels"].tobytes().decode("utf-8"))
+        index.count = count
+        index.entry_point = entry_point
+        index.max_level = max_level
+        index.nodes = {
+            label: node for node, label in enumerate(index.labels)
+            if not index.deleted[node]
+        }
+        return index
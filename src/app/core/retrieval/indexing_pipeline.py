@@ -0,0 +1,221 @@
+"""Building blocks for the pipelined indexer used by `index_documents`.
+
+Ingest is a chain of lazily evaluated stages connected by bounded queues:
+pages are parsed and split on a producer thread, chunks are embedded in
+batches, and while the caller embeds the next batch, previously built
+vectors are upserted by a small thread pool. Memory therefore grows with
+the batch size rather than with the document. Upsert batches are packed
+by serialized payload size, because each vector's metadata carries the
+full chunk text, and a failed batch is retried on its own without redoing
+the rest of the document.
+"""
+
+import hashlib
+import json
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Deque, Iterable, Iterator, List, TypeVar
+
+from .embedding_cache import text_hash
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+# Pinecone rejects upsert requests above 2 MB or 1000 vectors
+PINECONE_MAX_REQUEST_BYTES = 2 * 1024 * 1024
+PINECONE_MAX_BATCH_VECTORS = 1000
+# Pinecone deletes at most 1000 IDs per request
+PINECONE_MAX_DELETE_IDS = 1000
+
+# Bytes of JSON framing around the vectors list in an upsert request
+_REQUEST_OVERHEAD_BYTES = 64
+
+# Longest JSON float repr (e.g. "-1.2345678901234567e-05") plus ", "
+_MAX_FLOAT_JSON_BYTES = 26
+
+
+def source_id_prefix(source: str) -> str:
+    """Return the ID prefix shared by every vector of one source document."""
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:16] + "#"
+
+
+def chunk_vector_id(source: str, page: Any, offset: int, text: str) -> str:
+    """Build a content-addressed vector ID for a chunk.
+
+    The ID is derived from the source, page, character offset within the
+    page and the SHA-256 of the chunk text, so the same chunk gets the same
+    ID in every process and deploy. Upserts are therefore idempotent, and
+    an unchanged chunk can be recognised from its ID alone.
+    """
+    return f"{source_id_prefix(source)}p{page}:o{offset}:{text_hash(text)}"
+
+
+def iter_batches(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Yield consecutive lists of up to `size` items from any iterable."""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def iter_in_background(items: Iterable[T], maxsize: int) -> Iterator[T]:
+    """Produce `items` on a background thread through a bounded queue.
+
+    Lets the producer (e.g. PDF parsing and splitting) run ahead of the
+    consumer (embedding) by at most `maxsize` items. Producer exceptions are
+    re-raised in the consumer, and closing the iterator stops the producer.
+    """
+    buffer: "queue.Queue" = queue.Queue(maxsize=max(1, maxsize))
+    done = object()
+    stop = threading.Event()
+    failure: List[BaseException] = []
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put(item):
+                    return
+        except BaseException as e:
+            failure.append(e)
+        finally:
+            put(done)
+
+    producer = threading.Thread(target=produce, name="ingest-producer", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                break
+            yield item
+        if failure:
+            raise failure[0]
+    finally:
+        stop.set()
+        producer.join()
+
+
+def estimate_vector_bytes(vector: dict) -> int:
+    """Upper bound on the JSON size of one upsert vector.
+
+    Serializing every embedding just to measure it would double the JSON
+    encoding work, so values are bounded by the longest float repr and
+    only the id and metadata are encoded exactly.
+    """
+    values = vector.get("values") or []
+    rest = {key: value for key, value in vector.items() if key != "values"}
+    return len(json.dumps(rest)) + len(values) * _MAX_FLOAT_JSON_BYTES + 16
+
+
+def iter_payload_batches(
+    vectors: Iterable[dict], max_bytes: int, max_vectors: int
+) -> Iterator[List[dict]]:
+    """Group vectors into batches whose JSON payload stays under `max_bytes`.
+
+    A single vector larger than the budget is still emitted on its own so
+    the server can reject it with a meaningful error.
+    """
+    batch: List[dict] = []
+    batch_bytes = _REQUEST_OVERHEAD_BYTES
+    for vector in vectors:
+        size = estimate_vector_bytes(vector)
+        if batch and (batch_bytes + size > max_bytes or len(batch) >= max_vectors):
+            yield batch
+            batch = []
+            batch_bytes = _REQUEST_OVERHEAD_BYTES
+        batch.append(vector)
+        batch_bytes += size
+    if batch:
+        yield batch
+
+
+class ConcurrentUpserter:
+    """Run upsert batches on a bounded thread pool with per-batch retries.
+
+    `submit` blocks once `max_in_flight` batches are pending, which applies
+    backpressure to the embedding stage and bounds memory use.
+    """
+
+    def __init__(
+        self,
+        upsert: Callable[[List[dict]], object],
+        concurrency: int,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0,
+    ):
+        self._upsert = upsert
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, concurrency), thread_name_prefix="upsert"
+        )
+        self._max_in_flight = max(1, concurrency) * 2
+        self._pending: Deque[Future] = deque()
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.batches = 0
+        self.vectors = 0
+        self.retries = 0
+
+    def submit(self, batch: List[dict]) -> None:
+        """Queue a batch for upserting, waiting if too many are in flight."""
+        while len(self._pending) >= self._max_in_flight:
+            self._collect(self._pending.popleft())
+        self._pending.append(self._executor.submit(self._upsert_with_retry, batch))
+
+    def drain(self) -> None:
+        """Wait for all queued batches, re-raising the first failure."""
+        try:
+            while self._pending:
+                self._collect(self._pending.popleft())
+        finally:
+            for future in self._pending:
+                future.cancel()
+            self._pending.clear()
+            self._executor.shutdown(wait=True)
+
+    def abort(self) -> None:
+        """Cancel queued batches and wait for running ones, discarding their errors.
+
+        Used when indexing fails for another reason, so that reason is the
+        one propagated.
+        """
+        self._pending.clear()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _collect(self, future: Future) -> None:
+        vectors, retries = future.result()
+        self.batches += 1
+        self.vectors += vectors
+        self.retries += retries
+
+    def _upsert_with_retry(self, batch: List[dict]) -> tuple:
+        attempt = 0
+        while True:
+            try:
+                self._upsert(batch)
+                return len(batch), attempt
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_seconds * (2 ** attempt)
+                logger.warning(
+                    f"Upsert of {len(batch)} vectors failed ({e}); retrying in {delay:.1f}s"
+                )
+                time.sleep(delay)
+                attempt += 1
@@ -0,0 +1,520 @@
+"""In-process vector index with exact NumPy, HNSW or IVF-PQ search.
+
+Keeps every namespace as one contiguous float32 matrix of L2-normalized
+embeddings plus parallel ID and metadata lists. A query is a single
+matrix-vector product followed by `np.argpartition`, so top-k costs one
+pass over the matrix and no network round trip. Scores are cosine
+similarities, matching a cosine Pinecone index. With `index_type="hnsw"`
+each namespace additionally maintains an `HNSWIndex` that is updated on
+every upsert/delete and answers queries approximately, with a per-query
+`ef_search` beam width. With `index_type="ivfpq"`, `flush()` compresses
+each large namespace into an `IVFPQIndex`; when snapshots are persisted
+the full-precision matrix is then only memory-mapped, used to re-rank a
+short candidate list, and the resident footprint is the PQ codes.
+
+Useful for development, offline benchmarks and single-instance deploys.
+Without a `path` the index lives in process memory and is lost on restart.
+With one, `flush()` snapshots each namespace into a memory-mapped vector
+file (see `vector_file`); a new process maps those files in milliseconds
+and serves queries from them directly, and other processes sharing the
+directory pick up a namespace again whenever its file is replaced.
+"""
+
+import asyncio
+import os
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+from urllib.parse import quote, unquote
+
+import numpy as np
+
+from .hnsw import HNSWIndex
+from .ivfpq import IVFPQIndex
+from .vector_file import VectorFile, write_vector_file
+
+
+# Smaller namespaces are searched exactly; IVF-PQ only pays off above this
+IVFPQ_MIN_VECTORS = 10_000
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize each row as float32, leaving all-zero rows as zeros."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, np.finfo(np.float32).tiny)
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Return indices of the `k` highest scores, best first."""
+    k = min(k, scores.shape[0])
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < scores.shape[0]:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(scores.shape[0])
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+class _Namespace:
+    """Rows of one namespace; deletes swap the last row into the hole."""
+
+    def __init__(
+        self, dimension: int, capacity: int = 1024, ann: Optional[HNSWIndex] = None
+    ):
+        self.matrix = np.zeros((capacity, dimension), dtype=np.float32)
+        self.ids: List[str] = []
+        self.metadata: List[dict] = []
+        self.rows: Dict[str, int] = {}
+        self.ann = ann
+
+    @classmethod
+    def from_file(
+        cls, vector_file: VectorFile, ann: Optional[HNSWIndex] = None
+    ) -> "_Namespace":
+        """Load a snapshot; `ann` is a saved graph or an empty one to fill."""
+        ids, matrix, metadata = vector_file.load()
+        store = cls(vector_file.dimension, capacity=max(1024, len(ids)), ann=ann)
+        store.matrix[:len(ids)] = matrix
+        store.ids = ids
+        store.metadata = metadata
+        store.rows = {vector_id: row for row, vector_id in enumerate(ids)}
+        if ann is not None and set(ann.nodes) != set(store.rows):
+            # Graph missing or out of step with the snapshot: rebuild it
+            store.ann = ann = HNSWIndex(
+                ann.dimension, m=ann.m, ef_construction=ann.ef_construction
+            )
+            for vector_id, row_values in zip(ids, matrix):
+                ann.add(row_values, vector_id)
+        return store
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def search(
+        self, query_vector: np.ndarray, k: int, ef_search: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """Return (row, cosine similarity) pairs of the best `k` rows."""
+        if self.ann is not None:
+            return [
+                (self.rows[label], score)
+                for label, score in self.ann.search(query_vector, k, ef_search)
+            ]
+        scores = self.matrix[:len(self.ids)] @ query_vector
+        return [(int(row), float(scores[row])) for row in top_k_indices(scores, k)]
+
+    def record(self, row: int):
+        return self.ids[row], self.metadata[row]
+
+    def upsert(self, ids: List[str], values: np.ndarray, metadata: List[dict]) -> None:
+        for vector_id, row_values, row_metadata in zip(ids, values, metadata):
+            row = self.rows.get(vector_id)
+            if row is None:
+                row = len(self.ids)
+                if row == self.matrix.shape[0]:
+                    grown = np.zeros((row * 2, self.matrix.shape[1]), dtype=np.float32)
+                    grown[:row] = self.matrix[:row]
+                    self.matrix = grown
+                self.rows[vector_id] = row
+                self.ids.append(vector_id)
+                self.metadata.append(row_metadata)
+            else:
+                self.metadata[row] = row_metadata
+            self.matrix[row] = row_values
+            if self.ann is not None:
+                self.ann.add(row_values, vector_id)
+
+    def delete(self, ids: List[str]) -> None:
+        for vector_id in ids:
+            row = self.rows.pop(vector_id, None)
+            if row is None:
+                continue
+            if self.ann is not None:
+                self.ann.mark_deleted(vector_id)
+            last = len(self.ids) - 1
+            if row != last:
+                self.matrix[row] = self.matrix[last]
+                self.ids[row] = self.ids[last]
+                self.metadata[row] = self.metadata[last]
+                self.rows[self.ids[row]] = row
+            self.ids.pop()
+            self.metadata.pop()
+
+
+class LocalVectorBackend:
+    """`VectorBackend` answering queries by exact search in process memory.
+
+    Args:
+        path: Directory for persistent namespace snapshots; None keeps the
+            index in memory only.
+        dtype: Matrix precision on disk, "float32" or "float16".
+        index_type: "exact" brute-force search, "hnsw" or "ivfpq"
+            approximate search.
+        hnsw_m: HNSW links per node.
+        hnsw_ef_construction: HNSW beam width while inserting.
+        hnsw_ef_search: Default HNSW beam width per query.
+        ivfpq_nlist: IVF cells; 0 picks ~4*sqrt(n).
+        ivfpq_m: PQ bytes per vector (reduced to a divisor of the dimension).
+        ivfpq_nprobe: IVF cells scanned per query.
+        ivfpq_rerank: Re-score `ivfpq_rerank * k` candidates exactly; 0 disables.
+    """
+
+    _SUFFIX = ".vec"
+    _GRAPH_SUFFIX = ".hnsw"
+    _PQ_SUFFIX = ".ivfpq"
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        dtype: str = "float32",
+        index_type: str = "exact",
+        hnsw_m: int = 16,
+        hnsw_ef_construction: int = 200,
+        hnsw_ef_search: int = 64,
+        ivfpq_nlist: int = 0,
+        ivfpq_m: int = 96,
+        ivfpq_nprobe: int = 16,
+        ivfpq_rerank: int = 4,
+    ):
+        self.path = path
+        self.dtype = dtype
+        self.index_type = index_type
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.hnsw_ef_search = hnsw_ef_search
+        self.ivfpq_nlist = ivfpq_nlist
+        self.ivfpq_m = ivfpq_m
+        self.ivfpq_nprobe = ivfpq_nprobe
+        self.ivfpq_rerank = ivfpq_rerank
+        # Mutable in-memory namespaces, and read-only mapped snapshots with
+        # the mtime they were opened at
+        self._namespaces: Dict[str, _Namespace] = {}
+        self._files: Dict[str, VectorFile] = {}
+        self._file_mtimes: Dict[str, float] = {}
+        self._dirty: Set[str] = set()
+        # IVF-PQ indexes over the rows of each namespace's last flush
+        self._pq: Dict[str, IVFPQIndex] = {}
+        self._dimension: Optional[int] = None
+        self._lock = threading.RLock()
+        self._queries = 0
+        if path:
+            os.makedirs(path, exist_ok=True)
+
+    def _file_path(self, namespace: str, suffix: str = _SUFFIX) -> str:
+        return os.path.join(self.path, f"ns-{quote(namespace, safe='')}{suffix}")
+
+    def _new_ann(self, dimension: int) -> Optional[HNSWIndex]:
+        if self.index_type != "hnsw":
+            return None
+        return HNSWIndex(
+            dimension, m=self.hnsw_m, ef_construction=self.hnsw_ef_construction
+        )
+
+    def _load_ann(self, namespace: str, dimension: int) -> Optional[HNSWIndex]:
+        """Load the namespace's saved graph, or start an empty one to rebuild."""
+        if self.index_type != "hnsw":
+            return None
+        graph_path = self._file_path(namespace, self._GRAPH_SUFFIX)
+        if os.path.exists(graph_path):
+            return HNSWIndex.load(graph_path)
+        return self._new_ann(dimension)
+
+    def _build_pq(self, name: str, matrix: np.ndarray) -> Optional[IVFPQIndex]:
+        """Encode a flushed namespace, reusing its quantizers while the size is similar."""
+        count, dimension = matrix.shape
+        if self.index_type != "ivfpq" or count < IVFPQ_MIN_VECTORS:
+            return None
+        previous = self._pq.get(name)
+        if previous is not None and previous.dimension == dimension and count <= 2 * len(previous):
+            pq = IVFPQIndex(previous.centroids, previous.codebooks)
+        else:
+            m = max(d for d in range(1, min(self.ivfpq_m, dimension) + 1) if dimension % d == 0)
+            nlist = self.ivfpq_nlist or max(1, min(int(4 * count ** 0.5), count // 39))
+            pq = IVFPQIndex.train(matrix, nlist=nlist, m=m)
+        pq.add(matrix, np.arange(count))
+        return pq
+
+    def _disk_namespaces(self) -> List[str]:
+        if not self.path:
+            return []
+        return [
+            unquote(name[len("ns-"):-len(self._SUFFIX)])
+            for name in os.listdir(self.path)
+            if name.startswith("ns-") and name.endswith(self._SUFFIX)
+        ]
+
+    def _refresh(self, namespace: str) -> None:
+        """Map the namespace's snapshot, reopening it if another process replaced it."""
+        if not self.path or namespace in self._dirty:
+            return
+        file_path = self._file_path(namespace)
+        try:
+            mtime = os.stat(file_path).st_mtime_ns
+        except FileNotFoundError:
+            if namespace in self._file_mtimes:
+                # Deleted by another process; this process may hold only the
+                # in-memory copy of its own last flush, without a mapping
+                self._files.pop(namespace, None)
+                self._file_mtimes.pop(namespace, None)
+                self._namespaces.pop(namespace, None)
+                self._pq.pop(namespace, None)
+            return
+        if self._file_mtimes.get(namespace) == mtime:
+            return
+        vector_file = VectorFile(file_path)
+        self._files[namespace] = vector_file
+        self._file_mtimes[namespace] = mtime
+        pq_path = self._file_path(namespace, self._PQ_SUFFIX)
+        if self.index_type == "ivfpq" and os.path.exists(pq_path):
+            self._pq[namespace] = IVFPQIndex.load(pq_path)
+        else:
+            self._pq.pop(namespace, None)
+        # Any clean in-memory copy is now stale
+        self._namespaces.pop(namespace, None)
+        if self._dimension is None and len(vector_file):
+            self._dimension = vector_file.dimension
+
+    def _reader(self, namespace: str) -> Optional[Union[_Namespace, VectorFile]]:
+        if self.index_type == "hnsw":
+            # Approximate search needs the graph, which lives in memory
+            return self._loaded(namespace)
+        self._refresh(namespace)
+        store = self._namespaces.get(namespace)
+        return store if store is not None else self._files.get(namespace)
+
+    def _resident(self, namespace: str) -> Optional[Union[_Namespace, VectorFile]]:
+        """Return the in-memory copy if there is one, else the mapped snapshot.
+
+        For point reads (`fetch`, `list_ids`), which never need the full
+        matrix in memory; an IVF-PQ namespace stays compressed.
+        """
+        self._refresh(namespace)
+        store = self._namespaces.get(namespace)
+        return store if store is not None else self._files.get(namespace)
+
+    def _loaded(self, namespace: str) -> Optional[_Namespace]:
+        """Return the namespace in memory, loading its snapshot if needed."""
+        self._refresh(namespace)
+        store = self._namespaces.get(namespace)
+        if store is None and namespace in self._files:
+            vector_file = self._files[namespace]
+            store = self._namespaces[namespace] = _Namespace.from_file(
+                vector_file, ann=self._load_ann(namespace, vector_file.dimension)
+            )
+        return store
+
+    def upsert(self, vectors: List[dict], namespace: str = "") -> dict:
+        """Insert or overwrite vectors by ID."""
+        if not vectors:
+            return {"upsertedCount": 0}
+        values = normalize_rows([vector["values"] for vector in vectors])
+        with self._lock:
+            store = self._loaded(namespace)
+            if self._dimension is None:
+                self._dimension = values.shape[1]
+            elif values.shape[1] != self._dimension:
+                raise ValueError(
+                    f"Vector dimension {values.shape[1]} does not match index "
+                    f"dimension {self._dimension}"
+                )
+            if store is None:
+                store = self._namespaces[namespace] = _Namespace(
+                    self._dimension, ann=self._new_ann(self._dimension)
+                )
+            store.upsert(
+                [vector["id"] for vector in vectors],
+                values,
+                [dict(vector.get("metadata") or {}) for vector in vectors],
+            )
+            self._dirty.add(namespace)
+        return {"upsertedCount": len(vectors)}
+
+    def query(
+        self,
+        vector: List[float],
+        top_k: int = 5,
+        namespace: str = "",
+        ef_search: Optional[int] = None,
+        include_values: bool = False,
+    ) -> dict:
+        """Return the `top_k` vectors with the highest cosine similarity.
+
+        `ef_search` overrides the HNSW beam width for this query; with
+        `include_values` each match carries its stored (normalized) vector.
+        """
+        self._queries += 1
+        query_vector = normalize_rows(vector)
+        # Deletes move rows around, so score and resolve rows under the lock
+        with self._lock:
+            store = self._reader(namespace)
+            if store is None or not len(store):
+                return {"matches": [], "namespace": namespace}
+            pq = self._pq.get(namespace) if namespace not in self._dirty else None
+            if pq is not None:
+                hits = pq.search(
+                    query_vector, top_k, nprobe=self.ivfpq_nprobe,
+                    rerank=self.ivfpq_rerank, vectors=store.matrix,
+                )
+            elif isinstance(store, VectorFile):
+                scores = store.scores(query_vector)
+                hits = [(int(row), float(scores[row])) for row in top_k_indices(scores, top_k)]
+            else:
+                hits = store.search(query_vector, top_k, ef_search or self.hnsw_ef_search)
+            matches = []
+            for row, score in hits:
+                vector_id, metadata = store.record(row)
+                match = {"id": vector_id, "score": score, "metadata": metadata}
+                if include_values:
+                    match["values"] = np.asarray(store.matrix[row], dtype=np.float32).tolist()
+                matches.append(match)
+        return {"matches": matches, "namespace": namespace}
+
+    async def aquery(
+        self,
+        vector: List[float],
+        top_k: int = 5,
+        namespace: str = "",
+        ef_search: Optional[int] = None,
+        include_values: bool = False,
+    ) -> dict:
+        """Run `query` on a worker thread so large scans don't block the loop."""
+        return await asyncio.to_thread(
+            self.query, vector, top_k, namespace, ef_search, include_values
+        )
+
+    def fetch(self, ids: List[str], namespace: str = "") -> dict:
+        """Return stored (normalized) vectors for the IDs that exist."""
+        vectors = {}
+        with self._lock:
+            store = self._resident(namespace)
+            for vector_id in ids if store is not None else []:
+                if isinstance(store, VectorFile):
+                    # Reads only the requested rows of the mapped snapshot
+                    row = store.row(vector_id)
+                    metadata = store.record(row)[1] if row is not None else None
+                else:
+                    row = store.rows.get(vector_id)
+                    metadata = store.metadata[row] if row is not None else None
+                if row is not None:
+                    vectors[vector_id] = {
+                        "id": vector_id,
+                        "values": np.asarray(store.matrix[row], dtype=np.float32).tolist(),
+                        "metadata": metadata,
+                    }
+        return {"vectors": vectors, "namespace": namespace}
+
+    async def afetch(self, ids: List[str], namespace: str = "") -> dict:
+        """Async variant of `fetch`."""
+        return self.fetch(ids, namespace)
+
+    def list_ids(self, prefix: str, namespace: str = "") -> Iterator[str]:
+        """Yield all vector IDs starting with `prefix`."""
+        with self._lock:
+            store = self._resident(namespace)
+            if store is None:
+                ids = []
+            elif isinstance(store, VectorFile):
+                ids = store.ids()
+            else:
+                ids = list(store.ids)
+        return (vector_id for vector_id in ids if vector_id.startswith(prefix))
+
+    def delete(
+        self,
+        ids: Optional[List[str]] = None,
+        delete_all: bool = False,
+        namespace: str = "",
+    ) -> dict:
+        """Delete vectors by ID, or drop the whole namespace and its snapshot."""
+        with self._lock:
+            if delete_all:
+                self._namespaces.pop(namespace, None)
+                self._files.pop(namespace, None)
+                self._file_mtimes.pop(namespace, None)
+                self._dirty.discard(namespace)
+                self._pq.pop(namespace, None)
+                if self.path:
+                    for suffix in (self._SUFFIX, self._GRAPH_SUFFIX, self._PQ_SUFFIX):
+                        try:
+                            os.remove(self._file_path(namespace, suffix))
+                        except FileNotFoundError:
+                            pass
+            else:
+                store = self._loaded(namespace)
+                if store is not None:
+                    store.delete(ids or [])
+                    self._dirty.add(namespace)
+        return {}
+
+    def flush(self, namespace: Optional[str] = None) -> None:
+        """Snapshot modified namespaces (or just `namespace`) to disk.
+
+        In IVF-PQ mode this is also when namespaces are (re-)encoded, with
+        or without a `path`; until then writes are searched exactly.
+        """
+        with self._lock:
+            pending = [namespace] if namespace is not None else list(self._dirty)
+            for name in pending:
+                if name not in self._dirty:
+                    continue
+                store = self._namespaces[name]
+                count = len(store)
+                pq = self._build_pq(name, store.matrix[:count])
+                if pq is None:
+                    self._pq.pop(name, None)
+                else:
+                    self._pq[name] = pq
+                if not self.path:
+                    self._dirty.discard(name)
+                    continue
+
+                file_path = self._file_path(name)
+                pq_path = self._file_path(name, self._PQ_SUFFIX)
+                if store.ann is not None:
+                    store.ann.save(self._file_path(name, self._GRAPH_SUFFIX))
+                if pq is not None:
+                    pq.save(pq_path)
+                elif os.path.exists(pq_path):
+                    os.remove(pq_path)
+                write_vector_file(
+                    file_path, store.ids, store.matrix[:count], store.metadata, self.dtype
+                )
+                self._dirty.discard(name)
+                self._file_mtimes[name] = os.stat(file_path).st_mtime_ns
+                if pq is not None:
+                    # Serve from the codes plus the mapped snapshot and let
+                    # the full-precision copy go
+                    self._files[name] = VectorFile(file_path)
+                    self._namespaces.pop(name)
+                else:
+                    # Keep serving the in-memory copy; it matches the snapshot
+                    self._files.pop(name, None)
+
+    def describe_index_stats(self) -> dict:
+        """Return dimension and per-namespace vector counts."""
+        with self._lock:
+            names = set(self._namespaces) | set(self._disk_namespaces())
+            namespaces = {}
+            for name in names:
+                store = self._reader(name)
+                if store is not None:
+                    namespaces[name] = {"vectorCount": len(store)}
+        return {
+            "dimension": self._dimension,
+            "namespaces": namespaces,
+            "totalVectorCount": sum(ns["vectorCount"] for ns in namespaces.values()),
+        }
+
+    def connection_stats(self) -> Dict[str, Any]:
+        """Report query count, resident matrix size and mapped snapshot size."""
+        with self._lock:
+            matrix_bytes = sum(store.matrix.nbytes for store in self._namespaces.values())
+            mapped_bytes = sum(f.matrix.nbytes for f in self._files.values())
+            pq_bytes = sum(pq.nbytes for pq in self._pq.values())
+        return {
+            "index_type": self.index_type,
+            "queries": self._queries,
+            "matrix_bytes": matrix_bytes,
+            "mapped_matrix_bytes": mapped_bytes,
+            "pq_bytes": pq_bytes,
+        }
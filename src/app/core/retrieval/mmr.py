@@ -0,0 +1,63 @@
+"""Maximal marginal relevance (MMR) re-ranking of retrieved chunks.
+
+Chunks are split with a 50-character overlap, so the top-k of a query
+often contains neighbours that say nearly the same thing. MMR (Carbonell
+& Goldstein, 1998) picks results one at a time, scoring each remaining
+candidate as
+
+    lambda_mult * relevance - (1 - lambda_mult) * max similarity to the picks so far
+
+so a near-duplicate of an already chosen chunk loses to a slightly less
+relevant chunk that adds new content. All pairwise similarities come from
+one matrix product; each greedy step is then a vectorized update of the
+running maximum.
+"""
+
+from typing import List
+
+import numpy as np
+
+
+def mmr_select(
+    relevance: np.ndarray,
+    vectors: np.ndarray,
+    k: int,
+    lambda_mult: float = 0.5,
+) -> List[int]:
+    """Pick `k` diverse candidates by maximal marginal relevance.
+
+    Args:
+        relevance: Relevance of each candidate to the query (e.g. cosine
+            similarity), shape `(n,)`.
+        vectors: Candidate embeddings, shape `(n, dim)`; normalized here.
+        k: Number of candidates to pick.
+        lambda_mult: 1.0 ranks by relevance only, 0.0 by diversity only.
+
+    Returns:
+        Indices of the picked candidates, in pick order.
+    """
+    relevance = np.asarray(relevance, dtype=np.float32)
+    count = min(k, len(relevance))
+    if count <= 0:
+        return []
+    vectors = np.asarray(vectors, dtype=np.float32)
+    vectors = vectors / np.maximum(
+        np.linalg.norm(vectors, axis=1, keepdims=True), np.finfo(np.float32).tiny
+    )
+    similarity = vectors @ vectors.T
+
+    # Highest similarity of each candidate to any pick; no penalty before the first
+    redundancy = np.zeros(len(relevance), dtype=np.float32)
+    available = np.ones(len(relevance), dtype=bool)
+    picked: List[int] = []
+    for _ in range(count):
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * redundancy
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        picked.append(best)
+        available[best] = False
+        if len(picked) == 1:
+            redundancy = similarity[best].copy()
+        else:
+            np.maximum(redundancy, similarity[best], out=redundancy)
+    return picked
@@ -0,0 +1,94 @@
+"""In-memory cache for query embeddings used by `retrieve()`.
+
+The Retrieval Agent often reissues the same, or trivially different,
+query strings within and across requests. Caching their embeddings removes
+an OpenAI round-trip from the hot path of repeated questions.
+"""
+
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query for cache lookups (case and whitespace)."""
+    return " ".join(query.casefold().split())
+
+
+class QueryEmbeddingCache:
+    """Thread-safe LRU cache with a TTL and a byte budget.
+
+    Keys are `(embedding model, normalized query)`. Vectors are stored as
+    packed float32 arrays, so the byte budget reflects their real size.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, array]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, model: str, query: str) -> Optional[List[float]]:
+        """Return the cached embedding for `query`, or None on a miss."""
+        key = (model, normalize_query(query))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+                self._remove_locked(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1].tolist()
+
+    def put(self, model: str, query: str, vector: List[float]) -> None:
+        """Cache `vector` as the embedding of `query`."""
+        key = (model, normalize_query(query))
+        packed = array("f", vector)
+        size = len(packed) * packed.itemsize
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove_locked(key)
+            self._entries[key] = (time.monotonic(), packed)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove_locked(oldest)
+                self.evictions += 1
+
+    def _remove_locked(self, key: Tuple[str, str]) -> None:
+        _, packed = self._entries.pop(key)
+        self._bytes -= len(packed) * packed.itemsize
+
+    def clear(self) -> None:
+        """Drop every cached embedding."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current occupancy."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
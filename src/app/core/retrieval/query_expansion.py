@@ -0,0 +1,76 @@
+"""Cheap, deterministic query expansion for direct retrieval.
+
+Instead of asking an LLM to reformulate the question, we derive a keyword
+variant by dropping stop words and punctuation. Both queries are searched
+and their results merged by score.
+"""
+
+import re
+from typing import Dict, List, Tuple
+
+from langchain_core.documents import Document
+
+_STOP_WORDS = frozenset(
+    """
+    a an and are as at be by can could did do does for from how i in is it
+    its me of on or please tell that the their there these this those to
+    was were what when where which who why will with would you your about
+    explain describe give between
+    """.split()
+)
+
+_TOKEN_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9_\-\.]*")
+
+
+def expand_query(question: str) -> List[str]:
+    """Return the original question plus a keyword-only variant.
+
+    Args:
+        question: The user's question.
+
+    Returns:
+        List of distinct query strings, original question first.
+    """
+    queries = [question]
+    keywords = [
+        token
+        for token in _TOKEN_RE.findall(question)
+        if token.lower() not in _STOP_WORDS
+    ]
+    keyword_query = " ".join(keywords).rstrip(".")
+    if keyword_query and keyword_query.lower() != question.strip().lower():
+        queries.append(keyword_query)
+    return queries
+
+
+def merge_results(results: List[List[Document]], k: int) -> List[Document]:
+    """Merge per-query result lists, de-duplicating chunks by content.
+
+    Each chunk keeps its highest score across queries and the merged list
+    is ordered by score, highest first. Hybrid results are compared by
+    their `fusion_score` rather than the dense `score`.
+
+    Args:
+        results: One list of retrieved documents per query.
+        k: Maximum number of documents to return.
+
+    Returns:
+        Up to `k` unique documents.
+    """
+    best: Dict[Tuple[str, str, str], Document] = {}
+    for docs in results:
+        for doc in docs:
+            key = (
+                str(doc.metadata.get("source", "")),
+                str(doc.metadata.get("page", "")),
+                doc.page_content,
+            )
+            current = best.get(key)
+            if current is None or _score(doc) > _score(current):
+                best[key] = doc
+    return sorted(best.values(), key=_score, reverse=True)[:k]
+
+
+def _score(doc: Document) -> float:
+    score = doc.metadata.get("fusion_score", doc.metadata.get("score"))
+    return float(score) if score is not None else 0.0
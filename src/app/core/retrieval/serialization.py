@@ -4,22 +4,104 @@ from typing import List, Tuple, Dict, Any
 
 from langchain_core.documents import Document
 
+# Largest gap (stripped whitespace between split chunks) still treated as adjacent
+_MAX_SPAN_GAP = 2
 
-def serialize_chunks(docs: List[Document]) -> str:
+
+def _span_key(doc: Document) -> Tuple[str, str]:
+    page = doc.metadata.get("page", doc.metadata.get("page_number", "unknown"))
+    return str(doc.metadata.get("source", "unknown")), str(page)
+
+
+def merge_adjacent_chunks(docs: List[Document]) -> List[Document]:
+    """Stitch retrieved chunks that overlap or touch into contiguous spans.
+
+    The splitter cuts pages into 500-character chunks with a 50-character
+    overlap, and neighbouring chunks are often retrieved together. Chunks
+    of the same source and page are ordered by their `start_index`; when
+    one starts before (or right where) the previous one ends, the repeated
+    overlap is dropped and the texts are joined into one span. Chunks
+    without offsets, or whose overlap does not match, stay separate.
+
+    Each span takes the position of its best-ranked chunk and that chunk's
+    metadata, with `start_index` set to the span start and `merged_chunks`
+    to the number of chunks it covers.
+
+    Args:
+        docs: Retrieved documents, best first.
+
+    Returns:
+        Documents in rank order, one per span.
+    """
+    # [rank, start, text, metadata, merged] per span
+    spans: List[list] = []
+    by_page: Dict[Tuple[str, str], List[int]] = {}
+    for rank, doc in enumerate(docs):
+        start = doc.metadata.get("start_index")
+        if isinstance(start, (int, float)) and not isinstance(start, bool):
+            by_page.setdefault(_span_key(doc), []).append(rank)
+        else:
+            spans.append([rank, None, doc.page_content, dict(doc.metadata), 1])
+
+    for ranks in by_page.values():
+        ranks.sort(key=lambda rank: int(docs[rank].metadata["start_index"]))
+        current = None
+        for rank in ranks:
+            doc = docs[rank]
+            start = int(doc.metadata["start_index"])
+            text = doc.page_content
+            if current is not None:
+                current_start, current_text = current[1], current[2]
+                current_end = current_start + len(current_text)
+                overlap = min(current_end, start + len(text)) - start
+                if 0 <= start - current_end <= _MAX_SPAN_GAP:
+                    # Touching chunks; only whitespace (usually line breaks) was
+                    # stripped between them. Same length keeps offsets aligned
+                    current[2] = current_text + "\n" * (start - current_end) + text
+                elif overlap > 0 and current_text[start - current_start:][:overlap] == text[:overlap]:
+                    current[2] = current_text + text[current_end - start:]
+                else:
+                    current = None
+                if current is not None:
+                    if rank < current[0]:
+                        current[0], current[3] = rank, dict(doc.metadata)
+                    current[4] += 1
+                    continue
+            current = [rank, start, text, dict(doc.metadata), 1]
+            spans.append(current)
+
+    spans.sort(key=lambda span: span[0])
+    merged = []
+    for _, start, text, metadata, count in spans:
+        if count > 1:
+            metadata["start_index"] = start
+            metadata["merged_chunks"] = count
+            if "text" in metadata:
+                metadata["text"] = text
+        merged.append(Document(page_content=text, metadata=metadata))
+    return merged
+
+
+def serialize_chunks(docs: List[Document], merge_spans: bool = True) -> str:
     """Serialize a list of Document objects into a formatted CONTEXT string.
 
     Formats chunks with indices and page numbers as specified in the PRD:
+    - Adjacent or overlapping chunks are merged into one span first
+      (see `merge_adjacent_chunks`)
     - Chunks are numbered (Chunk 1, Chunk 2, etc.)
     - Page numbers are included in the format "page=X"
     - Produces a clean CONTEXT section for agent consumption
 
     Args:
         docs: List of Document objects with metadata.
+        merge_spans: Merge adjacent or overlapping chunks into spans.
 
     Returns:
         Formatted string with all chunks serialized.
     """
     context_parts = []
+    if merge_spans:
+        docs = merge_adjacent_chunks(docs)
 
     for idx, doc in enumerate(docs, start=1):
         # Extract page number from metadata
@@ -38,14 +120,20 @@ def serialize_chunks(docs: List[Document]) -> str:
 
 def serialize_chunks_with_ids(
     docs: List[Document],
+    merge_spans: bool = True,
 ) -> Tuple[str, Dict[str, Dict[str, Any]]]:
     """Serialize chunks with stable IDs and return citation mapping.
 
     Generates unique, stable chunk identifiers (C1, C2, etc.) for each chunk
     and creates a citation map with metadata for traceable references.
+    Adjacent or overlapping chunks of the same page are first merged into
+    one span (see `merge_adjacent_chunks`), which gets a single ID whose
+    citation snippet is the whole span, so the shared overlap and a second
+    header are not sent to the LLM twice.
 
     Args:
         docs: List of Document objects with metadata.
+        merge_spans: Merge adjacent or overlapping chunks into spans.
 
     Returns:
         Tuple containing:
@@ -61,6 +149,8 @@ def serialize_chunks_with_ids(
     """
     context_parts = []
     citation_map = {}
+    if merge_spans:
+        docs = merge_adjacent_chunks(docs)
 
     for idx, doc in enumerate(docs, start=1):
         chunk_id = f"C{idx}"
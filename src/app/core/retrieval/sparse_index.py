@@ -0,0 +1,501 @@
+"""BM25 keyword index for hybrid retrieval.
+
+Dense embeddings are weak at exact terms such as algorithm names, acronyms
+and equation symbols; a sparse lexical index finds those reliably. Chunks
+are tokenized at ingest time (`index_documents`) into a compact inverted
+index: the vocabulary maps each term to a slice of two parallel posting
+arrays (chunk row, term frequency), sorted by term. A query gathers the
+postings of its terms, computes Okapi BM25 contributions for all of them
+in one vectorized pass and sums them per chunk with `np.bincount`.
+
+Each chunk keeps its vector ID and metadata (including the text), so
+keyword hits can be returned without a round trip to the vector backend.
+Writes are buffered and merged into the posting arrays by `commit()`.
+
+`SparseIndexStore` keeps one directory per namespace, mirroring the vector
+namespaces (and generations) of the dense index. Indexing appends one
+immutable segment file per embedding batch and deletes by tombstone, so
+the indexer never holds more than a batch of postings; a manifest lists
+the live segments. Readers merge the segments into one index and reload
+whenever the manifest is replaced, so other processes sharing the
+directory see new generations.
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import quote
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Words (letters/digits), keeping compounds such as "gpt-4", "x_i" or "3.14"
+_TOKEN_RE = re.compile(r"[^\W_]+(?:[._\-][^\W_]+)*")
+_PART_RE = re.compile(r"[._\-]")
+
+_STOP_WORDS = frozenset(
+    """
+    a an and are as at be been but by can could did do does for from had has
+    have how i if in into is it its may of on or our so such than that the
+    their then there these they this those to was we were what when where
+    which while who why will with would you your
+    """.split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase `text` and split it into BM25 terms.
+
+    Compound tokens are kept whole and also split into their parts, so
+    "self-attention" matches queries for "self-attention" and "attention".
+    Stop words are dropped.
+    """
+    terms = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token in _STOP_WORDS:
+            continue
+        terms.append(token)
+        if _PART_RE.search(token):
+            terms.extend(
+                part for part in _PART_RE.split(token)
+                if part and part not in _STOP_WORDS
+            )
+    return terms
+
+
+class BM25Index:
+    """Inverted index over chunks, scored with Okapi BM25.
+
+    Args:
+        k1: Term frequency saturation.
+        b: Strength of document length normalization.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.terms: List[str] = []
+        self.vocabulary: Dict[str, int] = {}
+        self.ids: List[str] = []
+        self.records: List[dict] = []
+        self.rows: Dict[str, int] = {}
+        self.doc_lengths = np.zeros(0, dtype=np.float32)
+        # Postings of term t are term_offsets[t]:term_offsets[t + 1]
+        self.term_offsets = np.zeros(1, dtype=np.int64)
+        self.posting_rows = np.zeros(0, dtype=np.int32)
+        self.posting_tfs = np.zeros(0, dtype=np.float32)
+
+        self._pending: Dict[str, Tuple[Counter, int, dict]] = {}
+        self._deleted: set = set()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, vector_id: str, text: str, metadata: Optional[dict] = None) -> None:
+        """Buffer a chunk; an existing chunk with the same ID is replaced."""
+        terms = tokenize(text)
+        record = {**(metadata or {}), "text": text}
+        self._pending[vector_id] = (Counter(terms), len(terms), record)
+        self._deleted.discard(vector_id)
+
+    def delete(self, ids: Iterable[str]) -> None:
+        """Buffer the removal of chunks by vector ID."""
+        for vector_id in ids:
+            self._pending.pop(vector_id, None)
+            self._deleted.add(vector_id)
+
+    def commit(self) -> None:
+        """Merge buffered writes into the posting arrays."""
+        if not self._pending and not self._deleted:
+            return
+        replaced = self._deleted | self._pending.keys()
+        keep = np.array([vector_id not in replaced for vector_id in self.ids], dtype=bool)
+
+        # Surviving postings as (term, old row, tf) triples
+        posting_terms = np.repeat(
+            np.arange(len(self.terms), dtype=np.int64), np.diff(self.term_offsets)
+        )
+        survives = keep[self.posting_rows]
+        new_row = np.cumsum(keep) - 1
+        terms_parts = [posting_terms[survives]]
+        rows_parts = [new_row[self.posting_rows[survives]]]
+        tfs_parts = [self.posting_tfs[survives]]
+
+        kept = np.flatnonzero(keep)
+        ids = [self.ids[i] for i in kept]
+        records = [self.records[i] for i in kept]
+        lengths = [self.doc_lengths[kept]]
+
+        row = len(ids)
+        for vector_id, (counts, length, record) in self._pending.items():
+            term_ids = []
+            for term in counts:
+                if term not in self.vocabulary:
+                    self.vocabulary[term] = len(self.terms)
+                    self.terms.append(term)
+                term_ids.append(self.vocabulary[term])
+            terms_parts.append(np.asarray(term_ids, dtype=np.int64))
+            rows_parts.append(np.full(len(term_ids), row, dtype=np.int64))
+            tfs_parts.append(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+            lengths.append(np.array([length], dtype=np.float32))
+            ids.append(vector_id)
+            records.append(record)
+            row += 1
+
+        self._set_postings(terms_parts, rows_parts, tfs_parts, lengths, ids, records)
+        self._pending.clear()
+        self._deleted.clear()
+
+    def _set_postings(
+        self,
+        terms_parts: List[np.ndarray],
+        rows_parts: List[np.ndarray],
+        tfs_parts: List[np.ndarray],
+        lengths: List[np.ndarray],
+        ids: List[str],
+        records: List[dict],
+    ) -> None:
+        """Sort (term, row, tf) posting triples by term into the posting arrays."""
+        posting_terms = np.concatenate(terms_parts)
+        posting_rows = np.concatenate(rows_parts)
+        order = np.lexsort((posting_rows, posting_terms))
+        self.posting_rows = posting_rows[order].astype(np.int32)
+        self.posting_tfs = np.concatenate(tfs_parts)[order]
+        self.term_offsets = np.zeros(len(self.terms) + 1, dtype=np.int64)
+        self.term_offsets[1:] = np.cumsum(np.bincount(posting_terms, minlength=len(self.terms)))
+        self.doc_lengths = np.concatenate(lengths)
+        self.ids = ids
+        self.records = records
+        self.rows = {vector_id: i for i, vector_id in enumerate(ids)}
+
+    @classmethod
+    def merge(
+        cls, parts: List[Tuple["BM25Index", np.ndarray]], k1: float = 1.2, b: float = 0.75
+    ) -> "BM25Index":
+        """Combine committed indexes into one.
+
+        Args:
+            parts: (index, keep) pairs; `keep` flags the rows of the index
+                to carry over.
+            k1: Term frequency saturation of the merged index.
+            b: Length normalization of the merged index.
+        """
+        merged = cls(k1=k1, b=b)
+        terms_parts = [np.zeros(0, dtype=np.int64)]
+        rows_parts = [np.zeros(0, dtype=np.int64)]
+        tfs_parts = [np.zeros(0, dtype=np.float32)]
+        lengths = [np.zeros(0, dtype=np.float32)]
+        ids: List[str] = []
+        records: List[dict] = []
+        for index, keep in parts:
+            term_ids = np.zeros(len(index.terms), dtype=np.int64)
+            for i, term in enumerate(index.terms):
+                if term not in merged.vocabulary:
+                    merged.vocabulary[term] = len(merged.terms)
+                    merged.terms.append(term)
+                term_ids[i] = merged.vocabulary[term]
+            posting_terms = np.repeat(term_ids, np.diff(index.term_offsets))
+            survives = keep[index.posting_rows]
+            new_row = np.cumsum(keep) - 1 + len(ids)
+            terms_parts.append(posting_terms[survives])
+            rows_parts.append(new_row[index.posting_rows[survives]])
+            tfs_parts.append(index.posting_tfs[survives])
+            kept = np.flatnonzero(keep)
+            lengths.append(index.doc_lengths[kept])
+            ids.extend(index.ids[i] for i in kept)
+            records.extend(index.records[i] for i in kept)
+        merged._set_postings(terms_parts, rows_parts, tfs_parts, lengths, ids, records)
+        return merged
+
+    def search(self, query: str, k: int) -> List[Tuple[str, float, dict]]:
+        """Return up to `k` (vector ID, BM25 score, metadata) triples, best first.
+
+        Only committed chunks are searched.
+        """
+        count = len(self.ids)
+        term_ids = [
+            self.vocabulary[term] for term in dict.fromkeys(tokenize(query))
+            if term in self.vocabulary
+        ]
+        if k <= 0 or not count or not term_ids:
+            return []
+
+        starts = self.term_offsets[term_ids]
+        ends = self.term_offsets[np.asarray(term_ids) + 1]
+        frequencies = ends - starts
+        idf = np.log1p((count - frequencies + 0.5) / (frequencies + 0.5)).astype(np.float32)
+        slices = [slice(start, end) for start, end in zip(starts, ends)]
+        rows = np.concatenate([self.posting_rows[s] for s in slices])
+        tfs = np.concatenate([self.posting_tfs[s] for s in slices])
+        weights = np.repeat(idf, frequencies)
+
+        average_length = max(float(self.doc_lengths.mean()), 1.0)
+        norms = self.k1 * (1.0 - self.b + self.b * self.doc_lengths[rows] / average_length)
+        contributions = weights * tfs * (self.k1 + 1.0) / (tfs + norms)
+        scores = np.bincount(rows, weights=contributions, minlength=count)
+
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(self.ids[i], float(scores[i]), self.records[i]) for i in candidates]
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the posting arrays (excluding vocabulary and records)."""
+        return (
+            self.posting_rows.nbytes + self.posting_tfs.nbytes
+            + self.term_offsets.nbytes + self.doc_lengths.nbytes
+        )
+
+    def save(self, path: str) -> None:
+        """Commit and write the index to `path` (atomically replaced)."""
+        self.commit()
+
+        def encode(value: Any) -> np.ndarray:
+            return np.frombuffer(json.dumps(value).encode("utf-8"), dtype=np.uint8)
+
+        tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                params=np.array([self.k1, self.b], dtype=np.float64),
+                doc_lengths=self.doc_lengths,
+                term_offsets=self.term_offsets,
+                posting_rows=self.posting_rows,
+                posting_tfs=self.posting_tfs,
+                terms=encode(self.terms),
+                ids=encode(self.ids),
+                records=encode(self.records),
+            )
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def load_ids(path: str) -> List[str]:
+        """Read only the vector IDs of an index written by `save`."""
+        with np.load(path) as data:
+            return json.loads(data["ids"].tobytes().decode("utf-8"))
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        """Read an index written by `save`."""
+        with np.load(path) as data:
+            k1, b = (float(v) for v in data["params"])
+            index = cls(k1=k1, b=b)
+            index.doc_lengths = data["doc_lengths"]
+            index.term_offsets = data["term_offsets"]
+            index.posting_rows = data["posting_rows"]
+            index.posting_tfs = data["posting_tfs"]
+            index.terms = json.loads(data["terms"].tobytes().decode("utf-8"))
+            index.ids = json.loads(data["ids"].tobytes().decode("utf-8"))
+            index.records = json.loads(data["records"].tobytes().decode("utf-8"))
+        index.vocabulary = {term: i for i, term in enumerate(index.terms)}
+        index.rows = {vector_id: i for i, vector_id in enumerate(index.ids)}
+        return index
+
+
+class SparseIndexWriter:
+    """Appends chunks to a namespace's index, one segment per `flush()`.
+
+    Only the chunks added since the last flush are held in memory, plus the
+    IDs the namespace already contained when the writer was opened.
+    """
+
+    def __init__(self, store: "SparseIndexStore", namespace: str, existing_ids: Set[str]):
+        self.store = store
+        self.namespace = namespace
+        self.existing_ids = existing_ids
+        self._buffer = BM25Index(k1=store.k1, b=store.b)
+
+    def __contains__(self, vector_id: str) -> bool:
+        """Whether the namespace already held the chunk when the writer was opened."""
+        return vector_id in self.existing_ids
+
+    def add(self, vector_id: str, text: str, metadata: Optional[dict] = None) -> None:
+        """Buffer a chunk for the next segment."""
+        self._buffer.add(vector_id, text, metadata)
+
+    def flush(self) -> None:
+        """Write the buffered chunks as a new segment and publish it."""
+        if not self._buffer._pending:
+            return
+        self.store.append_segment(self.namespace, self._buffer)
+        self._buffer = BM25Index(k1=self.store.k1, b=self.store.b)
+
+    def delete(self, ids: Iterable[str]) -> None:
+        """Remove chunks from every segment written so far."""
+        ids = list(ids)
+        if ids:
+            self.store.delete_ids(self.namespace, ids)
+            self.existing_ids.difference_update(ids)
+
+
+class SparseIndexStore:
+    """Directory of per-namespace, segmented BM25 indexes.
+
+    Each namespace directory holds immutable segment files and a
+    `manifest.json` listing them with their sequence numbers, plus
+    tombstones mapping deleted vector IDs to the sequence number at which
+    they were deleted (a tombstone hides the ID in older segments only, so
+    a chunk can be indexed again later).
+
+    Args:
+        path: Directory holding the index files (created if missing).
+        k1: BM25 term frequency saturation for new indexes.
+        b: BM25 length normalization for new indexes.
+    """
+
+    _SUFFIX = ".bm25"
+    _MANIFEST = "manifest.json"
+
+    def __init__(self, path: str, k1: float = 1.2, b: float = 0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        os.makedirs(path, exist_ok=True)
+        self._lock = threading.Lock()
+        # Merged indexes and the manifest version they were read from
+        self._indexes: Dict[str, Tuple[Tuple[int, int], BM25Index]] = {}
+        self._searches = 0
+
+    def _namespace_path(self, namespace: str) -> str:
+        return os.path.join(self.path, f"ns-{quote(namespace, safe='')}")
+
+    def _manifest_path(self, namespace: str) -> str:
+        return os.path.join(self._namespace_path(namespace), self._MANIFEST)
+
+    def _read_manifest(self, namespace: str) -> dict:
+        try:
+            with open(self._manifest_path(namespace), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"next_seq": 0, "segments": [], "deleted": {}}
+
+    def _write_manifest(self, namespace: str, manifest: dict) -> None:
+        path = self._manifest_path(namespace)
+        tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, path)
+
+    def _live_rows(self, ids: List[str], seq: int, deleted: Dict[str, int]) -> np.ndarray:
+        return np.array([deleted.get(vector_id, -1) <= seq for vector_id in ids], dtype=bool)
+
+    def open(self, namespace: str) -> SparseIndexWriter:
+        """Return a writer appending segments to a namespace's index."""
+        manifest = self._read_manifest(namespace)
+        deleted = manifest["deleted"]
+        existing: Set[str] = set()
+        for segment in manifest["segments"]:
+            file_path = os.path.join(self._namespace_path(namespace), segment["file"])
+            try:
+                ids = BM25Index.load_ids(file_path)
+            except Exception as e:
+                logger.warning(f"Skipping unreadable sparse index segment {file_path}: {e}")
+                continue
+            existing.update(
+                vector_id for vector_id in ids if deleted.get(vector_id, -1) <= segment["seq"]
+            )
+        return SparseIndexWriter(self, namespace, existing)
+
+    def append_segment(self, namespace: str, index: BM25Index) -> None:
+        """Persist `index` as a new segment of the namespace and publish it."""
+        os.makedirs(self._namespace_path(namespace), exist_ok=True)
+        with self._lock:
+            manifest = self._read_manifest(namespace)
+            seq = manifest["next_seq"]
+            name = f"seg-{seq:06d}-{os.getpid()}{self._SUFFIX}"
+            index.save(os.path.join(self._namespace_path(namespace), name))
+            manifest["segments"].append({"file": name, "seq": seq})
+            manifest["next_seq"] = seq + 1
+            self._write_manifest(namespace, manifest)
+
+    def delete_ids(self, namespace: str, ids: Iterable[str]) -> None:
+        """Tombstone chunks in every segment written so far."""
+        with self._lock:
+            manifest = self._read_manifest(namespace)
+            for vector_id in ids:
+                manifest["deleted"][vector_id] = manifest["next_seq"]
+            self._write_manifest(namespace, manifest)
+
+    def _load(self, namespace: str) -> BM25Index:
+        """Merge the live rows of a namespace's segments into one index."""
+        manifest = self._read_manifest(namespace)
+        deleted = manifest["deleted"]
+        parts = []
+        for segment in manifest["segments"]:
+            index = BM25Index.load(os.path.join(self._namespace_path(namespace), segment["file"]))
+            parts.append((index, self._live_rows(index.ids, segment["seq"], deleted)))
+        return BM25Index.merge(parts, k1=self.k1, b=self.b)
+
+    def get(self, namespace: str) -> Optional[BM25Index]:
+        """Return the current index of a namespace, or None if it has none."""
+        try:
+            info = os.stat(self._manifest_path(namespace))
+        except FileNotFoundError:
+            with self._lock:
+                self._indexes.pop(namespace, None)
+            return None
+        version = (info.st_mtime_ns, info.st_size)
+        with self._lock:
+            cached = self._indexes.get(namespace)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        index = self._load(namespace)
+        with self._lock:
+            self._indexes[namespace] = (version, index)
+        return index
+
+    def search(self, query: str, k: int, namespace: str = "") -> dict:
+        """Keyword search in Pinecone's query response shape.
+
+        Returns:
+            `{"matches": [{"id", "score", "metadata"}]}`, best first; empty
+            if the namespace has no sparse index.
+        """
+        self._searches += 1
+        try:
+            index = self.get(namespace)
+        except Exception as e:
+            logger.warning(f"Sparse index for namespace {namespace!r} unavailable: {e}")
+            index = None
+        if index is None:
+            return {"matches": []}
+        return {
+            "matches": [
+                {"id": vector_id, "score": score, "metadata": record}
+                for vector_id, score, record in index.search(query, k)
+            ]
+        }
+
+    def delete(self, namespace: str) -> None:
+        """Remove a namespace's index directory."""
+        with self._lock:
+            self._indexes.pop(namespace, None)
+        shutil.rmtree(self._namespace_path(namespace), ignore_errors=True)
+
+    def delete_all(self) -> None:
+        """Remove every namespace's index directory."""
+        with self._lock:
+            self._indexes.clear()
+        for name in os.listdir(self.path):
+            if name.startswith("ns-"):
+                shutil.rmtree(os.path.join(self.path, name), ignore_errors=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Report loaded namespaces, their sizes and the number of searches."""
+        with self._lock:
+            loaded = {ns: index for ns, (_, index) in self._indexes.items()}
+        return {
+            "searches": self._searches,
+            "namespaces": {
+                ns: {"chunks": len(index), "terms": len(index.terms), "postings_bytes": index.nbytes}
+                for ns, index in loaded.items()
+            },
+        }
@@ -0,0 +1,78 @@
+"""Interface between the retrieval layer and a vector index.
+
+`vector_store_rest` talks to whichever backend `Settings.vector_backend`
+selects through this protocol. Vectors are dicts with `id`, `values` and
+`metadata`, and responses use Pinecone's REST shapes (e.g. query returns
+`{"matches": [{"id", "score", "metadata"}]}`), so `PineconeRESTClient`
+satisfies it as is and local backends mirror those shapes.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Protocol
+
+
+class VectorBackend(Protocol):
+    """Operations the indexer, retriever and generation registry rely on."""
+
+    def upsert(self, vectors: List[dict], namespace: str = "") -> dict:
+        """Insert or overwrite vectors by ID."""
+        ...
+
+    def query(
+        self,
+        vector: List[float],
+        top_k: int = 5,
+        namespace: str = "",
+        ef_search: Optional[int] = None,
+        include_values: bool = False,
+    ) -> dict:
+        """Return the `top_k` most similar vectors with their metadata.
+
+        `ef_search` tunes approximate (HNSW) search per query; backends
+        without it ignore the argument. With `include_values` each match
+        also carries its vector under `values`.
+        """
+        ...
+
+    async def aquery(
+        self,
+        vector: List[float],
+        top_k: int = 5,
+        namespace: str = "",
+        ef_search: Optional[int] = None,
+        include_values: bool = False,
+    ) -> dict:
+        """Async variant of `query`."""
+        ...
+
+    def fetch(self, ids: List[str], namespace: str = "") -> dict:
+        """Return `{"vectors": {id: vector}}` for the IDs that exist."""
+        ...
+
+    async def afetch(self, ids: List[str], namespace: str = "") -> dict:
+        """Async variant of `fetch`."""
+        ...
+
+    def list_ids(self, prefix: str, namespace: str = "") -> Iterator[str]:
+        """Yield all vector IDs starting with `prefix`."""
+        ...
+
+    def delete(
+        self,
+        ids: Optional[List[str]] = None,
+        delete_all: bool = False,
+        namespace: str = "",
+    ) -> dict:
+        """Delete vectors by ID, or every vector in a namespace."""
+        ...
+
+    def flush(self, namespace: Optional[str] = None) -> None:
+        """Make completed writes durable; a no-op for hosted backends."""
+        ...
+
+    def describe_index_stats(self) -> dict:
+        """Return `dimension` and per-namespace vector counts."""
+        ...
+
+    def connection_stats(self) -> Dict[str, Any]:
+        """Return backend-specific runtime counters for `/metrics`."""
+        ...
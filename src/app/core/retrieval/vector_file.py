@@ -0,0 +1,175 @@
+"""Memory-mapped on-disk format for local vector indexes.
+
+A vector file holds one namespace of the local backend so a fresh process
+can serve queries without rebuilding or re-downloading its index. Opening
+a file only reads the header and maps the sections; pages of the matrix and
+records are loaded by the OS as queries touch them.
+
+Layout (little-endian, sections aligned to 64 bytes):
+
+- header: magic, version, dtype, row count, dimension and section offsets;
+- matrix: `count x dim` L2-normalized float16 or float32 embeddings;
+- offsets table: `count + 1` uint64 positions of each record in the blob;
+- blob: one compact JSON record per row, `{"id": ..., "metadata": {...}}`,
+  where the metadata carries the chunk text.
+"""
+
+import json
+import os
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+MAGIC = b"C12VECS\x00"
+VERSION = 1
+_HEADER = struct.Struct("<8sIIQIIQQQQ")
+_ALIGNMENT = 64
+_DTYPES = {0: np.dtype("<f4"), 1: np.dtype("<f2")}
+_DTYPE_CODES = {"float32": 0, "float16": 1}
+
+# Rows scored per step; bounds the float32 upcast of float16 blocks
+_SEARCH_BLOCK_BYTES = 32 * 1024 * 1024
+
+
+def _align(position: int) -> int:
+    return -(-position // _ALIGNMENT) * _ALIGNMENT
+
+
+def write_vector_file(
+    path: str,
+    ids: List[str],
+    matrix: np.ndarray,
+    metadata: List[dict],
+    dtype: str = "float32",
+) -> None:
+    """Write one namespace to `path`, atomically replacing any existing file.
+
+    Args:
+        path: Destination file.
+        ids: Vector IDs, one per matrix row.
+        matrix: `len(ids) x dim` embeddings; stored as given, so rows
+            should already be L2-normalized.
+        metadata: Metadata dict per row.
+        dtype: "float32", or "float16" to halve the matrix size.
+    """
+    if dtype not in _DTYPE_CODES:
+        raise ValueError(f"Unsupported vector file dtype: {dtype}")
+    code = _DTYPE_CODES[dtype]
+    matrix = np.ascontiguousarray(matrix, dtype=_DTYPES[code])
+    count, dimension = matrix.shape if matrix.ndim == 2 else (0, 0)
+
+    records = [
+        json.dumps({"id": vector_id, "metadata": meta}, separators=(",", ":")).encode("utf-8")
+        for vector_id, meta in zip(ids, metadata)
+    ]
+    offsets = np.zeros(count + 1, dtype="<u8")
+    if records:
+        np.cumsum([len(record) for record in records], out=offsets[1:])
+
+    matrix_offset = _align(_HEADER.size)
+    offsets_offset = _align(matrix_offset + matrix.nbytes)
+    blob_offset = _align(offsets_offset + offsets.nbytes)
+    blob_size = int(offsets[-1])
+    header = _HEADER.pack(
+        MAGIC, VERSION, code, count, dimension, 0,
+        matrix_offset, offsets_offset, blob_offset, blob_size,
+    )
+
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.seek(matrix_offset)
+        f.write(matrix.tobytes())
+        f.seek(offsets_offset)
+        f.write(offsets.tobytes())
+        f.seek(blob_offset)
+        for record in records:
+            f.write(record)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class VectorFile:
+    """Read-only, memory-mapped view of a file written by `write_vector_file`."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError(f"{path} is not a vector file")
+        (
+            magic, version, code, count, dimension, _,
+            matrix_offset, offsets_offset, blob_offset, blob_size,
+        ) = _HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION or code not in _DTYPES:
+            raise ValueError(f"{path} is not a supported vector file")
+
+        self.path = path
+        self.count = count
+        self.dimension = dimension
+        self.dtype = _DTYPES[code]
+        if count:
+            self.matrix = np.memmap(
+                path, dtype=self.dtype, mode="r", offset=matrix_offset,
+                shape=(count, dimension),
+            )
+            self.offsets = np.memmap(
+                path, dtype="<u8", mode="r", offset=offsets_offset, shape=(count + 1,)
+            )
+            self.blob = np.memmap(
+                path, dtype=np.uint8, mode="r", offset=blob_offset, shape=(blob_size,)
+            )
+        else:
+            self.matrix = np.zeros((0, dimension), dtype=self.dtype)
+            self.offsets = np.zeros(1, dtype="<u8")
+            self.blob = np.zeros(0, dtype=np.uint8)
+        # ID -> row, decoded on first lookup
+        self._rows: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def ids(self) -> List[str]:
+        """Return the ID of every row, in row order."""
+        return list(self._row_index())
+
+    def row(self, vector_id: str) -> Optional[int]:
+        """Return the row of a vector ID, or None if the file lacks it."""
+        return self._row_index().get(vector_id)
+
+    def _row_index(self) -> Dict[str, int]:
+        if self._rows is None:
+            self._rows = {self.record(row)[0]: row for row in range(self.count)}
+        return self._rows
+
+    def record(self, row: int) -> Tuple[str, Dict[str, Any]]:
+        """Decode the ID and metadata of one row."""
+        start, end = int(self.offsets[row]), int(self.offsets[row + 1])
+        record = json.loads(self.blob[start:end].tobytes())
+        return record["id"], record["metadata"]
+
+    def scores(self, query_vector: np.ndarray) -> np.ndarray:
+        """Dot products of a normalized float32 query with every row.
+
+        Rows are scored in blocks so a float16 matrix is never upcast in
+        full and only the pages being scored need to be resident.
+        """
+        scores = np.empty(self.count, dtype=np.float32)
+        block = max(1, _SEARCH_BLOCK_BYTES // max(1, self.dimension * 4))
+        for start in range(0, self.count, block):
+            rows = self.matrix[start:start + block]
+            if rows.dtype != np.float32:
+                rows = rows.astype(np.float32)
+            np.dot(rows, query_vector, out=scores[start:start + block])
+        return scores
+
+    def load(self) -> Tuple[List[str], np.ndarray, List[dict]]:
+        """Read every row into memory as (ids, float32 matrix, metadata)."""
+        ids, metadata = [], []
+        for row in range(self.count):
+            vector_id, meta = self.record(row)
+            ids.append(vector_id)
+            metadata.append(meta)
+        return ids, np.array(self.matrix, dtype=np.float32), metadata
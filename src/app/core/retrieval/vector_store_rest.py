@@ -1,94 +1,551 @@
 """Direct REST API implementation for Pinecone to avoid multiprocessing issues in serverless."""
 
+import asyncio
 import os
+import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from functools import lru_cache
-from typing import List
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 import requests
 import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import httpx
+import numpy as np
 
 from langchain_core.documents import Document
 from langchain_openai import OpenAIEmbeddings
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from ..config import get_settings
+from ..llm.factory import get_async_http_client, get_http_client, get_http_timeout
+from .embedding_cache import EmbeddingCache
+from .fusion import reciprocal_rank_fusion
+from .generations import GenerationRegistry, new_generation_namespace
+from .indexing_pipeline import (
+    PINECONE_MAX_BATCH_VECTORS,
+    PINECONE_MAX_DELETE_IDS,
+    ConcurrentUpserter,
+    chunk_vector_id,
+    iter_batches,
+    iter_in_background,
+    iter_payload_batches,
+    source_id_prefix,
+)
+from .local_vector_store import LocalVectorBackend, normalize_rows
+from .mmr import mmr_select
+from .query_cache import QueryEmbeddingCache
+from .sparse_index import SparseIndexStore
+from .vector_backend import VectorBackend
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IndexingStats:
+    """Counters describing the outcome of an `index_documents` call."""
+
+    # Chunks embedded and upserted (excludes `chunks_unchanged`)
+    chunks_indexed: int = 0
+    # Source documents (PDF pages) whose chunks have all been embedded
+    documents_indexed: int = 0
+    embedding_cache_hits: int = 0
+    embedding_cache_misses: int = 0
+    upsert_batches: int = 0
+    upsert_retries: int = 0
+    # Incremental mode: chunks whose ID was already indexed, and stale
+    # chunks removed because they no longer occur in the source
+    chunks_unchanged: int = 0
+    chunks_deleted: int = 0
+    # Dimension of the embeddings written (None if nothing was embedded)
+    dimension: Optional[int] = None
+
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
 
 
 class PineconeRESTClient:
-    """Pinecone client using REST API instead of gRPC to avoid serverless issues."""
+    """Pinecone client using REST API instead of gRPC to avoid serverless issues.
+
+    The client owns one pooled keep-alive `requests.Session` (and a lazily
+    created `httpx.AsyncClient` for async callers), so repeated queries
+    reuse TCP/TLS connections instead of paying a handshake every time.
+    Requests failing with 429/5xx are retried with exponential backoff.
+    """
     
-    def __init__(self, api_key: str, index_name: str, environment: str = None):
+    def __init__(
+        self,
+        api_key: str,
+        index_name: str,
+        environment: str = None,
+        base_url: Optional[str] = None,
+        pool_size: int = 10,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 20.0,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+    ):
         self.api_key = api_key
         self.index_name = index_name
         # Pinecone REST API base URL
-        self.base_url = f"https://{index_name}.svc.pinecone.io"
+        self.base_url = (base_url or f"https://{index_name}.svc.pinecone.io").rstrip("/")
         self.headers = {
             "Api-Key": api_key,
-            "Content-Type": "application/json"
+            "Content-Type": "application/json",
+            "Accept-Encoding": "gzip",
         }
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            # Upserts are idempotent by vector ID, so POST is safe to retry
+            allowed_methods=frozenset({"GET", "POST", "DELETE"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        self._adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+        self._requests = 0
+
+        # Created lazily so the client binds to the running event loop
+        self._async_client: httpx.AsyncClient | None = None
+        self._async_requests = 0
+        self._async_connections = 0
+        self._async_retries = 0
+        self._single_attempt_client: "PineconeRESTClient | None" = None
+
+    def without_retries(self) -> "PineconeRESTClient":
+        """Return a client with the same settings that never retries.
+
+        For callers with their own retry loop, such as the indexer's
+        `ConcurrentUpserter`: stacking both layers would multiply attempts
+        and hide the inner retries from the caller's counters. The client
+        has its own connection pool and is created once.
+        """
+        if self._single_attempt_client is None:
+            connect_timeout, read_timeout = self.timeout
+            self._single_attempt_client = PineconeRESTClient(
+                api_key=self.api_key,
+                index_name=self.index_name,
+                base_url=self.base_url,
+                pool_size=self.pool_size,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+                max_retries=0,
+                backoff_factor=self.backoff_factor,
+            )
+        return self._single_attempt_client
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Return the shared async HTTP client, creating it on first use."""
+        if self._async_client is None or self._async_client.is_closed:
+            connect_timeout, read_timeout = self.timeout
+            self._async_client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size,
+                ),
+            )
+        return self._async_client
+
+    def _post(self, path: str, payload: dict) -> dict:
+        """POST JSON through the pooled session and decode the response."""
+        self._requests += 1
+        response = self.session.post(
+            f"{self.base_url}{path}", json=payload, timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def _get(self, path: str, params: dict) -> dict:
+        """GET through the pooled session and decode the JSON response."""
+        self._requests += 1
+        response = self.session.get(
+            f"{self.base_url}{path}", params=params, timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def _aget(self, path: str, params: dict) -> dict:
+        """GET through the async client, retrying 429/5xx with backoff."""
+        return await self._arequest("GET", path, params=params)
+
+    async def _apost(self, path: str, payload: dict) -> dict:
+        """POST JSON through the async client, retrying 429/5xx with backoff."""
+        return await self._arequest("POST", path, json=payload)
+
+    async def _arequest(self, method: str, path: str, **kwargs) -> dict:
+        """Send a request through the async client, retrying 429/5xx with backoff."""
+        client = self._get_async_client()
+        attempt = 0
+        while True:
+            self._async_requests += 1
+            try:
+                response = await client.request(
+                    method, path, extensions={"trace": self._trace_async}, **kwargs
+                )
+            except httpx.TransportError:
+                if attempt >= self.max_retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    response.raise_for_status()
+                    return response.json()
+            self._async_retries += 1
+            await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+            attempt += 1
+
+    async def _trace_async(self, event_name: str, info: dict) -> None:
+        """httpcore trace hook counting newly opened connections."""
+        if event_name == "connection.connect_tcp.complete":
+            self._async_connections += 1
     
     def upsert(self, vectors: List[dict], namespace: str = ""):
         """Upsert vectors using REST API."""
-        url = f"{self.base_url}/vectors/upsert"
         payload = {
             "vectors": vectors,
             "namespace": namespace
         }
-        
-        response = requests.post(url, headers=self.headers, json=payload)
-        response.raise_for_status()
-        return response.json()
+        return self._post("/vectors/upsert", payload)
     
-    def query(self, vector: List[float], top_k: int = 5, namespace: str = ""):
-        """Query vectors using REST API."""
-        url = f"{self.base_url}/query"
+    def query(
+        self,
+        vector: List[float],
+        top_k: int = 5,
+        namespace: str = "",
+        ef_search: Optional[int] = None,
+        include_values: bool = False,
+    ):
+        """Query vectors using REST API (`ef_search` does not apply to Pinecone)."""
         payload = {
             "vector": vector,
             "topK": top_k,
             "includeMetadata": True,
+            "includeValues": include_values,
             "namespace": namespace
         }
-        
-        response = requests.post(url, headers=self.headers, json=payload)
-        response.raise_for_status()
-        return response.json()
+        return self._post("/query", payload)
+
+    async def aupsert(self, vectors: List[dict], namespace: str = ""):
+        """Upsert vectors using the REST API without blocking the event loop."""
+        payload = {
+            "vectors": vectors,
+            "namespace": namespace
+        }
+        return await self._apost("/vectors/upsert", payload)
+
+    async def aquery(
+        self,
+        vector: List[float],
+        top_k: int = 5,
+        namespace: str = "",
+        ef_search: Optional[int] = None,
+        include_values: bool = False,
+    ):
+        """Query vectors using the REST API without blocking the event loop."""
+        payload = {
+            "vector": vector,
+            "topK": top_k,
+            "includeMetadata": True,
+            "includeValues": include_values,
+            "namespace": namespace
+        }
+        return await self._apost("/query", payload)
+
+    def fetch(self, ids: List[str], namespace: str = ""):
+        """Fetch vectors by ID using REST API."""
+        return self._get("/vectors/fetch", {"ids": ids, "namespace": namespace})
+
+    async def afetch(self, ids: List[str], namespace: str = ""):
+        """Fetch vectors by ID without blocking the event loop."""
+        return await self._aget("/vectors/fetch", {"ids": ids, "namespace": namespace})
+
+    def list_ids(self, prefix: str, namespace: str = "") -> Iterator[str]:
+        """Yield all vector IDs starting with `prefix` (serverless indexes only)."""
+        params: Dict[str, Any] = {"prefix": prefix, "namespace": namespace, "limit": 100}
+        while True:
+            result = self._get("/vectors/list", params)
+            for vector in result.get("vectors", []):
+                yield vector["id"]
+            token = (result.get("pagination") or {}).get("next")
+            if not token:
+                return
+            params = {**params, "paginationToken": token}
+
+    def delete(
+        self,
+        ids: Optional[List[str]] = None,
+        delete_all: bool = False,
+        namespace: str = "",
+    ):
+        """Delete vectors by ID, or every vector in a namespace, using REST API."""
+        payload: Dict[str, Any] = {"namespace": namespace}
+        if delete_all:
+            payload["deleteAll"] = True
+        else:
+            payload["ids"] = ids or []
+        return self._post("/vectors/delete", payload)
+
+    def flush(self, namespace: Optional[str] = None) -> None:
+        """No-op: Pinecone persists writes as they are acknowledged."""
+
+    def describe_index_stats(self):
+        """Return index statistics, including dimension and per-namespace counts."""
+        return self._post("/describe_index_stats", {})
+
+    def connection_stats(self) -> Dict[str, Any]:
+        """Report request and connection counts to make connection reuse visible."""
+        connections = 0
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                connections += pool.num_connections
+        return {
+            "requests": self._requests,
+            "connections_opened": connections,
+            "async_requests": self._async_requests,
+            "async_connections_opened": self._async_connections,
+            "async_retries": self._async_retries,
+        }
 
 
 @lru_cache(maxsize=1)
 def _get_embeddings():
-    """Get OpenAI embeddings instance."""
+    """Get OpenAI embeddings instance on the shared pooled HTTP clients."""
     settings = get_settings()
     return OpenAIEmbeddings(
         model=settings.openai_embedding_model,
         api_key=settings.openai_api_key,
+        request_timeout=get_http_timeout(),
+        # Retried with jitter by the shared transport instead
+        max_retries=0,
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
     )
 
 
+@lru_cache(maxsize=1)
+def _get_embedding_cache() -> Optional[EmbeddingCache]:
+    """Get the persistent chunk embedding cache, or None if disabled."""
+    settings = get_settings()
+    if not settings.embedding_cache_enabled:
+        return None
+    path = settings.embedding_cache_path or os.path.join(
+        tempfile.gettempdir(), "class12_embedding_cache.sqlite3"
+    )
+    try:
+        return EmbeddingCache(path, max_bytes=settings.embedding_cache_max_mb * 1024 * 1024)
+    except Exception as e:
+        # A cache that cannot be opened should never block indexing
+        logger.warning(f"Embedding cache disabled: {e}")
+        return None
+
+
+def _embed_documents_cached(texts: List[str]) -> Tuple[List[List[float]], int, int]:
+    """Embed `texts`, calling the embedding API only for cache misses.
+
+    Returns:
+        Tuple of (embeddings in input order, cache hits, cache misses).
+    """
+    embeddings = _get_embeddings()
+    cache = _get_embedding_cache()
+    if cache is None:
+        return embeddings.embed_documents(texts), 0, len(texts)
+
+    model = get_settings().openai_embedding_model
+    vectors = cache.get_many(model, texts)
+    missing = [i for i, vector in enumerate(vectors) if vector is None]
+    if missing:
+        # Embed each distinct missing text once
+        unique_texts = list(dict.fromkeys(texts[i] for i in missing))
+        fresh = dict(zip(unique_texts, embeddings.embed_documents(unique_texts)))
+        cache.put_many(model, unique_texts, [fresh[text] for text in unique_texts])
+        for i in missing:
+            vectors[i] = fresh[texts[i]]
+
+    return vectors, len(texts) - len(missing), len(missing)
+
+
+@lru_cache(maxsize=1)
+def _get_query_cache() -> Optional[QueryEmbeddingCache]:
+    """Get the in-memory query embedding cache, or None if disabled."""
+    settings = get_settings()
+    if not settings.query_cache_enabled:
+        return None
+    return QueryEmbeddingCache(
+        max_entries=settings.query_cache_max_entries,
+        max_bytes=settings.query_cache_max_mb * 1024 * 1024,
+        ttl_seconds=settings.query_cache_ttl_seconds,
+    )
+
+
+def _embed_query_cached(query: str) -> List[float]:
+    """Embed a query, serving repeated queries from the query cache."""
+    cache = _get_query_cache()
+    model = get_settings().openai_embedding_model
+    if cache is not None:
+        vector = cache.get(model, query)
+        if vector is not None:
+            return vector
+
+    vector = _get_embeddings().embed_query(query)
+    if cache is not None:
+        cache.put(model, query, vector)
+    return vector
+
+
+async def _aembed_query_cached(query: str) -> List[float]:
+    """Async variant of `_embed_query_cached`."""
+    cache = _get_query_cache()
+    model = get_settings().openai_embedding_model
+    if cache is not None:
+        vector = cache.get(model, query)
+        if vector is not None:
+            return vector
+
+    vector = await _get_embeddings().aembed_query(query)
+    if cache is not None:
+        cache.put(model, query, vector)
+    return vector
+
+
 @lru_cache(maxsize=1)
 def _get_pinecone_client():
     """Get Pinecone REST client."""
     settings = get_settings()
     return PineconeRESTClient(
         api_key=settings.pinecone_api_key,
-        index_name=settings.pinecone_index_name
+        index_name=settings.pinecone_index_name,
+        base_url=settings.pinecone_index_host,
+        pool_size=settings.pinecone_pool_size,
+        connect_timeout=settings.pinecone_connect_timeout,
+        read_timeout=settings.pinecone_read_timeout,
+        max_retries=settings.pinecone_max_retries,
+        backoff_factor=settings.pinecone_retry_backoff,
     )
 
 
-def retrieve(query: str, k: int = 4) -> List[Document]:
-    """Retrieve documents from Pinecone using REST API."""
-    embeddings = _get_embeddings()
-    client = _get_pinecone_client()
-    
-    # Get query embedding
-    query_vector = embeddings.embed_query(query)
-    
-    # Query Pinecone
-    results = client.query(vector=query_vector, top_k=k)
-    
-    # Convert results to Documents
+@lru_cache(maxsize=1)
+def _get_vector_backend() -> VectorBackend:
+    """Get the vector index selected by `Settings.vector_backend`."""
+    settings = get_settings()
+    if settings.vector_backend == "local":
+        return LocalVectorBackend(
+            path=settings.local_index_path,
+            dtype=settings.local_index_dtype,
+            index_type=settings.local_index_type,
+            hnsw_m=settings.hnsw_m,
+            hnsw_ef_construction=settings.hnsw_ef_construction,
+            hnsw_ef_search=settings.hnsw_ef_search,
+            ivfpq_nlist=settings.ivfpq_nlist,
+            ivfpq_m=settings.ivfpq_m,
+            ivfpq_nprobe=settings.ivfpq_nprobe,
+            ivfpq_rerank=settings.ivfpq_rerank,
+        )
+    return _get_pinecone_client()
+
+
+@lru_cache(maxsize=1)
+def _get_sparse_index_store() -> Optional[SparseIndexStore]:
+    """Get the per-namespace BM25 index directory, or None if disabled."""
+    settings = get_settings()
+    if not settings.sparse_index_enabled:
+        return None
+    path = settings.sparse_index_path or os.path.join(
+        tempfile.gettempdir(), "class12_sparse_index"
+    )
+    try:
+        return SparseIndexStore(path)
+    except Exception as e:
+        # Hybrid retrieval falls back to dense-only without a sparse index
+        logger.warning(f"Sparse index disabled: {e}")
+        return None
+
+
+@lru_cache(maxsize=1)
+def _get_sparse_executor() -> ThreadPoolExecutor:
+    """Get the thread pool running keyword searches next to dense queries."""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="sparse-search")
+
+
+def _delete_sparse_namespace(namespace: str) -> None:
+    store = _get_sparse_index_store()
+    if store is not None:
+        store.delete(namespace)
+
+
+@lru_cache(maxsize=1)
+def _get_generation_registry() -> GenerationRegistry:
+    """Get the active-generation pointer for this worker."""
+    settings = get_settings()
+    return GenerationRegistry(
+        _get_vector_backend(),
+        cache_ttl_seconds=settings.generation_pointer_ttl_seconds,
+        gc_delay_seconds=settings.generation_gc_delay_seconds,
+        on_delete=_delete_sparse_namespace,
+    )
+
+
+def begin_generation() -> str:
+    """Return a fresh namespace to index a new generation into."""
+    return new_generation_namespace()
+
+
+def get_active_generation() -> str:
+    """Return the namespace of the generation queries currently read."""
+    return _get_generation_registry().active_namespace()
+
+
+def activate_generation(namespace: str, dimension: Optional[int] = None) -> None:
+    """Switch queries to a fully indexed generation and GC older ones.
+
+    Args:
+        namespace: The generation to activate.
+        dimension: Dimension of the vectors indexed into it
+            (`IndexingStats.dimension`). When unknown, the index's own
+            dimension is used, or the embedding model's if the index is
+            still empty.
+    """
+    if dimension is None:
+        dimension = _get_vector_backend().describe_index_stats().get("dimension")
+    if dimension is None:
+        dimension = len(_embed_query_cached("dimension"))
+    _get_generation_registry().activate(namespace, dimension)
+
+
+def discard_generation(namespace: str) -> None:
+    """Delete a partially indexed generation that will not be activated."""
+    _get_generation_registry().discard(namespace)
+
+
+def _matches_to_documents(results: dict) -> List[Document]:
+    """Convert a Pinecone query response into Document objects."""
     documents = []
     for match in results.get("matches", []):
-        metadata = match.get("metadata", {})
+        metadata = dict(match.get("metadata", {}))
         text = metadata.get("text", "")
+        if match.get("score") is not None:
+            metadata["score"] = match["score"]
         documents.append(Document(
             page_content=text,
             metadata=metadata
@@ -97,16 +554,208 @@ def retrieve(query: str, k: int = 4) -> List[Document]:
     return documents
 
 
-def index_documents(docs: List[Document]) -> int:
-    """Index documents into Pinecone using REST API."""
+def _hybrid_store(mode: Optional[str]) -> Optional[SparseIndexStore]:
+    """Return the sparse index to fuse with, or None for dense-only retrieval."""
+    if (mode or get_settings().retrieval_mode) != "hybrid":
+        return None
+    return _get_sparse_index_store()
+
+
+def _fuse(dense: dict, sparse: dict, k: int) -> List[dict]:
+    """Fuse dense and keyword matches with RRF into the `k` best matches."""
+    return reciprocal_rank_fusion(
+        [dense.get("matches", []), sparse.get("matches", [])],
+        k=k,
+        rrf_k=get_settings().hybrid_rrf_k,
+    )
+
+
+def _attach_cached_values(matches: List[dict]) -> List[str]:
+    """Give matches without `values` their cached chunk embeddings.
+
+    Keyword-only hits of hybrid retrieval come without vectors; their
+    texts were embedded at ingest, so the embedding cache usually has them.
+
+    Returns:
+        IDs of matches still missing values.
+    """
+    missing = [match for match in matches if not match.get("values")]
+    cache = _get_embedding_cache()
+    if missing and cache is not None:
+        texts = [(match.get("metadata") or {}).get("text", "") for match in missing]
+        for match, vector in zip(missing, cache.get_many(get_settings().openai_embedding_model, texts)):
+            if vector is not None:
+                match["values"] = vector
+    return [match["id"] for match in matches if not match.get("values")]
+
+
+def _diversify(
+    query_vector: List[float], matches: List[dict], k: int, fetched: dict
+) -> List[dict]:
+    """Re-rank matches with MMR and return the `k` picks.
+
+    Args:
+        query_vector: The query embedding.
+        matches: Candidates, best first; values missing from a match are
+            taken from `fetched` (a fetch response's `vectors`).
+        k: Number of matches to keep.
+        fetched: Vectors fetched from the backend by ID.
+    """
+    for match in matches:
+        if not match.get("values") and match["id"] in fetched:
+            match["values"] = fetched[match["id"]].get("values")
+    # Candidates whose vector is unavailable cannot be compared; keep them out
+    candidates = [match for match in matches if match.get("values")]
+    if len(candidates) <= k:
+        return matches[:k]
+
+    vectors = np.asarray([match["values"] for match in candidates], dtype=np.float32)
+    fusion_scores = [(match.get("metadata") or {}).get("fusion_score") for match in candidates]
+    if all(score is not None for score in fusion_scores):
+        # Hybrid: fused rank is the relevance signal, scaled to [0, 1]
+        relevance = np.asarray(fusion_scores, dtype=np.float32) / max(fusion_scores)
+    else:
+        relevance = normalize_rows(vectors) @ normalize_rows(query_vector)
+    picked = mmr_select(relevance, vectors, k, get_settings().mmr_lambda)
+    return [candidates[i] for i in picked]
+
+
+def _candidate_depths(k: int, diversify: bool, hybrid: bool) -> Tuple[int, int]:
+    """Return (candidates to re-rank, matches to request from each search)."""
     settings = get_settings()
-    embeddings = _get_embeddings()
-    client = _get_pinecone_client()
-    
-    text_splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
-    
-    all_chunks: List[Document] = []
-    for doc in docs:
+    pool = k * settings.mmr_fetch_multiplier if diversify else k
+    depth = max(pool, settings.hybrid_candidates) if hybrid else pool
+    return pool, depth
+
+
+def retrieve(
+    query: str,
+    k: int = 4,
+    ef_search: Optional[int] = None,
+    mode: Optional[str] = None,
+    diversify: Optional[bool] = None,
+) -> List[Document]:
+    """Retrieve documents from the configured vector backend.
+
+    In hybrid mode the BM25 keyword search runs on a worker thread while
+    the query is embedded and sent to the vector backend; the two rankings
+    are then fused with reciprocal rank fusion. Documents keep the dense
+    cosine `score` when the dense search found them and carry the fused
+    `fusion_score`.
+
+    With MMR diversification, `k * Settings.mmr_fetch_multiplier`
+    candidates are fetched together with their vectors and `k` of them
+    are picked by maximal marginal relevance, so near-duplicate
+    (overlapping) chunks do not crowd out other evidence.
+
+    Args:
+        query: Search query string.
+        k: Number of documents to retrieve.
+        ef_search: HNSW beam width for this query (local HNSW backend only);
+            defaults to `Settings.hnsw_ef_search`.
+        mode: "dense" or "hybrid"; defaults to `Settings.retrieval_mode`.
+        diversify: Re-rank with MMR; defaults to `Settings.retrieval_mmr`.
+    """
+    client = _get_vector_backend()
+    sparse_store = _hybrid_store(mode)
+    if diversify is None:
+        diversify = get_settings().retrieval_mmr
+    pool, depth = _candidate_depths(k, diversify, sparse_store is not None)
+
+    # Query the active generation
+    namespace = _get_generation_registry().active_namespace()
+    if sparse_store is not None:
+        sparse_future = _get_sparse_executor().submit(
+            sparse_store.search, query, depth, namespace
+        )
+
+    # Get query embedding (cached for repeated queries)
+    query_vector = _embed_query_cached(query)
+    results = client.query(
+        vector=query_vector, top_k=depth, namespace=namespace,
+        ef_search=ef_search, include_values=diversify,
+    )
+
+    matches = results.get("matches", [])
+    if sparse_store is not None:
+        matches = _fuse(results, sparse_future.result(), pool)
+    if diversify:
+        missing = _attach_cached_values(matches)
+        fetched = client.fetch(missing, namespace=namespace).get("vectors", {}) if missing else {}
+        matches = _diversify(query_vector, matches, k, fetched)
+    return _matches_to_documents({"matches": matches[:k]})
+
+
+async def aretrieve(
+    query: str,
+    k: int = 4,
+    ef_search: Optional[int] = None,
+    mode: Optional[str] = None,
+    diversify: Optional[bool] = None,
+) -> List[Document]:
+    """Async variant of `retrieve` for use inside the event loop."""
+    client = _get_vector_backend()
+    sparse_store = _hybrid_store(mode)
+    if diversify is None:
+        diversify = get_settings().retrieval_mmr
+    pool, depth = _candidate_depths(k, diversify, sparse_store is not None)
+    namespace = await _get_generation_registry().aactive_namespace()
+
+    async def dense_search() -> Tuple[List[float], dict]:
+        query_vector = await _aembed_query_cached(query)
+        results = await client.aquery(
+            vector=query_vector, top_k=depth, namespace=namespace,
+            ef_search=ef_search, include_values=diversify,
+        )
+        return query_vector, results
+
+    if sparse_store is None:
+        query_vector, results = await dense_search()
+        matches = results.get("matches", [])
+    else:
+        loop = asyncio.get_running_loop()
+        (query_vector, results), sparse_results = await asyncio.gather(
+            dense_search(),
+            loop.run_in_executor(
+                _get_sparse_executor(), sparse_store.search, query, depth, namespace
+            ),
+        )
+        matches = _fuse(results, sparse_results, pool)
+
+    if diversify:
+        missing = _attach_cached_values(matches)
+        fetched = {}
+        if missing:
+            fetched = (await client.afetch(missing, namespace=namespace)).get("vectors", {})
+        matches = _diversify(query_vector, matches, k, fetched)
+    return _matches_to_documents({"matches": matches[:k]})
+
+
+class _CountingIterator:
+    """Wrap an iterable and count the items consumed from it."""
+
+    def __init__(self, items: Iterable[Any]):
+        self._iterator = iter(items)
+        self.count = 0
+
+    def __iter__(self) -> "_CountingIterator":
+        return self
+
+    def __next__(self) -> Any:
+        item = next(self._iterator)
+        self.count += 1
+        return item
+
+
+def _iter_chunks(
+    docs: Iterable[Document], text_splitter: RecursiveCharacterTextSplitter
+) -> Iterator[Tuple[int, Document]]:
+    """Split documents one at a time, yielding chunks with page/source metadata.
+
+    Each chunk is paired with the 1-based ordinal of its parent document so
+    progress can be reported in documents (pages) fully processed.
+    """
+    for ordinal, doc in enumerate(docs, start=1):
         if "source" not in doc.metadata:
             doc.metadata["source"] = doc.metadata.get("source", "unknown")
         if "page" not in doc.metadata and "page_number" not in doc.metadata:
@@ -119,34 +768,199 @@ def index_documents(docs: List[Document]) -> int:
                 ch.metadata["page"] = doc.metadata.get("page", "unknown")
             if "source" not in ch.metadata:
                 ch.metadata["source"] = doc.metadata.get("source", "unknown")
-            all_chunks.append(ch)
-    
-    # Prepare vectors for upsert
-    vectors = []
-    texts = [chunk.page_content for chunk in all_chunks]
-    
-    # Embed texts
-    text_embeddings = embeddings.embed_documents(texts)
-    
-    # Create vector objects
-    for i, (chunk, embedding) in enumerate(zip(all_chunks, text_embeddings)):
-        vector_id = f"vec_{i}_{hash(chunk.page_content)}"
-        vectors.append({
-            "id": vector_id,
-            "values": embedding,
-            "metadata": {
-                **chunk.metadata,
-                "text": chunk.page_content
-            }
-        })
-    
-    # Upsert in batches of 100
-    batch_size = 100
-    for i in range(0, len(vectors), batch_size):
-        batch = vectors[i:i + batch_size]
-        client.upsert(vectors=batch)
+            yield ordinal, ch
+
+
+def _vector_id(chunk: Document) -> str:
+    """Content-addressed ID of a chunk produced by `_iter_chunks`."""
+    metadata = chunk.metadata
+    return chunk_vector_id(
+        str(metadata.get("source", "unknown")),
+        metadata.get("page", metadata.get("page_number", "unknown")),
+        metadata.get("start_index", 0),
+        chunk.page_content,
+    )
+
+
+def index_documents(
+    docs: Iterable[Document],
+    on_progress: Optional[Callable[[IndexingStats], None]] = None,
+    namespace: str = "",
+    incremental: bool = False,
+) -> IndexingStats:
+    """Index documents into Pinecone using REST API.
+
+    `docs` may be a lazy iterator (e.g. `PyPDFLoader.lazy_load()`); pages
+    are parsed and split on a background thread and only a bounded number
+    of chunks, embeddings and vectors are held in memory at any time.
+    Chunks are embedded in batches, and each batch is upserted by a bounded
+    thread pool while the next one is being embedded. Chunk embeddings are
+    served from the persistent embedding cache where possible, so only new
+    chunk texts are sent to the embedding API.
+
+    Vector IDs are content-addressed (see `chunk_vector_id`). In incremental
+    mode the IDs already stored for each source are listed first: chunks
+    whose ID is present are neither embedded nor upserted, and IDs the
+    source no longer produces are deleted after all new chunks are written.
+    Editing one page of a PDF therefore only re-embeds that page.
+
+    With `retrieval_mode="hybrid"` every chunk is also added to the
+    namespace's BM25 keyword index (see `sparse_index`), written as one
+    segment per embedding batch so its postings never accumulate in memory.
+
+    Args:
+        docs: Documents (typically one per page) to split, embed and upsert.
+        on_progress: Called with the running stats after each embedding batch.
+        namespace: Pinecone namespace to write to, e.g. a new generation
+            from `begin_generation()`.
+        incremental: Diff against the chunks already indexed for each
+            source in `namespace` instead of writing every chunk.
+    """
+    settings = get_settings()
+    client = _get_vector_backend()
+    # Only hybrid retrieval reads the keyword index
+    sparse_store = _get_sparse_index_store() if settings.retrieval_mode == "hybrid" else None
+    sparse = sparse_store.open(namespace) if sparse_store is not None else None
     
-    return len(all_chunks)
+    # start_index gives each chunk a stable offset within its page
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=500, chunk_overlap=50, add_start_index=True
+    )
+    batch_size = settings.index_embed_batch_size
+    documents = _CountingIterator(docs)
+    chunks = iter_in_background(_iter_chunks(documents, text_splitter), maxsize=batch_size * 2)
+
+    stats = IndexingStats()
+    # The upserter retries failed batches itself, so upserts skip HTTP retries
+    upsert_client = (
+        client.without_retries() if isinstance(client, PineconeRESTClient) else client
+    )
+    upserter = ConcurrentUpserter(
+        upsert=lambda batch: upsert_client.upsert(vectors=batch, namespace=namespace),
+        concurrency=settings.index_upsert_concurrency,
+        max_retries=settings.index_upsert_retries,
+    )
+
+    # IDs already stored per source (incremental mode), loaded on first sight
+    previous_ids: Dict[str, Set[str]] = {}
+    seen_ids: Set[str] = set()
+
+    def already_indexed(chunk: Document, vector_id: str) -> bool:
+        source = str(chunk.metadata.get("source", "unknown"))
+        if source not in previous_ids:
+            previous_ids[source] = set(
+                client.list_ids(source_id_prefix(source), namespace=namespace)
+            )
+        return vector_id in previous_ids[source]
+
+    # Embed batch N+1 while batch N is being upserted in the background
+    try:
+        for batch in iter_batches(chunks, batch_size):
+            batch_chunks = []
+            batch_ids = []
+            for _, chunk in batch:
+                vector_id = _vector_id(chunk)
+                # Unchanged chunks are re-added only if the keyword index lacks them
+                if sparse is not None and vector_id not in sparse:
+                    sparse.add(vector_id, chunk.page_content, chunk.metadata)
+                if incremental:
+                    seen_ids.add(vector_id)
+                    if already_indexed(chunk, vector_id):
+                        stats.chunks_unchanged += 1
+                        continue
+                batch_chunks.append(chunk)
+                batch_ids.append(vector_id)
+
+            if batch_chunks:
+                texts = [chunk.page_content for chunk in batch_chunks]
+
+                # Embed texts, reusing cached embeddings for unchanged chunks
+                text_embeddings, cache_hits, cache_misses = _embed_documents_cached(texts)
+                stats.embedding_cache_hits += cache_hits
+                stats.embedding_cache_misses += cache_misses
+                if stats.dimension is None and text_embeddings:
+                    stats.dimension = len(text_embeddings[0])
+
+                # Create vector objects
+                vectors = []
+                for vector_id, chunk, embedding in zip(batch_ids, batch_chunks, text_embeddings):
+                    vectors.append({
+                        "id": vector_id,
+                        "values": embedding,
+                        "metadata": {
+                            **chunk.metadata,
+                            "text": chunk.page_content
+                        }
+                    })
+
+                # Metadata carries the full chunk text, so size batches by payload
+                for upsert_batch in iter_payload_batches(
+                    vectors,
+                    max_bytes=settings.index_upsert_max_bytes,
+                    max_vectors=PINECONE_MAX_BATCH_VECTORS,
+                ):
+                    upserter.submit(upsert_batch)
+            if sparse is not None:
+                try:
+                    sparse.flush()
+                except Exception as e:
+                    # Hybrid retrieval degrades to dense-only; never fail indexing
+                    logger.warning(f"Could not write sparse index for {namespace!r}: {e}")
+                    sparse = None
+            stats.chunks_indexed += len(batch_chunks)
+            # The last document in the batch may continue in the next one
+            stats.documents_indexed = batch[-1][0] - 1
+            if on_progress is not None:
+                on_progress(stats)
+    except BaseException:
+        # Keep the original error; in-flight upsert failures are secondary
+        upserter.abort()
+        raise
+    else:
+        upserter.drain()
+    finally:
+        chunks.close()
+
+    # Remove chunks of edited or deleted pages only once replacements are in
+    if incremental:
+        stale = [
+            vector_id
+            for ids in previous_ids.values()
+            for vector_id in ids
+            if vector_id not in seen_ids
+        ]
+        for delete_batch in iter_batches(stale, PINECONE_MAX_DELETE_IDS):
+            client.delete(ids=delete_batch, namespace=namespace)
+        if sparse is not None:
+            try:
+                sparse.delete(stale)
+            except Exception as e:
+                logger.warning(f"Could not update sparse index for {namespace!r}: {e}")
+        stats.chunks_deleted = len(stale)
+
+    client.flush(namespace)
+
+    stats.documents_indexed = documents.count
+    stats.upsert_batches = upserter.batches
+    stats.upsert_retries = upserter.retries
+    return stats
+
+
+def clear_index() -> None:
+    """Delete every vector, in all namespaces, from the configured backend."""
+    client = _get_vector_backend()
+    namespaces = client.describe_index_stats().get("namespaces") or {}
+    for namespace in namespaces:
+        try:
+            client.delete(delete_all=True, namespace=namespace)
+        except Exception as e:
+            if "Namespace not found" not in str(e):
+                raise
+    sparse_store = _get_sparse_index_store()
+    if sparse_store is not None:
+        sparse_store.delete_all()
+    _get_generation_registry.cache_clear()
+    logger.info(f"Cleared {len(namespaces)} namespace(s) from the vector index")
 
 
 def get_retriever(k: int | None = None):
@@ -159,3 +973,17 @@ def get_retriever(k: int | None = None):
         return retrieve(query, k=k)
     
     return retriever_func
+
+
+def get_retrieval_metrics() -> Dict[str, Any]:
+    """Collect runtime metrics of the retrieval layer for this worker."""
+    query_cache = _get_query_cache()
+    sparse_store = _get_sparse_index_store()
+    return {
+        "query_embedding_cache": query_cache.stats() if query_cache else None,
+        "sparse_index": sparse_store.stats() if sparse_store else None,
+        "vector_backend": {
+            "name": get_settings().vector_backend,
+            **_get_vector_backend().connection_stats(),
+        },
+    }
@@ -1,24 +1,32 @@
 from typing import Optional, Dict, Any
 from pydantic import BaseModel
 
+from .core.config import QAProfile
+
 
 class QuestionRequest(BaseModel):
     """Request body for the `/qa` endpoint.
 
     The PRD specifies a single field named `question` that contains
     the user's natural language question about the vector databases paper.
+    `profile` optionally picks the pipeline profile ("fast", "balanced" or
+    "strict"); it defaults to the `QA_PROFILE` setting.
     """
 
     question: str
+    profile: Optional[QAProfile] = None
 
 
 class QAResponse(BaseModel):
     """Response body for the `/qa` endpoint.
 
     Exposes the final verified answer, context snippets, and machine-readable
-    citation mappings for full transparency about evidence sources.
+    citation mappings for full transparency about evidence sources, plus
+    the pipeline profile that answered and its latency.
     """
 
     answer: str
     context: str
     citations: Optional[Dict[str, Dict[str, Any]]] = None
+    profile: Optional[str] = None
+    latency_ms: Optional[float] = None
@@ -0,0 +1,208 @@
+"""Background indexing jobs with progress reporting.
+
+`POST /index-pdf` submits a job and returns immediately; the job runs on a
+small bounded thread pool so concurrent uploads queue up instead of
+overloading the embedding API. Job records expose the current stage,
+pages/chunks processed, throughput and an ETA for `GET /index-jobs/{id}`.
+
+Each job writes into a fresh index generation and only switches queries
+over once indexing has succeeded, so the previous document stays
+searchable for the whole run and a failed upload leaves it untouched.
+Incremental jobs instead update the active generation in place and only
+touch the chunks that changed since the same source was last indexed.
+
+Jobs live in process memory, so status is only visible on the worker that
+accepted the upload, and serverless platforms may freeze the process once
+the response is sent.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from ..core.config import get_settings
+from ..core.retrieval.vector_store_rest import (
+    IndexingStats,
+    activate_generation,
+    begin_generation,
+    discard_generation,
+    get_active_generation,
+)
+from .indexing_service import index_pdf_file
+from .pdf_extraction import count_pdf_pages
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IndexJob:
+    """State of one background indexing job."""
+
+    id: str
+    filename: str
+    status: str = "queued"  # queued | running | succeeded | failed
+    stage: str = "queued"  # queued | indexing | activating | done
+    pages_total: Optional[int] = None
+    pages_processed: int = 0
+    # Chunks embedded and upserted, and chunks skipped as already indexed
+    chunks_processed: int = 0
+    chunks_unchanged: int = 0
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    generation: Optional[str] = None
+    incremental: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the job with derived throughput and ETA."""
+        elapsed = None
+        pages_per_second = None
+        chunks_per_second = None
+        eta_seconds = None
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.time()) - self.started_at
+            if elapsed > 0:
+                pages_per_second = self.pages_processed / elapsed
+                chunks_per_second = self.chunks_processed / elapsed
+            if self.status == "running" and self.pages_total and pages_per_second:
+                remaining = max(0, self.pages_total - self.pages_processed)
+                eta_seconds = remaining / pages_per_second
+
+        return {
+            "job_id": self.id,
+            "filename": self.filename,
+            "status": self.status,
+            "stage": self.stage,
+            "generation": self.generation,
+            "incremental": self.incremental,
+            "pages_total": self.pages_total,
+            "pages_processed": self.pages_processed,
+            "chunks_processed": self.chunks_processed,
+            "chunks_unchanged": self.chunks_unchanged,
+            "elapsed_seconds": elapsed,
+            "pages_per_second": pages_per_second,
+            "chunks_per_second": chunks_per_second,
+            "eta_seconds": eta_seconds,
+            "error": self.error,
+            "result": self.result,
+        }
+
+
+class IndexJobManager:
+    """Runs indexing jobs on a bounded worker pool and tracks their state."""
+
+    def __init__(self, workers: int, max_retained: int = 200):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="index-job"
+        )
+        self._jobs: "OrderedDict[str, IndexJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_retained = max_retained
+
+    def submit(
+        self,
+        file_path: str,
+        filename: str,
+        on_finish: Optional[Callable[[], None]] = None,
+        incremental: bool = False,
+    ) -> IndexJob:
+        """Queue a PDF for indexing and return its job record.
+
+        Args:
+            file_path: Local path of the PDF to index.
+            filename: Original filename, used as the citation source.
+            on_finish: Called once the job has finished, e.g. to remove the file.
+            incremental: Update the active generation in place instead of
+                indexing into a new one.
+        """
+        job = IndexJob(id=uuid.uuid4().hex, filename=filename, incremental=incremental)
+        with self._lock:
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.max_retained:
+                self._jobs.popitem(last=False)
+        self._executor.submit(self._run, job, file_path, on_finish)
+        return job
+
+    def get(self, job_id: str) -> Optional[IndexJob]:
+        """Look up a job by ID."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(
+        self, job: IndexJob, file_path: str, on_finish: Optional[Callable[[], None]]
+    ) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        activated = False
+        try:
+            job.pages_total = count_pdf_pages(file_path)
+
+            # 1. Index the new PDF into a fresh generation; queries keep
+            # reading the current one meanwhile. Incremental jobs diff
+            # against the active generation and write into it directly.
+            job.stage = "indexing"
+            if job.incremental:
+                job.generation = get_active_generation()
+            else:
+                job.generation = begin_generation()
+
+            def on_progress(stats: IndexingStats) -> None:
+                job.pages_processed = stats.documents_indexed
+                job.chunks_processed = stats.chunks_indexed
+                job.chunks_unchanged = stats.chunks_unchanged
+
+            stats = index_pdf_file(
+                file_path,
+                job.filename,
+                on_progress=on_progress,
+                namespace=job.generation,
+                incremental=job.incremental,
+            )
+            on_progress(stats)
+
+            # 2. Atomically switch queries to the new generation
+            if not job.incremental:
+                job.stage = "activating"
+                activate_generation(job.generation, stats.dimension)
+            activated = True
+            job.result = {
+                "chunks_indexed": stats.chunks_indexed,
+                "chunks_unchanged": stats.chunks_unchanged,
+                "chunks_deleted": stats.chunks_deleted,
+                "embedding_cache": {
+                    "hits": stats.embedding_cache_hits,
+                    "misses": stats.embedding_cache_misses,
+                },
+            }
+            job.status = "succeeded"
+        except Exception as e:
+            logger.exception(f"Indexing job {job.id} failed")
+            job.status = "failed"
+            job.error = f"Indexing failed: {str(e)}"
+            if job.generation and not activated:
+                discard_generation(job.generation)
+        finally:
+            job.stage = "done"
+            job.finished_at = time.time()
+            if on_finish is not None:
+                on_finish()
+
+
+_manager: IndexJobManager | None = None
+_manager_lock = threading.Lock()
+
+
+def get_index_job_manager() -> IndexJobManager:
+    """Get the process-wide job manager (singleton pattern)."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = IndexJobManager(workers=get_settings().index_job_workers)
+        return _manager
@@ -1,33 +1,77 @@
 """Service functions for indexing documents into the vector database."""
 
 from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
 
 from langchain_community.document_loaders import PyPDFLoader
+from langchain_core.documents import Document
 
+from ..core.config import get_settings
 # Use REST API implementation for serverless compatibility
-from ..core.retrieval.vector_store_rest import index_documents
+from ..core.retrieval.vector_store_rest import IndexingStats, index_documents
+from .pdf_extraction import iter_pdf_pages
 
 
-def index_pdf_file(file_path: str) -> int:
-    """Load a PDF from a path or URL and index it into the vector DB.
+def index_pdf_file(
+    file_path: str,
+    source: Optional[str] = None,
+    on_progress: Optional[Callable[[IndexingStats], None]] = None,
+    namespace: str = "",
+    incremental: bool = False,
+) -> IndexingStats:
+    """Load a PDF from a path or URL and stream it into the vector DB.
 
     Args:
         file_path: Path or URL to the PDF file.
+        source: Name recorded as the citation `source` (e.g. the uploaded
+            filename when `file_path` is a temp file). Defaults to `file_path`.
+        on_progress: Called with running indexing stats after each batch;
+            `documents_indexed` counts pages whose chunks are all embedded.
+        namespace: Vector namespace (index generation) to write into.
+        incremental: Only embed and upsert chunks that changed since the
+            source was last indexed into `namespace`, and delete stale ones.
 
     Returns:
-        Number of document chunks indexed.
+        Indexing statistics, including the number of chunks indexed.
+    """
+    settings = get_settings()
+    if settings.pdf_extraction_workers > 1 and Path(str(file_path)).is_file():
+        # CPU-bound extraction is sharded across worker processes
+        pages = iter_pdf_pages(
+            str(file_path),
+            workers=settings.pdf_extraction_workers,
+            shard_pages=settings.pdf_extraction_shard_pages,
+            min_pages=settings.pdf_extraction_min_pages,
+            source=source,
+        )
+    else:
+        # Stream pages lazily so the whole document is never held in memory
+        pages = PyPDFLoader(str(file_path)).lazy_load()
+
+    docs = _with_citation_metadata(pages, file_path, source)
+    return index_documents(
+        docs, on_progress=on_progress, namespace=namespace, incremental=incremental
+    )
+
+
+def _with_citation_metadata(
+    docs: Iterable[Document],
+    file_path: str,
+    source: Optional[str] = None,
+) -> Iterator[Document]:
+    """Ensure each loaded Document has `page` and `source` metadata.
+
+    Downstream splitting and serialization rely on these fields to produce
+    accurate citations.
     """
-    loader = PyPDFLoader(str(file_path))
-    docs = loader.load()
-    # Ensure each loaded Document has `page` and `source` metadata so
-    # downstream splitting and serialization can produce accurate citations.
     for i, doc in enumerate(docs, start=1):
         # Some loaders populate page as a float (e.g., 1.0) or as an int;
         # prefer existing metadata but fall back to the page index.
         if not doc.metadata.get("page") and not doc.metadata.get("page_number"):
             doc.metadata["page"] = i
         # Always set a source path so citations include the filename
-        if not doc.metadata.get("source"):
+        if source:
+            doc.metadata["source"] = source
+        elif not doc.metadata.get("source"):
             doc.metadata["source"] = str(file_path)
-
-    return index_documents(docs)
+        yield doc
@@ -0,0 +1,100 @@
+"""Parallel PDF text extraction for large documents.
+
+pypdf is pure Python, so text extraction is CPU-bound and runs on a single
+core. For long documents the page range is split into shards that worker
+processes extract independently, each opening the file on its own. Pages
+are yielded in page order with the same `page`/`source` metadata that
+`PyPDFLoader` produces.
+"""
+
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Deque, Iterator, List, Optional, Tuple
+
+from langchain_core.documents import Document
+from pypdf import PdfReader
+
+
+def _extract_page_range(
+    file_path: str, start: int, stop: int
+) -> List[Tuple[int, str, Optional[str]]]:
+    """Extract `(page index, text, page label)` for pages `start..stop-1`.
+
+    Runs in a worker process, so it opens its own reader.
+    """
+    reader = PdfReader(file_path)
+    labels = reader.page_labels
+    return [
+        (i, reader.pages[i].extract_text(), labels[i] if i < len(labels) else None)
+        for i in range(start, stop)
+    ]
+
+
+def count_pdf_pages(file_path: str) -> int:
+    """Return the page count of a local PDF without extracting any text."""
+    return len(PdfReader(file_path).pages)
+
+
+def iter_pdf_pages(
+    file_path: str,
+    workers: int,
+    shard_pages: int = 25,
+    min_pages: int = 50,
+    source: Optional[str] = None,
+) -> Iterator[Document]:
+    """Yield one Document per page, extracting shards on a process pool.
+
+    Documents shorter than `min_pages`, or `workers <= 1`, are extracted
+    in-process. At most `2 * workers` shards are in flight, so memory stays
+    bounded for very large files.
+
+    Args:
+        file_path: Local path to the PDF file.
+        workers: Number of worker processes.
+        shard_pages: Pages extracted per worker task.
+        min_pages: Minimum page count before a process pool is used.
+        source: Value for the `source` metadata (defaults to `file_path`).
+
+    Yields:
+        Documents in page order with `source`, `page` (0-based),
+        `page_label` and `total_pages` metadata.
+    """
+    source = source or str(file_path)
+    total_pages = count_pdf_pages(file_path)
+    shards = [
+        (start, min(start + shard_pages, total_pages))
+        for start in range(0, total_pages, shard_pages)
+    ]
+
+    def to_documents(pages: List[Tuple[int, str, Optional[str]]]) -> Iterator[Document]:
+        for page, text, label in pages:
+            metadata = {"source": source, "page": page, "total_pages": total_pages}
+            if label is not None:
+                metadata["page_label"] = label
+            yield Document(page_content=text.strip(), metadata=metadata)
+
+    if workers <= 1 or total_pages < min_pages:
+        for start, stop in shards:
+            yield from to_documents(_extract_page_range(file_path, start, stop))
+        return
+
+    # "spawn" avoids forking a process that may hold locks in other threads
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        pending: Deque[Future] = deque()
+        remaining = iter(shards)
+        try:
+            for start, stop in remaining:
+                pending.append(pool.submit(_extract_page_range, file_path, start, stop))
+                if len(pending) >= workers * 2:
+                    break
+            while pending:
+                pages = pending.popleft().result()
+                next_shard = next(remaining, None)
+                if next_shard is not None:
+                    pending.append(pool.submit(_extract_page_range, file_path, *next_shard))
+                yield from to_documents(pages)
+        finally:
+            for future in pending:
+                future.cancel()
@@ -5,18 +5,35 @@ with the multi-agent RAG pipeline without depending directly on LangGraph
 or agent implementation details.
 """
 
-from typing import Dict, Any
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 
-from ..core.agents.graph import run_qa_flow
+from ..core.agents.graph import run_qa_flow, stream_qa_flow
 
 
-def answer_question(question: str) -> Dict[str, Any]:
+async def answer_question(question: str, profile: Optional[str] = None) -> Dict[str, Any]:
     """Run the multi-agent QA flow for a given question.
 
     Args:
         question: User's natural language question about the vector databases paper.
+        profile: Pipeline profile ("fast", "balanced", "strict"); defaults to settings.
 
     Returns:
-        Dictionary containing at least `answer` and `context` keys.
+        Dictionary containing at least `answer`, `context`, `profile` and
+        `latency_ms` keys.
     """
-    return run_qa_flow(question)
+    return await run_qa_flow(question, profile)
+
+
+def stream_answer(
+    question: str, profile: Optional[str] = None
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """Stream progress events of the multi-agent QA flow for a question.
+
+    Args:
+        question: User's natural language question about the vector databases paper.
+        profile: Pipeline profile ("fast", "balanced", "strict"); defaults to settings.
+
+    Returns:
+        Async iterator of `(event, data)` tuples; see `stream_qa_flow`.
+    """
+    return stream_qa_flow(question, profile)
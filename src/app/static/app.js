@@ -582,14 +582,13 @@ class RAGInterface {
     if (!this.selectedFile) return;
     
     this.uploadBtn.disabled = true;
-    this.showLoading('Processing document...');
+    this.showLoading('Uploading document...');
     
     const formData = new FormData();
     formData.append('file', this.selectedFile);
     
     try {
-      // Simulate progress animation
-      this.simulateProgress();
+      this.setUploadProgress(0);
       
       const response = await fetch('/index-pdf', {
         method: 'POST',
@@ -598,7 +597,15 @@ class RAGInterface {
       
       if (!response.ok) throw new Error('Upload failed');
       
-      const data = await response.json();
+      const job = await response.json();
+      
+      // Indexing runs in the background; poll the job until it finishes
+      this.showLoading('Processing document...');
+      const result = await this.waitForIndexJob(job.status_url);
+      if (result.status !== 'succeeded') {
+        throw new Error(result.error || 'Indexing failed');
+      }
+      this.setUploadProgress(100);
       
       // Show success
       this.showToast('Document processed successfully!', 'success');
@@ -617,24 +624,36 @@ class RAGInterface {
     }
   }
   
-  simulateProgress() {
+  async waitForIndexJob(statusUrl, intervalMs = 1000) {
+    while (true) {
+      const response = await fetch(statusUrl);
+      if (!response.ok) throw new Error('Could not read indexing status');
+      
+      const job = await response.json();
+      if (job.status === 'succeeded' || job.status === 'failed') return job;
+      
+      if (job.pages_total) {
+        this.setUploadProgress((job.pages_processed / job.pages_total) * 100);
+        const eta = job.eta_seconds != null ? `, ~${Math.ceil(job.eta_seconds)}s left` : '';
+        this.showLoading(
+          `Indexing page ${job.pages_processed} of ${job.pages_total}${eta}...`
+        );
+      }
+      
+      await new Promise(resolve => setTimeout(resolve, intervalMs));
+    }
+  }
+  
+  setUploadProgress(progress) {
     const progressFill = document.getElementById('progressFill');
     const uploadPercent = document.getElementById('uploadPercent');
     const progressContainer = document.getElementById('uploadProgress');
     
     progressContainer.classList.remove('hidden');
     
-    let progress = 0;
-    const interval = setInterval(() => {
-      progress += Math.random() * 10;
-      if (progress >= 100) {
-        progress = 100;
-        clearInterval(interval);
-      }
-      
-      progressFill.style.width = progress + '%';
-      uploadPercent.textContent = Math.floor(progress) + '%';
-    }, 100);
+    const clamped = Math.max(0, Math.min(100, progress));
+    progressFill.style.width = clamped + '%';
+    uploadPercent.textContent = Math.floor(clamped) + '%';
   }
   
   async revealQASection() {
@@ -670,29 +689,58 @@ class RAGInterface {
       return;
     }
     
-    this.showLoading('Analyzing document...');
+    this.showLoading('Retrieving evidence...');
     this.askBtn.disabled = true;
     
     try {
       const startTime = Date.now();
       
-      const response = await fetch('/qa', {
+      const response = await fetch('/qa/stream', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ question })
       });
       
-      if (!response.ok) throw new Error('QA failed');
+      if (!response.ok || !response.body) throw new Error('QA failed');
+      
+      let data = null;
+      let streamingStage = null;
+      
+      await this.readEventStream(response, (event, payload) => {
+        switch (event) {
+          case 'retrieval':
+            // Evidence is available before any answer text is generated
+            this.hideLoading();
+            this.displayCitations(payload.citations || {});
+            this.evidenceMap.classList.remove('hidden');
+            break;
+          case 'token':
+            if (streamingStage !== payload.stage) {
+              // Verification rewrites the draft, so restart the answer text
+              streamingStage = payload.stage;
+              this.answerContainer.classList.remove('hidden');
+              this.answerText.textContent = '';
+            }
+            this.answerText.textContent += payload.text;
+            break;
+          case 'answer':
+            data = payload;
+            break;
+          case 'error':
+            throw new Error(payload.detail || 'QA failed');
+        }
+      });
+      
+      if (!data) throw new Error('Stream ended before an answer was produced');
       
-      const data = await response.json();
       const responseTime = Date.now() - startTime;
       
       // Update response metrics
       this.responseTime.textContent = (responseTime / 1000).toFixed(2) + 's';
       this.confidenceScore.textContent = '92% confidence'; // Simulated confidence
       
-      // Display answer with typing animation
-      await this.displayAnswer(data.answer || 'No answer found');
+      // Text was already streamed in; just settle on the final answer
+      this.displayAnswer(data.answer);
       
       // Display citations
       this.displayCitations(data.citations || {});
@@ -716,25 +764,37 @@ class RAGInterface {
     }
   }
   
-  async displayAnswer(answer) {
-    this.answerContainer.classList.remove('hidden');
-    this.answerText.textContent = '';
-    
-    // Typewriter effect
-    const words = answer.split(' ');
-    let index = 0;
-    
-    const typeNextWord = () => {
-      if (index < words.length) {
-        this.answerText.textContent += (index === 0 ? '' : ' ') + words[index];
-        index++;
+  async readEventStream(response, onEvent) {
+    // Minimal Server-Sent Events parser for fetch() response bodies
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      
+      let boundary;
+      while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+        const rawEvent = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
         
-        // Random typing speed
-        setTimeout(typeNextWord, Math.random() * 50 + 20);
+        let event = 'message';
+        let dataLines = [];
+        rawEvent.split('\n').forEach(line => {
+          if (line.startsWith('event:')) event = line.slice(6).trim();
+          else if (line.startsWith('data:')) dataLines.push(line.slice(5).trim());
+        });
+        if (dataLines.length) onEvent(event, JSON.parse(dataLines.join('\n')));
       }
-    };
-    
-    typeNextWord();
+    }
+  }
+  
+  displayAnswer(answer) {
+    // Replaces the streamed draft, which verification may have rewritten
+    this.answerContainer.classList.remove('hidden');
+    this.answerText.textContent = answer || 'No answer found';
   }
   
   displayCitations(citations) {